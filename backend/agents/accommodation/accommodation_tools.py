@@ -15,10 +15,11 @@ import logging
 import asyncio
 import requests
 import httpx
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 from dotenv import load_dotenv
-import googlemaps
+from core.places_gateway import get_sync_client
+from core.cache import app_cache
 from openai import OpenAI
 from langchain.tools import tool
 from schemas.data_models import PlaceData, AgentResponse
@@ -33,11 +34,10 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 GOOGLE_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
-gmaps = googlemaps.Client(key=GOOGLE_API_KEY) if GOOGLE_API_KEY else None
+gmaps = get_sync_client()  # 공용 Places 게이트웨이 (커넥션 풀 + 요청 병합)
 openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
 
-# 캐시 & 타임아웃 설정
-_price_cache = {}
+# 캐시 & 타임아웃 설정 (가격은 공용 app_cache 의 "price" 네임스페이스)
 CACHE_TTL = 300  # 5분
 QUICK_TIMEOUT = 10
 NORMAL_TIMEOUT = 20
@@ -682,11 +682,10 @@ def compare_booking_prices(
         
         # 캐시 확인
         cache_key = f"{place_name}_{check_in}_{check_out}_{num_guests}"
-        if cache_key in _price_cache:
-            cached_data, timestamp = _price_cache[cache_key]
-            if datetime.now() - timestamp < timedelta(seconds=CACHE_TTL):
-                logger.info("✅ 캐시에서 반환 (즉시 응답)")
-                return cached_data
+        cached_data = app_cache.get(cache_key, namespace="price")
+        if cached_data is not None:
+            logger.info("✅ 캐시에서 반환 (즉시 응답)")
+            return cached_data
         
         # 병렬 조회! (3배 빠름!)
         prices = asyncio.run(_compare_prices_parallel(place_name, check_in, check_out, num_guests, nights))
@@ -724,7 +723,7 @@ def compare_booking_prices(
         )
         
         # 캐싱
-        _price_cache[cache_key] = (response.model_dump(), datetime.now())
+        app_cache.set(cache_key, response.model_dump(), namespace="price", ttl=CACHE_TTL)
         
         return response.model_dump()
         
@@ -7,6 +7,7 @@ import logging
 import os
 from dotenv import load_dotenv
 from schemas.data_models import AgentResponse
+from core.llm_clients import get_openai_client
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
@@ -171,9 +172,7 @@ def _gpt4_analyze_ei(answer: str, question_type: str) -> int:
         return 0
     
     try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = get_openai_client()
         
         prompt = f"""사용자가 여행 성향 질문에 "{answer}"라고 답했습니다.
 
@@ -209,9 +208,7 @@ def _gpt4_analyze_sn(answer: str) -> int:
         return 0
     
     try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = get_openai_client()
         
         prompt = f"""사용자가 "여행에서 가장 중요한 건?"이라는 질문에 "{answer}"라고 답했습니다.
 
@@ -247,9 +244,7 @@ def _gpt4_analyze_tf(answer: str) -> int:
         return 0
     
     try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = get_openai_client()
         
         prompt = f"""사용자가 "일정 짤 때 뭐가 중요해?"라는 질문에 "{answer}"라고 답했습니다.
 
@@ -286,9 +281,7 @@ def _gpt4_analyze_jp(answer: str, question_type: str) -> int:
         return 0
     
     try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = get_openai_client()
         
         prompt = f"""사용자가 여행 계획/준비에 관한 질문에 "{answer}"라고 답했습니다.
 
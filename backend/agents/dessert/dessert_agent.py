@@ -5,8 +5,8 @@ import logging
 from typing import Optional, List, Dict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-import googlemaps
-from langchain_openai import ChatOpenAI
+from core.places_gateway import get_sync_client
+from core.llm_clients import get_chat_model
 from schemas.data_models import PlaceData, AgentResponse, UserPersona
 
 # 1. 환경 설정
@@ -20,7 +20,7 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("openai").setLevel(logging.WARNING)
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
-gmaps = googlemaps.Client(key=GOOGLE_API_KEY) if GOOGLE_API_KEY else None
+gmaps = get_sync_client()  # 공용 Places 게이트웨이 (커넥션 풀 + 요청 병합)
 
 # --- [Helper] 페르소나 점수 계산 ---
 def calculate_persona_score(place: dict, persona: Optional[UserPersona]) -> float:
@@ -121,7 +121,7 @@ def generate_korean_ux_report(place_id: str, persona: Optional[UserPersona] = No
         if len(review_text) > 1500:
             review_text = review_text[:1500]
 
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
+        llm = get_chat_model("gpt-4o-mini", temperature=0.2)
         
         prompt_full = f"""당신은 카페 가이드 AI입니다. 
 아래 정보를 바탕으로 사용자에게 추천하는 짧고 강렬한 리포트를 작성하세요.
@@ -212,7 +212,7 @@ def get_cafe_price_analysis(region: str, menu_type: str = "커피", persona: Opt
         if len(combined_reviews) > 1500:
             combined_reviews = combined_reviews[:1500]
         
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
+        llm = get_chat_model("gpt-4o-mini", temperature=0.2)
         
         prompt_full = f"""지역: {region}, 메뉴: {menu_type}
 리뷰 데이터를 보고 가격 정보를 숫자(원)로 정확히 요약하세요.
@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-import googlemaps
+from core.places_gateway import get_sync_client
 from schemas.data_models import PlaceData, AgentResponse
 
 load_dotenv()
@@ -28,7 +28,7 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
 DATA_GO_API_KEY = os.getenv("DATA_GO_KR_API_KEY")
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHERMAP_API_KEY")
 
-gmaps = googlemaps.Client(key=GOOGLE_API_KEY) if GOOGLE_API_KEY else None
+gmaps = get_sync_client()  # 공용 Places 게이트웨이 (커넥션 풀 + 요청 병합)
 
 # --- 1. 재난문자 조회 ---
 def fetch_disaster_alerts(region: str) -> List[Dict[str, Any]]:
@@ -61,10 +61,11 @@ def handle_emergency_situation_tool(situation_type: str, current_location: str)
     logger.info(f"🚨 응급 상황: {situation_type} at {current_location}")
     
     try:
-        import googlemaps
-        import os
+        from core.places_gateway import get_sync_client
         
-        gmaps = googlemaps.Client(key=os.getenv("GOOGLE_PLACES_API_KEY"))
+        gmaps = get_sync_client()
+        if not gmaps:
+            return "Google API 키가 설정되지 않았습니다. 긴급 상황이면 119/112로 즉시 연락하세요!"
         
         # 위치 검색
         geocode = gmaps.geocode(f"{current_location}, 대한민국", language="ko")
@@ -5,7 +5,7 @@ import os
 import logging
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
-import googlemaps
+from core.places_gateway import get_sync_client
 import requests
 from schemas.data_models import AgentResponse, BudgetData
 
@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 GOOGLE_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
 KOREA_TOUR_API_KEY = os.getenv("KOREA_TOUR_API_KEY")
 KAKAO_REST_API_KEY = os.getenv("KAKAO_REST_API_KEY")
-gmaps = googlemaps.Client(key=GOOGLE_API_KEY) if GOOGLE_API_KEY else None
+gmaps = get_sync_client()  # 공용 Places 게이트웨이 (커넥션 풀 + 요청 병합)
 
 
 def get_coordinates(query: str) -> Optional[str]:
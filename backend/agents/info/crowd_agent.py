@@ -5,7 +5,7 @@ import os
 import logging
 from typing import Optional
 from dotenv import load_dotenv
-import googlemaps
+from core.places_gateway import get_sync_client
 from schemas.data_models import AgentResponse
 
 load_dotenv()
@@ -13,7 +13,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
-gmaps = googlemaps.Client(key=GOOGLE_API_KEY) if GOOGLE_API_KEY else None
+gmaps = get_sync_client()  # 공용 Places 게이트웨이 (커넥션 풀 + 요청 병합)
 
 
 def get_crowd_info(place_id: str) -> AgentResponse:
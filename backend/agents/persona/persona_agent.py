@@ -8,6 +8,7 @@
 
 DB: MySQL 연동 (SQLAlchemy)
 """
+import asyncio
 import logging
 from typing import List
 from datetime import datetime
@@ -39,21 +40,21 @@ class PersonaAgent:
         """에이전트의 툴 리스트 반환"""
         return self.tools
     
-    def create(self, user_id: str, persona_data: UserPersona):
+    async def create(self, user_id: str, persona_data: UserPersona):
         """페르소나 생성 (편의 메서드)"""
-        return create_persona.func(user_id, persona_data)
+        return await create_persona.coroutine(user_id, persona_data)
     
-    def get(self, user_id: str):
+    async def get(self, user_id: str):
         """페르소나 조회 (편의 메서드)"""
-        return get_persona.func(user_id)
+        return await get_persona.coroutine(user_id)
     
-    def update(self, user_id: str, persona_data: UserPersona):
+    async def update(self, user_id: str, persona_data: UserPersona):
         """페르소나 수정 (편의 메서드)"""
-        return update_persona.func(user_id, persona_data)
+        return await update_persona.coroutine(user_id, persona_data)
     
-    def delete(self, user_id: str):
+    async def delete(self, user_id: str):
         """페르소나 삭제 (편의 메서드)"""
-        return delete_persona.func(user_id)
+        return await delete_persona.coroutine(user_id)
 
 
 # 전역 에이전트 인스턴스
@@ -94,7 +95,7 @@ if __name__ == "__main__":
         updated_at=datetime.now().isoformat()
     )
     
-    result = agent.create(test_user_id, test_persona)
+    result = asyncio.run(agent.create(test_user_id, test_persona))
     
     print(f"{'✅' if result.get('success') else '❌'} {result.get('message', '응답 없음')}")
     
@@ -125,7 +126,7 @@ if __name__ == "__main__":
     print(f"📝 사용자 ID: {test_user_id}")
     print()
     
-    result2 = agent.get(test_user_id)
+    result2 = asyncio.run(agent.get(test_user_id))
     
     print(f"{'✅' if result2.get('success') else '❌'} {result2.get('message', '응답 없음')}")
     
@@ -168,7 +169,7 @@ if __name__ == "__main__":
         test_persona.budget_level = "고"
         test_persona.interests = ["사진", "쇼핑", "역사"]
         
-        result3 = agent.update(test_user_id, test_persona)
+        result3 = asyncio.run(agent.update(test_user_id, test_persona))
         
         print(f"{'✅' if result3.get('success') else '❌'} {result3.get('message', '응답 없음')}")
         
@@ -200,11 +201,11 @@ if __name__ == "__main__":
     print("⚠️  실제 DB 데이터가 삭제되므로 주석 처리됨")
     print("💡 삭제를 원하면 아래 주석을 해제하세요:")
     print()
-    print("# result4 = agent.delete(test_user_id)")
+    print("# result4 = asyncio.run(agent.delete(test_user_id))")
     print("# print(result4['message'])")
     
     # 실제 삭제는 주석 처리
-    # result4 = agent.delete(test_user_id)
+    # result4 = asyncio.run(agent.delete(test_user_id))
     # print(f"{'✅' if result4.get('success') else '❌'} {result4.get('message', '응답 없음')}")
     
     # ========================================================================
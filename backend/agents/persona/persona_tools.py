@@ -6,16 +6,17 @@ Tools:
 3. update_persona: 페르소나 수정
 4. delete_persona: 페르소나 삭제
 
-DB: MySQL 연동 (SQLAlchemy)
+DB: MySQL 연동 (SQLAlchemy 비동기 세션 - 이벤트 루프를 막지 않음)
 """
 import logging
 from typing import Optional
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from langchain.tools import tool
 
-from core.database import SessionLocal
+from core.database import AsyncSessionLocal
 from core.models import Persona, User
+from core.persona_cache import begin_fill, get_cached_persona, set_cached_persona, invalidate_persona
 from schemas.data_models import UserPersona, AgentResponse
 
 logging.basicConfig(level=logging.INFO)
@@ -92,7 +93,7 @@ def _persona_to_db(persona: UserPersona, user_seq_no: int) -> dict:
 # ============================================================================
 
 @tool
-def create_persona(user_id: str, persona_data: UserPersona) -> dict:
+async def create_persona(user_id: str, persona_data: UserPersona) -> dict:
     """
     새 페르소나 생성
     
@@ -103,12 +104,12 @@ def create_persona(user_id: str, persona_data: UserPersona) -> dict:
     Returns:
         AgentResponse: 표준 응답 형식
     """
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
         logger.info(f"🎯 페르소나 생성: {user_id}")
         
         # 1. 사용자 존재 확인
-        user = db.query(User).filter(User.user_id == user_id).first()
+        user = await db.scalar(select(User).where(User.user_id == user_id))
         if not user:
             return AgentResponse(
                 success=False,
@@ -118,9 +119,7 @@ def create_persona(user_id: str, persona_data: UserPersona) -> dict:
             ).model_dump()
         
         # 2. 기존 페르소나 확인
-        existing = db.query(Persona).filter(
-            Persona.user_seq_no == user.user_seq_no
-        ).first()
+        existing = await db.scalar(select(Persona).where(Persona.user_seq_no == user.user_seq_no))
         
         if existing:
             return AgentResponse(
@@ -135,8 +134,9 @@ def create_persona(user_id: str, persona_data: UserPersona) -> dict:
         new_persona = Persona(**db_data)
         
         db.add(new_persona)
-        db.commit()
-        db.refresh(new_persona)
+        await db.commit()
+        await db.refresh(new_persona)
+        await invalidate_persona(user_id)
         
         # 4. 응답 생성
         result_persona = _db_to_persona(new_persona, user_id)
@@ -151,7 +151,7 @@ def create_persona(user_id: str, persona_data: UserPersona) -> dict:
         ).model_dump()
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ 페르소나 생성 실패: {e}")
         return AgentResponse(
             success=False,
@@ -160,7 +160,7 @@ def create_persona(user_id: str, persona_data: UserPersona) -> dict:
             error=str(e)
         ).model_dump()
     finally:
-        db.close()
+        await db.close()
 
 
 # ============================================================================
@@ -168,7 +168,7 @@ def create_persona(user_id: str, persona_data: UserPersona) -> dict:
 # ============================================================================
 
 @tool
-def get_persona(user_id: str) -> dict:
+async def get_persona(user_id: str) -> dict:
     """
     사용자 페르소나 조회
     
@@ -178,13 +178,26 @@ def get_persona(user_id: str) -> dict:
     Returns:
         AgentResponse: 표준 응답 형식
     """
-    db = SessionLocal()
+    # [Optimization] 사용자별 캐시 우선 (수정/삭제 시 invalidate)
+    cached = await get_cached_persona(user_id)
+    if cached is not None:
+        return _persona_response(user_id, cached["persona"])
+    
+    # DB 를 읽기 전에 세대 토큰 확보 (조회 중 수정되면 이 값은 캐시에서 무효)
+    generation = await begin_fill(user_id)
+    db = AsyncSessionLocal()
     try:
         logger.info(f"🔍 페르소나 조회: {user_id}")
         
-        # 1. 사용자 찾기
-        user = db.query(User).filter(User.user_id == user_id).first()
-        if not user:
+        # 1. 사용자 + 페르소나 한 번에 조회 (LEFT JOIN)
+        result = await db.execute(
+            select(User.user_seq_no, Persona)
+            .outerjoin(Persona, Persona.user_seq_no == User.user_seq_no)
+            .where(User.user_id == user_id)
+        )
+        row = result.first()
+        
+        if not row:
             return AgentResponse(
                 success=False,
                 agent_name="persona",
@@ -192,30 +205,12 @@ def get_persona(user_id: str) -> dict:
                 error="User not found"
             ).model_dump()
         
-        # 2. 페르소나 찾기
-        db_persona = db.query(Persona).filter(
-            Persona.user_seq_no == user.user_seq_no
-        ).first()
-        
-        if not db_persona:
-            return AgentResponse(
-                success=False,
-                agent_name="persona",
-                message=f"'{user_id}' 페르소나가 없습니다",
-                error="Persona not found"
-            ).model_dump()
-        
-        # 3. 변환
-        persona = _db_to_persona(db_persona, user_id)
+        # 2. 변환 후 캐시 (페르소나 없는 사용자도 저장)
+        db_persona = row[1]
+        persona = _db_to_persona(db_persona, user_id).model_dump() if db_persona else None
+        await set_cached_persona(user_id, persona, generation)
         
-        logger.info(f"✅ 페르소나 조회 완료: {user_id}")
-        return AgentResponse(
-            success=True,
-            agent_name="persona",
-            data=[persona.model_dump()],
-            count=1,
-            message=f"'{user_id}' 페르소나 조회 완료! 📋"
-        ).model_dump()
+        return _persona_response(user_id, persona)
         
     except Exception as e:
         logger.error(f"❌ 페르소나 조회 실패: {e}")
@@ -226,7 +221,27 @@ def get_persona(user_id: str) -> dict:
             error=str(e)
         ).model_dump()
     finally:
-        db.close()
+        await db.close()
+
+
+def _persona_response(user_id: str, persona: Optional[dict]) -> dict:
+    """get_persona 응답 생성 (DB 조회 / 캐시 공용)"""
+    if persona is None:
+        return AgentResponse(
+            success=False,
+            agent_name="persona",
+            message=f"'{user_id}' 페르소나가 없습니다",
+            error="Persona not found"
+        ).model_dump()
+    
+    logger.info(f"✅ 페르소나 조회 완료: {user_id}")
+    return AgentResponse(
+        success=True,
+        agent_name="persona",
+        data=[persona],
+        count=1,
+        message=f"'{user_id}' 페르소나 조회 완료! 📋"
+    ).model_dump()
 
 
 # ============================================================================
@@ -234,7 +249,7 @@ def get_persona(user_id: str) -> dict:
 # ============================================================================
 
 @tool
-def update_persona(user_id: str, persona_data: UserPersona) -> dict:
+async def update_persona(user_id: str, persona_data: UserPersona) -> dict:
     """
     페르소나 수정
     
@@ -245,12 +260,12 @@ def update_persona(user_id: str, persona_data: UserPersona) -> dict:
     Returns:
         AgentResponse: 표준 응답 형식
     """
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
         logger.info(f"✏️ 페르소나 수정: {user_id}")
         
         # 1. 사용자 찾기
-        user = db.query(User).filter(User.user_id == user_id).first()
+        user = await db.scalar(select(User).where(User.user_id == user_id))
         if not user:
             return AgentResponse(
                 success=False,
@@ -260,9 +275,7 @@ def update_persona(user_id: str, persona_data: UserPersona) -> dict:
             ).model_dump()
         
         # 2. 페르소나 찾기
-        db_persona = db.query(Persona).filter(
-            Persona.user_seq_no == user.user_seq_no
-        ).first()
+        db_persona = await db.scalar(select(Persona).where(Persona.user_seq_no == user.user_seq_no))
         
         if not db_persona:
             return AgentResponse(
@@ -278,8 +291,9 @@ def update_persona(user_id: str, persona_data: UserPersona) -> dict:
             if key != 'user_seq_no':  # user_seq_no는 변경 안 함
                 setattr(db_persona, key, value)
         
-        db.commit()
-        db.refresh(db_persona)
+        await db.commit()
+        await db.refresh(db_persona)
+        await invalidate_persona(user_id)
         
         # 4. 응답 생성
         result_persona = _db_to_persona(db_persona, user_id)
@@ -294,7 +308,7 @@ def update_persona(user_id: str, persona_data: UserPersona) -> dict:
         ).model_dump()
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ 페르소나 수정 실패: {e}")
         return AgentResponse(
             success=False,
@@ -303,7 +317,7 @@ def update_persona(user_id: str, persona_data: UserPersona) -> dict:
             error=str(e)
         ).model_dump()
     finally:
-        db.close()
+        await db.close()
 
 
 # ============================================================================
@@ -311,7 +325,7 @@ def update_persona(user_id: str, persona_data: UserPersona) -> dict:
 # ============================================================================
 
 @tool
-def delete_persona(user_id: str) -> dict:
+async def delete_persona(user_id: str) -> dict:
     """
     페르소나 삭제
     
@@ -321,12 +335,12 @@ def delete_persona(user_id: str) -> dict:
     Returns:
         AgentResponse: 표준 응답 형식
     """
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
         logger.info(f"🗑️ 페르소나 삭제: {user_id}")
         
         # 1. 사용자 찾기
-        user = db.query(User).filter(User.user_id == user_id).first()
+        user = await db.scalar(select(User).where(User.user_id == user_id))
         if not user:
             return AgentResponse(
                 success=False,
@@ -336,9 +350,7 @@ def delete_persona(user_id: str) -> dict:
             ).model_dump()
         
         # 2. 페르소나 찾기
-        db_persona = db.query(Persona).filter(
-            Persona.user_seq_no == user.user_seq_no
-        ).first()
+        db_persona = await db.scalar(select(Persona).where(Persona.user_seq_no == user.user_seq_no))
         
         if not db_persona:
             return AgentResponse(
@@ -349,8 +361,9 @@ def delete_persona(user_id: str) -> dict:
             ).model_dump()
         
         # 3. 삭제
-        db.delete(db_persona)
-        db.commit()
+        await db.delete(db_persona)
+        await db.commit()
+        await invalidate_persona(user_id)
         
         logger.info(f"✅ 페르소나 삭제 완료: {user_id}")
         return AgentResponse(
@@ -362,7 +375,7 @@ def delete_persona(user_id: str) -> dict:
         ).model_dump()
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ 페르소나 삭제 실패: {e}")
         return AgentResponse(
             success=False,
@@ -371,7 +384,7 @@ def delete_persona(user_id: str) -> dict:
             error=str(e)
         ).model_dump()
     finally:
-        db.close()
+        await db.close()
 
 
 # ============================================================================
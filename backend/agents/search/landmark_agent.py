@@ -11,7 +11,7 @@ if sys.platform == 'win32':
 import logging
 from typing import Dict, Any, Optional, List
 from dotenv import load_dotenv
-import googlemaps
+from core.places_gateway import get_sync_client
 from schemas.data_models import AgentResponse, PlaceData
 
 load_dotenv()
@@ -47,7 +47,7 @@ TOURIST_CATEGORIES = {
 }
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
-gmaps = googlemaps.Client(key=GOOGLE_API_KEY) if GOOGLE_API_KEY else None
+gmaps = get_sync_client()  # 공용 Places 게이트웨이 (커넥션 풀 + 요청 병합)
 
 # --- 랜드마크 에이전트 기능 (통합됨) ---
 
@@ -61,7 +61,7 @@ def search_landmarks(
         logger.info(f"🔍 관광지 검색: {region} (카테고리: {category}, 추가 선호: {preference})")
         
         # 1. 좌표 변환
-        result = gmaps.geocode(f"{region}, 대한민국", language="ko", region="KR")
+        result = gmaps.geocode(f"{region}, 대한민국", language="ko")  # 다른 에이전트/선조회와 같은 캐시 키
         if not result:
             return AgentResponse(
                 success=False,
@@ -128,20 +128,16 @@ def search_landmarks(
             reverse=True
         )[:10]  # Top 10
         
-        # 5. 상세 정보 로드 및 변환
+        # 5. 상세 정보 로드 및 변환 (필요한 필드만, 동시 조회 - 실패/타임아웃 건은 기본 정보만 사용)
+        details_map = gmaps.place_many([p['place_id'] for p in sorted_results], fields=[
+            'formatted_phone_number', 'website', 
+            'opening_hours', 'formatted_address', 'photo'
+        ], language="ko")
+        
         places = []
         for place in sorted_results:
             place_id = place['place_id']
-            # 상세 정보 요청 (필요한 필드만)
-            try:
-                details_result = gmaps.place(place_id, fields=[
-                    'formatted_phone_number', 'website', 
-                    'opening_hours', 'formatted_address', 'photo'
-                ], language="ko")
-                details = details_result.get('result', {})
-            except Exception as detail_error:
-                logger.warning(f"상세 정보 로드 실패 ({place.get('name')}): {detail_error}")
-                details = {}
+            details = details_map.get(place_id, {})
             
             # 카테고리 상세 분류
             place_types = place.get('types', [])
@@ -5,7 +5,7 @@ import os
 from typing import List, Optional
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
-import googlemaps
+from core.places_gateway import get_sync_client
 from schemas.data_models import RegionInfo, AgentResponse
 
 load_dotenv()
@@ -22,7 +22,7 @@ llm = ChatOpenAI(
     api_key=OPENAI_API_KEY
 ) if OPENAI_API_KEY else None
 
-gmaps = googlemaps.Client(key=GOOGLE_API_KEY) if GOOGLE_API_KEY else None
+gmaps = get_sync_client()  # 공용 Places 게이트웨이 (커넥션 풀 + 요청 병합)
 
 
 # 인기 도시 하드코딩 데이터 (즉시 응답)
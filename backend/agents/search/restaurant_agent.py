@@ -5,7 +5,7 @@ import time
 import json
 from typing import List, Optional
 from dotenv import load_dotenv
-import googlemaps
+from core.places_gateway import get_sync_client
 from langchain_openai import ChatOpenAI
 from schemas.data_models import PlaceData, AgentResponse
 
@@ -17,21 +17,20 @@ logger = logging.getLogger(__name__)
 GOOGLE_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-gmaps = googlemaps.Client(key=GOOGLE_API_KEY) if GOOGLE_API_KEY else None
+gmaps = get_sync_client()  # 공용 Places 게이트웨이 (커넥션 풀 + 요청 병합)
 llm = ChatOpenAI(
     model="gpt-4o-mini",
     temperature=0.7,
     api_key=OPENAI_API_KEY
 ) if OPENAI_API_KEY else None
 
-# API 호출 캐시 (성능 최적화)
-_place_cache = {}
-
 
 def get_place_details(place_id: str, fields: list) -> dict:
     """
     Google Places API 호출 with 캐싱
     
+    캐싱은 게이트웨이의 place_store (LRU + 필드별 TTL + 필드 단위 병합)가 담당합니다.
+    
     Args:
         place_id: Place ID
         fields: 필요한 필드 리스트
@@ -39,18 +38,8 @@ def get_place_details(place_id: str, fields: list) -> dict:
     Returns:
         dict: Place details
     """
-    # 캐시 키 생성
-    cache_key = f"{place_id}:{','.join(sorted(fields))}"
-    
-    # 캐시에 있으면 반환
-    if cache_key in _place_cache:
-        return _place_cache[cache_key]
-    
-    # API 호출
     try:
-        result = gmaps.place(place_id, fields=fields, language='ko')['result']
-        _place_cache[cache_key] = result
-        return result
+        return gmaps.place(place_id, fields=fields, language='ko')['result']
     except Exception as e:
         logger.warning(f"API 호출 실패: {e}")
         return {}
@@ -363,15 +352,22 @@ def search_restaurants(
                 "소금": ["짠", "소금", "salt", "나트륨"]
             }
             
-            # 리뷰 기반 제외 필터
+            # 리뷰 기반 제외 필터 (상위 30개 리뷰를 동시에 조회)
+            candidates = filtered[:30]
+            reviews_map = gmaps.place_many(
+                [p['place_id'] for p in candidates], fields=['reviews'], language='ko'
+            )
+            
             safe_restaurants = []
-            for place in filtered[:30]:  # 상위 30개만 체크
+            for place in candidates:
                 place_id = place['place_id']
-                place_name = place['name']
                 
                 try:
-                    # 메뉴/리뷰에서 제외 음식 확인
-                    reviews = gmaps.place(place_id, fields=['reviews'], language='ko')['result'].get('reviews', [])[:10]
+                    # 메뉴/리뷰에서 제외 음식 확인 (조회 실패/타임아웃이면 일단 포함)
+                    if place_id not in reviews_map:
+                        safe_restaurants.append(place)
+                        continue
+                    reviews = reviews_map[place_id].get('reviews', [])[:10]
                     
                     has_excluded_food = False
                     for review in reviews:
@@ -424,34 +420,31 @@ def search_restaurants(
         
         logger.info(f"🎯 상위 {len(sorted_results)}개 선택")
         
-        # 6. 상세 정보 로드
+        # 6. 상세 정보 로드 (상위 N개 동시 조회, 실패/타임아웃 건은 기본 정보만 사용)
+        details_map = gmaps.place_many(
+            [p['place_id'] for p in sorted_results],
+            fields=[
+                'formatted_phone_number',
+                'website',
+                'opening_hours',
+                'formatted_address',
+                'photo',
+                'price_level',
+                # 주변 시설
+                'wheelchair_accessible_entrance',
+                'reservable',
+                'delivery',
+                'takeout',
+                'dine_in'
+            ],
+            language='ko'
+        )
+        logger.info(f"⚡ 상세 정보 {len(details_map)}/{len(sorted_results)}개 로드")
+        
         places = []
         for place in sorted_results:
             place_id = place['place_id']
-            
-            # 상세 정보 가져오기
-            try:
-                details = gmaps.place(
-                    place_id,
-                    fields=[
-                        'formatted_phone_number',
-                        'website',
-                        'opening_hours',
-                        'formatted_address',
-                        'photo',
-                        'price_level',
-                        # 주변 시설
-                        'wheelchair_accessible_entrance',
-                        'reservable',
-                        'delivery',
-                        'takeout',
-                        'dine_in'
-                    ],
-                    language='ko'
-                )['result']
-            except Exception as e:
-                logger.warning(f"⚠️ 상세 정보 로드 실패 ({place['name']}): {e}")
-                details = {}
+            details = details_map.get(place_id, {})
             
             # 사진 URL 생성
             photo_urls = []
@@ -5,7 +5,7 @@ import os
 from typing import List, Dict, Any, Optional
 
 from dotenv import load_dotenv
-import googlemaps
+from core.places_gateway import get_sync_client
 from langchain_openai import ChatOpenAI
 from langchain_core.tools import tool
 
@@ -13,7 +13,7 @@ load_dotenv()
 
 # API Clients
 GOOGLE_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
-gmaps = googlemaps.Client(key=GOOGLE_API_KEY) if GOOGLE_API_KEY else None
+gmaps = get_sync_client()  # 공용 Places 게이트웨이 (커넥션 풀 + 요청 병합)
 
 llm = ChatOpenAI(
     model="gpt-4o-mini",
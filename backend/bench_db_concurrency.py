@@ -0,0 +1,95 @@
+"""
+DB 동시성 / 이벤트 루프 블로킹 벤치마크
+- sync:  async 함수 안에서 SessionLocal().query(...) (기존 auth 라우터 방식)
+- async: AsyncSessionLocal + await db.scalar(select(...)) (aiomysql / aiosqlite)
+
+동시에 N 개의 사용자 조회를 실행하면서 10ms 주기 하트비트 태스크로 이벤트 루프 지연(lag)을 측정합니다.
+sync 경로는 쿼리마다 루프가 멈추므로 lag 가 DB 왕복 시간만큼 커지고, async 경로는 거의 0 이어야 합니다.
+
+실행 (DATABASE_URL 의 DB 사용, user_id 는 실제 존재하는 아이디 권장):
+    python bench_db_concurrency.py                 # 기본: test1, 동시 50개
+    python bench_db_concurrency.py test1 200
+"""
+import sys
+import time
+import asyncio
+import statistics
+
+from sqlalchemy import select
+
+from core.database import SessionLocal, AsyncSessionLocal, SQLALCHEMY_DATABASE_URL, async_engine
+from models import User
+
+HEARTBEAT_INTERVAL = 0.01
+
+
+async def heartbeat(lags: list, stop: asyncio.Event):
+    """예정 시각 대비 실제로 깨어난 시각의 지연 기록"""
+    while not stop.is_set():
+        expected = time.perf_counter() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def lookup_sync(user_id: str):
+    db = SessionLocal()
+    try:
+        return db.query(User).filter(User.user_id == user_id).first()
+    finally:
+        db.close()
+
+
+async def lookup_async(user_id: str):
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(User).where(User.user_id == user_id))
+
+
+async def run(lookup, user_id: str, concurrency: int):
+    lags, stop = [], asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(HEARTBEAT_INTERVAL * 2)
+
+    latencies = []
+
+    async def one():
+        start = time.perf_counter()
+        await lookup(user_id)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    stop.set()
+    await beat
+    return wall, latencies, lags
+
+
+async def main():
+    user_id = sys.argv[1] if len(sys.argv) > 1 else "test1"
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    print(f"⏱️ {SQLALCHEMY_DATABASE_URL} / user_id={user_id} / 동시 {concurrency}개\n")
+
+    # 워밍업 (커넥션 풀 채우기)
+    await lookup_sync(user_id)
+    await lookup_async(user_id)
+
+    print(f"{'mode':<8} {'wall':>9} {'p50':>9} {'p95':>9} {'loop lag max':>14} {'lag p95':>9}")
+    print("=" * 64)
+    for name, lookup in (("sync", lookup_sync), ("async", lookup_async)):
+        wall, latencies, lags = await run(lookup, user_id, concurrency)
+        latencies.sort()
+        lags.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        lag_p95 = lags[int(len(lags) * 0.95) - 1] if lags else 0.0
+        print(
+            f"{name:<8} {wall * 1000:>7.0f}ms {statistics.median(latencies) * 1000:>7.1f}ms {p95 * 1000:>7.1f}ms "
+            f"{(max(lags) if lags else 0.0) * 1000:>12.1f}ms {lag_p95 * 1000:>7.1f}ms"
+        )
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+"""
+워크플로 진입부 임계 경로 벤치마크
+- serial:  load_profile -> analyze_intent -> (검색 에이전트 지오코딩)
+- fan-out: load_profile || analyze_intent -> join, 지오코딩은 목적지가 정해지자마자 선조회
+
+각 단계 지연은 실제 노드를 측정하거나(--live) 환경변수/기본값으로 지정한 뒤,
+core/workflow.py 와 같은 모양의 그래프 두 개로 parallel_search 진입 + 첫 지오코딩 완료까지의 시간을 비교합니다.
+
+실행:
+    python bench_workflow_entry.py                 # 기본 지연값 (profile 80ms, intent 900ms, geocode 250ms)
+    python bench_workflow_entry.py --live          # 실제 load_profile_node / analyze_intent_node 측정값 사용
+    BENCH_INTENT_MS=30 python bench_workflow_entry.py   # 규칙 분류(LLM 생략) 경로
+"""
+import os
+import sys
+import time
+import asyncio
+import statistics
+from typing import TypedDict, Optional
+
+from langgraph.graph import StateGraph, START, END
+
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "10"))
+
+
+class BenchState(TypedDict, total=False):
+    user_input: str
+    context: Optional[dict]
+    destination: Optional[str]
+    geocode_started: Optional[float]
+
+
+def measure_live(message: str):
+    """실제 노드 1회 실행 시간 (초)"""
+    from core.workflow import load_profile_node, analyze_intent_node
+
+    state = {"user_input": message, "messages": [{"role": "user", "content": message}], "user_id": "test1"}
+    start = time.perf_counter()
+    asyncio.run(load_profile_node(state))
+    profile = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyze_intent_node(state)
+    intent = time.perf_counter() - start
+    return profile, intent
+
+
+def build_graphs(profile_s: float, intent_s: float, geocode_s: float):
+    def load_profile(state):
+        time.sleep(profile_s)  # 동기 DB 조회
+        return {"context": {}}
+
+    def analyze_intent_serial(state):
+        time.sleep(intent_s)  # LLM 호출
+        return {"destination": "부산"}
+
+    def analyze_intent_speculative(state):
+        time.sleep(intent_s)
+        # 목적지가 정해지자마자 지오코딩 시작 (결과는 기다리지 않음)
+        return {"destination": "부산", "geocode_started": time.perf_counter()}
+
+    def join(state):
+        return {}
+
+    async def parallel_search(state):
+        # 에이전트의 첫 지오코딩: 선조회가 진행 중이면 남은 시간만 기다림
+        started = state.get("geocode_started")
+        remaining = geocode_s if started is None else max(0.0, geocode_s - (time.perf_counter() - started))
+        await asyncio.sleep(remaining)
+        return {}
+
+    serial = StateGraph(BenchState)
+    serial.add_node("load_profile", load_profile)
+    serial.add_node("analyze_intent", analyze_intent_serial)
+    serial.add_node("parallel_search", parallel_search)
+    serial.add_edge(START, "load_profile")
+    serial.add_edge("load_profile", "analyze_intent")
+    serial.add_edge("analyze_intent", "parallel_search")
+    serial.add_edge("parallel_search", END)
+
+    fanout = StateGraph(BenchState)
+    fanout.add_node("load_profile", load_profile)
+    fanout.add_node("analyze_intent", analyze_intent_speculative)
+    fanout.add_node("join_entry", join)
+    fanout.add_node("parallel_search", parallel_search)
+    fanout.add_edge(START, "load_profile")
+    fanout.add_edge(START, "analyze_intent")
+    fanout.add_edge(["load_profile", "analyze_intent"], "join_entry")
+    fanout.add_edge("join_entry", "parallel_search")
+    fanout.add_edge("parallel_search", END)
+
+    return serial.compile(), fanout.compile()
+
+
+async def run(graph) -> list:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        await graph.ainvoke({"user_input": "부산 맛집 추천해줘"})
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    if "--live" in sys.argv:
+        profile_s, intent_s = measure_live("부산 해운대 맛집이랑 숙소 같이 알려줘")
+    else:
+        profile_s = float(os.getenv("BENCH_PROFILE_MS", "80")) / 1000
+        intent_s = float(os.getenv("BENCH_INTENT_MS", "900")) / 1000
+    geocode_s = float(os.getenv("BENCH_GEOCODE_MS", "250")) / 1000
+
+    print(f"⏱️ profile={profile_s * 1000:.0f}ms intent={intent_s * 1000:.0f}ms geocode={geocode_s * 1000:.0f}ms, {ROUNDS} rounds\n")
+
+    serial, fanout = build_graphs(profile_s, intent_s, geocode_s)
+    serial_t = asyncio.run(run(serial))
+    fanout_t = asyncio.run(run(fanout))
+
+    s_med, f_med = statistics.median(serial_t), statistics.median(fanout_t)
+    print(f"{'graph':<10} {'median':>10} {'min':>10} {'max':>10}")
+    print("=" * 44)
+    for name, t in (("serial", serial_t), ("fan-out", fanout_t)):
+        print(f"{name:<10} {statistics.median(t) * 1000:>8.0f}ms {min(t) * 1000:>8.0f}ms {max(t) * 1000:>8.0f}ms")
+    print(f"\n📉 critical path: {s_med * 1000:.0f}ms -> {f_med * 1000:.0f}ms ({(1 - f_med / s_med) * 100:.0f}% shorter)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,330 @@
-"""Simple Cache for LangGraph API"""
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
-import hashlib
-import json
-
-class SimpleCache:
-    """간단한 메모리 캐시"""
-    
-    def __init__(self, ttl_seconds: int = 300):
-        """
-        Args:
-            ttl_seconds: 캐시 유효 시간 (기본 5분)
-        """
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.ttl = timedelta(seconds=ttl_seconds)
-    
-    def _make_key(self, message: str, intent: str = "") -> str:
-        """메시지를 캐시 키로 변환"""
-        combined = f"{message.lower().strip()}:{intent}"
-        return hashlib.md5(combined.encode()).hexdigest()
-    
-    def get(self, message: str, intent: str = "") -> Optional[Dict[str, Any]]:
-        """캐시에서 결과 가져오기"""
-        key = self._make_key(message, intent)
-        
-        if key in self.cache:
-            cached_data = self.cache[key]
-            
-            # 만료 시간 확인
-            if datetime.now() - cached_data['timestamp'] < self.ttl:
-                print(f"⚡ [Cache HIT] {message[:30]}...")
-                return cached_data['result']
-            else:
-                # 만료된 캐시 삭제
-                del self.cache[key]
-                print(f"🗑️ [Cache EXPIRED] {message[:30]}...")
-        
-        print(f"❌ [Cache MISS] {message[:30]}...")
-        return None
-    
-    def set(self, message: str, result: Dict[str, Any], intent: str = ""):
-        """캐시에 결과 저장"""
-        key = self._make_key(message, intent)
-        self.cache[key] = {
-            'result': result,
-            'timestamp': datetime.now()
+"""Application cache (LRU + TTL, 선택적 공유 백엔드)
+
+- BoundedCache: 프로세스 내 최대 항목 수 + 바이트 예산 LRU, 네임스페이스별 TTL, 백그라운드 만료 정리
+  (검색 결과, 말투 변환 결과, 숙소 가격 등 여러 캐시가 하나의 예산을 공유)
+- SharedCache: 같은 API 로 SQLite / Redis 백엔드 사용 (uvicorn 워커 간 공유, core/cache_backends.py)
+
+CACHE_BACKEND=memory(기본) | sqlite | redis 로 app_cache 의 구현을 선택합니다.
+
+락 안에서는 await 하지 않으므로 asyncio 태스크와 to_thread 워커가 동시에 써도 안전합니다.
+async 코드에서는 aget / aset / adelete 를 사용합니다. 메모리 캐시는 그대로 호출하고,
+공유 백엔드는 네트워크/디스크 I/O 가 이벤트 루프를 막지 않도록 워커 스레드에서 실행합니다.
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from core.cache_backends import create_backend, dumps, loads
+
+logger = logging.getLogger(__name__)
+
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64MB
+CACHE_SWEEP_INTERVAL = float(os.getenv("CACHE_SWEEP_INTERVAL", "60"))
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+DEFAULT_TTL = 300
+
+# 네임스페이스별 TTL (초)
+NAMESPACE_TTLS = {
+    "price": 300,
+}
+
+
+# 크기 추정 시 실제로 들여다볼 최대 객체 수 (나머지는 표본 평균으로 외삽)
+SIZEOF_BUDGET = 64
+
+
+def _sizeof(value: Any) -> int:
+    """
+    바이트 예산 계산용 크기 추정 (직렬화하지 않음)
+
+    set 마다 pickle 로 크기를 재면 큰 검색 결과를 저장할 때마다 이벤트 루프에서 한 번 더 직렬화합니다.
+    대신 sys.getsizeof 로 컨테이너를 훑되 SIZEOF_BUDGET 개까지만 보고, 남은 항목은
+    이미 본 항목의 평균 크기로 추정합니다 (정확한 값이 아니라 LRU 예산용 근사치).
+    """
+    budget = [SIZEOF_BUDGET]
+    seen_ids = set()
+
+    def walk(obj: Any) -> int:
+        # 여러 곳에서 참조하는 객체는 메모리를 한 번만 차지
+        if id(obj) in seen_ids:
+            return 0
+        seen_ids.add(id(obj))
+        size = sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            items, per_item = obj.items(), lambda kv: walk(kv[0]) + walk(kv[1])
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            items, per_item = obj, walk
+        elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+            return size + walk(vars(obj))
+        else:
+            # str / bytes / 숫자 등: getsizeof 가 곧 크기
+            return size
+
+        count = total = 0
+        for item in items:
+            if budget[0] <= 0:
+                break
+            budget[0] -= 1
+            total += per_item(item)
+            count += 1
+        if count and count < len(obj):
+            total = total * len(obj) // count
+        return size + total
+
+    return walk(value)
+
+
+class BoundedCache:
+    """최대 항목 수 / 바이트 예산 LRU + 네임스페이스별 TTL"""
+
+    shared = False
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES,
+                 namespace_ttls: Optional[Dict[str, float]] = None, default_ttl: float = DEFAULT_TTL,
+                 sweep_interval: float = CACHE_SWEEP_INTERVAL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.namespace_ttls = dict(NAMESPACE_TTLS if namespace_ttls is None else namespace_ttls)
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+        # (namespace, key) -> (value, size, expires_at)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._sweeper: Optional[threading.Thread] = None
+
+    def _ns_stats(self, namespace: str) -> Dict[str, int]:
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0, "expirations": 0}
+        return stats
+
+    def ttl_for(self, namespace: str) -> float:
+        return self.namespace_ttls.get(namespace, self.default_ttl)
+
+    def get(self, key: Hashable, namespace: str = "default") -> Optional[Any]:
+        entry_key = (namespace, key)
+        with self._lock:
+            stats = self._ns_stats(namespace)
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                stats["misses"] += 1
+                return None
+            if entry[2] <= time.time():
+                self._remove_locked(entry_key)
+                stats["expirations"] += 1
+                stats["misses"] += 1
+                return None
+            self._entries.move_to_end(entry_key)
+            stats["hits"] += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, namespace: str = "default", ttl: Optional[float] = None):
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.time() + (self.ttl_for(namespace) if ttl is None else ttl)
+        entry_key = (namespace, key)
+
+        with self._lock:
+            self._remove_locked(entry_key)
+            self._entries[entry_key] = (value, size, expires_at)
+            self._bytes += size
+            self._ns_stats(namespace)["sets"] += 1
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+                self._ns_stats(oldest[0])["evictions"] += 1
+
+        self._ensure_sweeper()
+
+    def delete(self, key: Hashable, namespace: str = "default"):
+        with self._lock:
+            self._remove_locked((namespace, key))
+
+    # async 경로용 (메모리 조회는 블로킹이 없으므로 스레드 전환 없이 실행)
+    async def aget(self, key: Hashable, namespace: str = "default") -> Optional[Any]:
+        return self.get(key, namespace)
+
+    async def aset(self, key: Hashable, value: Any, namespace: str = "default", ttl: Optional[float] = None):
+        self.set(key, value, namespace, ttl)
+
+    async def adelete(self, key: Hashable, namespace: str = "default"):
+        self.delete(key, namespace)
+
+    def clear(self, namespace: Optional[str] = None):
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                self._remove_locked(entry_key)
+
+    def _remove_locked(self, entry_key):
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def sweep(self) -> int:
+        """만료된 항목 일괄 삭제 (삭제 수 반환)"""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, entry in self._entries.items() if entry[2] <= now]
+            for entry_key in expired:
+                self._remove_locked(entry_key)
+                self._ns_stats(entry_key[0])["expirations"] += 1
+        return len(expired)
+
+    def _ensure_sweeper(self):
+        if self._sweeper is not None or self.sweep_interval <= 0:
+            return
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="cache-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_loop(self):
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                removed = self.sweep()
+                if removed:
+                    logger.debug(f"Cache sweep: {removed} expired entries removed")
+            except Exception as e:
+                logger.warning(f"Cache sweep failed: {e}")
+
+    def size(self, namespace: Optional[str] = None) -> int:
+        if namespace is None:
+            return len(self._entries)
+        with self._lock:
+            return sum(1 for k in self._entries if k[0] == namespace)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            namespaces = {}
+            for namespace, stats in self._stats.items():
+                total = stats["hits"] + stats["misses"]
+                namespaces[namespace] = {
+                    **stats,
+                    "hit_rate": round(stats["hits"] / total, 3) if total else 0.0,
+                }
+            for (namespace, _), entry in self._entries.items():
+                ns = namespaces.setdefault(namespace, {})
+                ns["entries"] = ns.get("entries", 0) + 1
+                ns["bytes"] = ns.get("bytes", 0) + entry[1]
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "namespaces": namespaces,
+            }
+
+
+class SharedCache:
+    """BoundedCache 와 같은 API 의 공유 백엔드 캐시 (값은 dumps/loads 로 직렬화)"""
+
+    shared = True
+
+    def __init__(self, backend, namespace_ttls: Optional[Dict[str, float]] = None, default_ttl: float = DEFAULT_TTL):
+        self.backend = backend
+        self.namespace_ttls = dict(NAMESPACE_TTLS if namespace_ttls is None else namespace_ttls)
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return key if isinstance(key, str) else repr(key)
+
+    def _record(self, namespace: str, name: str):
+        with self._lock:
+            stats = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "sets": 0, "errors": 0})
+            stats[name] += 1
+
+    def ttl_for(self, namespace: str) -> float:
+        return self.namespace_ttls.get(namespace, self.default_ttl)
+
+    def get(self, key: Hashable, namespace: str = "default") -> Optional[Any]:
+        try:
+            blob = self.backend.get(namespace, self._key(key))
+            value = loads(blob) if blob is not None else None
+        except Exception as e:
+            # 캐시 장애는 요청 실패로 이어지지 않게 miss 로 처리
+            logger.warning(f"Shared cache get failed: {e}")
+            self._record(namespace, "errors")
+            value = None
+        self._record(namespace, "hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: Hashable, value: Any, namespace: str = "default", ttl: Optional[float] = None):
+        try:
+            self.backend.set(namespace, self._key(key), dumps(value), self.ttl_for(namespace) if ttl is None else ttl)
+            self._record(namespace, "sets")
+        except Exception as e:
+            logger.warning(f"Shared cache set failed: {e}")
+            self._record(namespace, "errors")
+
+    def delete(self, key: Hashable, namespace: str = "default"):
+        try:
+            self.backend.delete(namespace, self._key(key))
+        except Exception as e:
+            logger.warning(f"Shared cache delete failed: {e}")
+
+    # async 경로용 (Redis / SQLite 호출은 동기라서 워커 스레드에서 실행)
+    async def aget(self, key: Hashable, namespace: str = "default") -> Optional[Any]:
+        return await asyncio.to_thread(self.get, key, namespace)
+
+    async def aset(self, key: Hashable, value: Any, namespace: str = "default", ttl: Optional[float] = None):
+        await asyncio.to_thread(self.set, key, value, namespace, ttl)
+
+    async def adelete(self, key: Hashable, namespace: str = "default"):
+        await asyncio.to_thread(self.delete, key, namespace)
+
+    def clear(self, namespace: Optional[str] = None):
+        self.backend.clear(namespace)
+
+    def size(self, namespace: Optional[str] = None) -> int:
+        try:
+            return self.backend.size(namespace)
+        except Exception:
+            return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            namespaces = {}
+            for namespace, stats in self._stats.items():
+                total = stats["hits"] + stats["misses"]
+                namespaces[namespace] = {
+                    **stats,
+                    "hit_rate": round(stats["hits"] / total, 3) if total else 0.0,
+                }
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": self.size(),
+            "namespaces": namespaces,
         }
-        print(f"💾 [Cache SET] {message[:30]}... (TTL: {self.ttl.seconds}s)")
-    
-    def clear(self):
-        """캐시 전체 삭제"""
-        self.cache.clear()
-        print("🧹 [Cache CLEARED]")
-    
-    def size(self) -> int:
-        """캐시 크기"""
-        return len(self.cache)
-
-
-# 전역 캐시 인스턴스
-langgraph_cache = SimpleCache(ttl_seconds=300)  # 5분
+
+
+def create_cache(kind: str = CACHE_BACKEND):
+    """CACHE_BACKEND 설정에 맞는 캐시 생성 (공유 백엔드 생성 실패 시 메모리 캐시)"""
+    if kind == "memory":
+        return BoundedCache()
+    try:
+        return SharedCache(create_backend(kind))
+    except Exception as e:
+        logger.error(f"Cache backend '{kind}' unavailable, falling back to memory: {e}")
+        return BoundedCache()
+
+
+# 전역 공용 캐시 (검색 결과, 숙소 가격, 장소 상세 등)
+app_cache = create_cache()
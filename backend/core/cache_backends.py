@@ -0,0 +1,180 @@
+"""공유 캐시 백엔드
+
+`uvicorn --workers N` 으로 띄우면 프로세스별 메모리 캐시는 적중률이 1/N 이 됩니다.
+여러 워커가 같은 저장소를 보도록 하는 백엔드와 바이너리 직렬화를 제공합니다.
+
+- SQLiteCacheBackend: 한 서버 안의 워커끼리 공유 (WAL 모드 파일 1개, 추가 인프라 없음)
+- RedisCacheBackend: 여러 서버에서 공유 (redis 패키지 필요)
+- dumps / loads: pickle(최고 프로토콜) + 일정 크기 이상이면 zlib 압축, 1바이트 헤더
+
+백엔드는 bytes 만 다루고, 직렬화 / 지표는 core.cache.SharedCache 가 담당합니다.
+"""
+import os
+import time
+import zlib
+import pickle
+import sqlite3
+import logging
+import threading
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# 이 크기 이상이면 압축 시도
+COMPRESS_THRESHOLD = 1024
+
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+
+
+def dumps(value: Any) -> bytes:
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) >= COMPRESS_THRESHOLD:
+        compressed = zlib.compress(data, 1)
+        if len(compressed) < len(data):
+            return _ZLIB + compressed
+    return _RAW + data
+
+
+def loads(blob: bytes) -> Any:
+    header, payload = blob[:1], blob[1:]
+    if header == _ZLIB:
+        payload = zlib.decompress(payload)
+    elif header != _RAW:
+        raise ValueError(f"unknown cache payload header: {header!r}")
+    return pickle.loads(payload)
+
+
+class SQLiteCacheBackend:
+    """SQLite 파일 하나를 여러 워커 프로세스가 공유"""
+
+    def __init__(self, path: str, max_entries: int = 50000, prune_every: int = 500):
+        self.path = path
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._conn().execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries (expires_at)")
+        self._conn().commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # 스레드별 커넥션 (to_thread 워커에서도 호출됨)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return row[0]
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: float):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, sqlite3.Binary(value), time.time() + ttl),
+        )
+        conn.commit()
+
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.prune_every == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """만료 항목 삭제 + 최대 항목 수 초과분은 만료가 가까운 것부터 삭제"""
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM cache_entries WHERE rowid IN ("
+            " SELECT rowid FROM cache_entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        conn.commit()
+
+    def delete(self, namespace: str, key: str):
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+        conn.commit()
+
+    def clear(self, namespace: Optional[str] = None):
+        conn = self._conn()
+        if namespace is None:
+            conn.execute("DELETE FROM cache_entries")
+        else:
+            conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+        conn.commit()
+
+    def size(self, namespace: Optional[str] = None) -> int:
+        if namespace is None:
+            row = self._conn().execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        else:
+            row = self._conn().execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (namespace,)
+            ).fetchone()
+        return row[0]
+
+
+class RedisCacheBackend:
+    """Redis (또는 Redis 프로토콜 호환 서버) 공유 캐시"""
+
+    def __init__(self, url: str, prefix: str = "localy"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package (pip install redis)") from e
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        return self.client.get(self._key(namespace, key))
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: float):
+        self.client.set(self._key(namespace, key), value, px=max(int(ttl * 1000), 1))
+
+    def delete(self, namespace: str, key: str):
+        self.client.delete(self._key(namespace, key))
+
+    def _scan(self, namespace: Optional[str]):
+        pattern = f"{self.prefix}:{namespace}:*" if namespace else f"{self.prefix}:*"
+        return self.client.scan_iter(match=pattern, count=500)
+
+    def clear(self, namespace: Optional[str] = None):
+        batch = []
+        for key in self._scan(namespace):
+            batch.append(key)
+            if len(batch) >= 500:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+
+    def size(self, namespace: Optional[str] = None) -> int:
+        return sum(1 for _ in self._scan(namespace))
+
+
+def create_backend(kind: str, url: Optional[str] = None):
+    """CACHE_BACKEND 값으로 백엔드 생성 ("sqlite" / "redis")"""
+    if kind == "sqlite":
+        return SQLiteCacheBackend(url or os.getenv("CACHE_SQLITE_PATH", "./shared_cache.db"))
+    if kind == "redis":
+        return RedisCacheBackend(url or os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"))
+    raise ValueError(f"unknown cache backend: {kind}")
@@ -0,0 +1,41 @@
+"""에이전트 실행 취소 신호
+
+asyncio 태스크는 취소해도 `asyncio.to_thread` 로 돌고 있는 워커 스레드는 멈추지 않습니다.
+parallel_search_node 가 에이전트마다 threading.Event 를 contextvar 로 심어 두면
+(to_thread 는 contextvars 를 워커 스레드로 복사) 외부 호출 지점에서 신호를 확인하고
+다음 업스트림 호출 전에 스레드를 빠르게 끝낼 수 있습니다.
+"""
+import threading
+import concurrent.futures
+from contextvars import ContextVar
+from typing import Optional
+
+# 현재 에이전트 실행의 취소 신호 (없으면 None)
+agent_cancel_event: ContextVar[Optional[threading.Event]] = ContextVar("agent_cancel_event", default=None)
+
+# 취소 신호 확인 주기 (초)
+POLL_INTERVAL = 0.1
+
+
+class AgentCancelled(Exception):
+    """데드라인 초과 등으로 에이전트 실행이 취소됨"""
+
+
+def is_cancelled() -> bool:
+    event = agent_cancel_event.get()
+    return event is not None and event.is_set()
+
+
+def wait_future(future: concurrent.futures.Future):
+    """concurrent Future 결과를 기다리되, 에이전트가 취소되면 즉시 AgentCancelled"""
+    event = agent_cancel_event.get()
+    if event is None:
+        return future.result()
+
+    while True:
+        try:
+            return future.result(timeout=POLL_INTERVAL)
+        except concurrent.futures.TimeoutError:
+            if event.is_set():
+                future.cancel()
+                raise AgentCancelled()
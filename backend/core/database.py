@@ -1,5 +1,6 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -14,18 +15,67 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./travel.db")
 
 print(f"🔗 Connecting to Database: {SQLALCHEMY_DATABASE_URL}")
 
+# [Optimization] 커넥션 풀 설정 (MySQL)
+# - pool_pre_ping: 끊어진 커넥션(MySQL wait_timeout)을 체크아웃 시 감지해서 교체
+# - pool_recycle: wait_timeout(기본 8시간)보다 먼저 재연결
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+
+
+def _async_url(url: str) -> str:
+    """동기 드라이버 URL -> 비동기 드라이버 URL (pymysql -> aiomysql, sqlite -> aiosqlite)"""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if dialect in ("mysql", "mariadb"):
+        return f"{dialect}+aiomysql{sep}{rest}"
+    return url
+
+
+def _engine_options() -> dict:
+    if IS_SQLITE:
+        # SQLite일 경우에만 check_same_thread 옵션 필요 (파일 DB는 풀 설정 불필요)
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def _enable_sqlite_wal(sync_engine):
+    """SQLite WAL 모드: 읽기가 쓰기를 기다리지 않음 (동시 요청에서 database is locked 방지)"""
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+
 # 2. 엔진 생성 (DB와 연결되는 핵심 객체)
-# SQLite일 경우에만 check_same_thread 옵션 필요
-connect_args = {}
-if "sqlite" in SQLALCHEMY_DATABASE_URL:
-    connect_args = {"check_same_thread": False}
+# 동기 엔진: init_db / 마이그레이션 / LangChain 동기 툴용
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_engine_options())
+
+# 3. 비동기 엔진: async 라우터에서 이벤트 루프를 막지 않도록 aiomysql / aiosqlite 사용
+async_engine = create_async_engine(_async_url(SQLALCHEMY_DATABASE_URL), **_engine_options())
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args=connect_args
-)
+if IS_SQLITE:
+    _enable_sqlite_wal(engine)
+    _enable_sqlite_wal(async_engine.sync_engine)
 
 # 5. 세션 생성 (실제 데이터 작업을 수행하는 도구)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# commit 후에도 로드된 속성을 읽을 수 있도록 expire_on_commit=False (비동기 세션은 lazy load 불가)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # 6. 모델들이 상속받을 기본 클래스 (이걸로 테이블을 만듭니다)
 Base = declarative_base()
@@ -36,4 +86,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# 8. 비동기 DB 세션 (async 라우터에서 사용)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,157 @@
+"""지오코딩 영구 캐시 (SQLite)
+
+거의 모든 에이전트가 `geocode(f"{region}, 대한민국")` 로 시작하므로
+같은 지역 좌표를 서버 재시작 후에도 재사용할 수 있도록 SQLite 에 저장합니다.
+
+- "제주도"/"제주", "신림"/"서울 신림동" 같은 별칭을 하나의 키로 정규화
+- 메모리(dict) 1차 + SQLite 2차 구조
+"""
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", "./geocode_cache.db")
+GEOCODE_CACHE_TTL = int(os.getenv("GEOCODE_CACHE_TTL", str(30 * 24 * 3600)))  # 30일
+MEMORY_MAX_ENTRIES = 2048
+
+# 지역명 별칭 -> 대표 지역명
+REGION_ALIASES = {
+    "제주도": "제주",
+    "제주시": "제주",
+    "신림": "서울 신림동",
+    "신림동": "서울 신림동",
+    "서울시": "서울",
+    "서울특별시": "서울",
+    "부산시": "부산",
+    "부산광역시": "부산",
+    "해운대": "부산 해운대",
+    "강릉시": "강릉",
+    "경주시": "경주",
+    "여수시": "여수",
+    "전주시": "전주",
+    "속초시": "속초",
+}
+
+# 에이전트들이 붙이는 국가 접미사
+_COUNTRY_SUFFIX = re.compile(r"\s*,?\s*(대한민국|한국|south korea|korea)\s*$", re.IGNORECASE)
+
+
+def normalize_region(region: str) -> str:
+    """지역명 정규화 (공백 정리 + 국가 접미사 제거 + 별칭 치환)
+
+    예: "제주도, 대한민국" -> "제주", "신림" -> "서울 신림동"
+    """
+    text = " ".join((region or "").split())
+    text = _COUNTRY_SUFFIX.sub("", text).strip(" ,")
+    return REGION_ALIASES.get(text, text)
+
+
+class GeocodeCache:
+    """정규화된 지역명 기준 지오코딩 결과 캐시"""
+
+    def __init__(self, db_path: str = GEOCODE_CACHE_PATH, ttl_seconds: int = GEOCODE_CACHE_TTL):
+        self.db_path = db_path
+        self.ttl = ttl_seconds
+        self._memory: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_cache ("
+                " cache_key TEXT PRIMARY KEY,"
+                " results TEXT NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(region: str, language: Optional[str], country: Optional[str]) -> str:
+        return f"{normalize_region(region)}|{language or ''}|{country or ''}"
+
+    def _remember(self, key: str, entry: tuple):
+        """메모리 1차 캐시에 저장 (가장 오래된 항목부터 밀어냄)"""
+        self._memory.pop(key, None)
+        if len(self._memory) >= MEMORY_MAX_ENTRIES:
+            self._memory.pop(next(iter(self._memory)))
+        self._memory[key] = entry
+
+    def get(self, region: str, language: Optional[str] = None, country: Optional[str] = None,
+            memory_only: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """캐시 조회 (없거나 만료되면 None)
+
+        memory_only=True 면 SQLite 를 건드리지 않는 빠른 경로 (miss 는 통계에 넣지 않음,
+        이어서 전체 조회를 하는 호출 측에서 집계)
+        """
+        key = self.make_key(region, language, country)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if memory_only:
+                if entry is not None and now - entry[1] < self.ttl:
+                    self.stats["hits"] += 1
+                    return entry[0]
+                return None
+            if entry is None:
+                try:
+                    row = self._get_conn().execute(
+                        "SELECT results, created_at FROM geocode_cache WHERE cache_key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ [Geocode Cache] 조회 실패: {e}")
+                    row = None
+                if row:
+                    entry = (json.loads(row[0]), row[1])
+                    self._remember(key, entry)
+
+            if entry is not None and now - entry[1] < self.ttl:
+                self.stats["hits"] += 1
+                return entry[0]
+
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, region: str, results: List[Dict[str, Any]], language: Optional[str] = None, country: Optional[str] = None):
+        """결과 저장 (빈 결과는 저장하지 않음)"""
+        if not results:
+            return
+        key = self.make_key(region, language, country)
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, (results, now))
+            try:
+                conn = self._get_conn()
+                conn.execute(
+                    "INSERT OR REPLACE INTO geocode_cache (cache_key, results, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(results, ensure_ascii=False), now),
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ [Geocode Cache] 저장 실패: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            try:
+                conn = self._get_conn()
+                conn.execute("DELETE FROM geocode_cache")
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ [Geocode Cache] 삭제 실패: {e}")
+
+
+# 전역 지오코딩 캐시 인스턴스
+geocode_cache = GeocodeCache()
@@ -0,0 +1,150 @@
+"""의도 분석 결과 캐시 (근사 매칭)
+
+"부산 맛집 알려줘" / "부산 맛집 추천해줘" 처럼 표현만 다른 메시지가
+같은 intent_type / destination / dates 로 분석되도록,
+LLM 분석 결과를 정규화된 발화 기준으로 저장하고 최근접 이웃으로 조회합니다.
+
+- 정규화: 소문자화, 문장부호 제거, 요청 어미("알려줘", "추천해줘" 등) 제거
+- 유사도: 문자 bigram 코사인 유사도 (프로세스 내 인덱스, 임베딩 API 호출 없음)
+- 오탐 방지: 목적지(지역 사전), 숫자(날짜), 의도 키워드 종류가 다르면 매칭하지 않음
+- LRU + TTL 로 크기 제한
+"""
+import os
+import re
+import math
+import time
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from utils.intent_classifier import extract_destination, intent_keywords
+
+INTENT_CACHE_MAX_ENTRIES = int(os.getenv("INTENT_CACHE_MAX_ENTRIES", "2000"))
+INTENT_CACHE_TTL = int(os.getenv("INTENT_CACHE_TTL", str(24 * 3600)))
+SIMILARITY_THRESHOLD = float(os.getenv("INTENT_CACHE_THRESHOLD", "0.85"))
+
+# 의미 없이 붙는 요청 표현 (정규화 시 제거)
+FILLER_WORDS = {
+    "좀", "한번", "혹시", "추천", "추천해줘", "추천해", "추천해주세요", "추천좀",
+    "알려줘", "알려", "알려주세요", "알려줄래", "찾아줘", "찾아주세요",
+    "보여줘", "보여주세요", "해줘", "해주세요", "주세요", "줘", "있어", "있을까",
+    "어디야", "어디", "뭐야", "please", "recommend", "show", "me", "tell", "find",
+}
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_DIGITS = re.compile(r"\d+")
+
+
+def normalize_utterance(text: str) -> str:
+    """
+    발화 정규화
+
+    Examples:
+        >>> normalize_utterance("부산 맛집 추천해줘!!")
+        '부산 맛집'
+        >>> normalize_utterance("부산 맛집 좀 알려줘~")
+        '부산 맛집'
+    """
+    text = _PUNCTUATION.sub(" ", (text or "").lower())
+    words = [w for w in text.split() if w not in FILLER_WORDS]
+    return " ".join(words)
+
+
+def _bigrams(text: str) -> Counter:
+    padded = f" {text} "
+    return Counter(padded[i:i + 2] for i in range(len(padded) - 1))
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b[gram] for gram, count in a.items() if gram in b)
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm if norm else 0.0
+
+
+class IntentCache:
+    """정규화된 발화 -> 의도 분석 결과 (최근접 이웃 조회)"""
+
+    def __init__(self, max_entries: int = INTENT_CACHE_MAX_ENTRIES,
+                 ttl_seconds: int = INTENT_CACHE_TTL,
+                 threshold: float = SIMILARITY_THRESHOLD):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.threshold = threshold
+        # 정규화 발화 -> (bigram 벡터, 서명, 결과, 저장 시각)
+        self._entries: "OrderedDict[str, Tuple[Counter, tuple, Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def _signature(normalized: str) -> tuple:
+        """오탐 방지용 서명 (목적지, 숫자 목록, 의도 키워드 종류)"""
+        return (
+            extract_destination(normalized),
+            tuple(_DIGITS.findall(normalized)),
+            intent_keywords(normalized),
+        )
+
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        normalized = normalize_utterance(text)
+        if not normalized:
+            return None
+        now = time.time()
+
+        with self._lock:
+            # 1. 정규화 후 완전 일치
+            entry = self._entries.get(normalized)
+            if entry and now - entry[3] < self.ttl:
+                self._entries.move_to_end(normalized)
+                self.stats["exact_hits"] += 1
+                return dict(entry[2])
+
+            # 2. 최근접 이웃 (서명이 같은 항목만)
+            vector = _bigrams(normalized)
+            signature = self._signature(normalized)
+            best_key, best_score = None, 0.0
+            for key, (vec, sig, _, created_at) in self._entries.items():
+                if sig != signature or now - created_at >= self.ttl:
+                    continue
+                score = _cosine(vector, vec)
+                if score > best_score:
+                    best_key, best_score = key, score
+
+            if best_key is not None and best_score >= self.threshold:
+                self._entries.move_to_end(best_key)
+                self.stats["similar_hits"] += 1
+                return dict(self._entries[best_key][2])
+
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, text: str, result: Dict[str, Any]):
+        normalized = normalize_utterance(text)
+        if not normalized:
+            return
+        signature = self._signature(normalized)
+
+        with self._lock:
+            self._entries.pop(normalized, None)
+            self._entries[normalized] = (_bigrams(normalized), signature, dict(result), time.time())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.stats["exact_hits"] + self.stats["similar_hits"]
+        total = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+        }
+
+
+# 전역 의도 캐시 인스턴스
+intent_cache = IntentCache()
@@ -0,0 +1,172 @@
+"""LLM 클라이언트 공용 풀
+
+요청마다 OpenAI / ChatOpenAI 클라이언트를 새로 만들면 매번 TCP/TLS 연결을 새로 맺습니다.
+(특히 pinggy 터널 너머 vLLM 서버는 핸드셰이크 비용이 큼)
+백엔드별 클라이언트를 프로세스당 한 번만 지연 생성하고, keep-alive 커넥션 풀을 공유합니다.
+
+- get_qwen_client():     원격 vLLM(Qwen) OpenAI 호환 클라이언트
+- get_openai_client():   OpenAI (GPT-4 영어 응답 등)
+- get_chat_model(...):   LangChain ChatOpenAI (모델/temperature 조합별 1개)
+- get_pool_stats():      백엔드별 요청 수 / 신규 연결 수 / 재사용 수
+- complete_text(...):    Chat Completion 텍스트 (on_token 지정 시 토큰 스트리밍)
+"""
+import os
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+from openai import OpenAI
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# 커넥션 풀 설정
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "10"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+
+DEFAULT_QWEN_URL = "https://yojgf-125-6-60-4.a.free.pinggy.link/v1"
+
+_lock = threading.Lock()
+# factory 안에서 다른 공용 클라이언트를 만들 수 있으므로 재진입 가능 락
+_clients_lock = threading.RLock()
+_clients: Dict[Any, Any] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _record(backend: str, key: str):
+    with _lock:
+        stats = _stats.setdefault(backend, {"requests": 0, "new_connections": 0})
+        stats[key] += 1
+
+
+def _make_http_client(backend: str, timeout: float) -> httpx.Client:
+    """keep-alive 풀 + 연결 재사용 지표를 가진 httpx.Client"""
+
+    def trace(event_name: str, info: dict):
+        # httpcore trace: 새 TCP 연결을 맺을 때만 발생
+        if event_name == "connection.connect_tcp.complete":
+            _record(backend, "new_connections")
+
+    def on_request(request: httpx.Request):
+        _record(backend, "requests")
+        request.extensions["trace"] = trace
+
+    return httpx.Client(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        ),
+        event_hooks={"request": [on_request]},
+    )
+
+
+def _get_or_create(key, factory):
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = factory()
+                _clients[key] = client
+    return client
+
+
+def resolve_qwen_base_url() -> str:
+    """KAMP_QWEN_URL 정규화 (/chat/completions 제거, /v1 로 끝나게)"""
+    base_url = os.getenv("KAMP_QWEN_URL", DEFAULT_QWEN_URL)
+
+    # URL 보정: /chat/completions가 붙어있으면 떼어냄
+    if "/chat/completions" in base_url:
+        base_url = base_url.replace("/chat/completions", "")
+
+    # /v1 로 끝나는지 확인 (OpenAI Client 요구사항)
+    if not base_url.endswith("/v1"):
+        base_url = base_url.rstrip("/") + "/v1"
+    return base_url
+
+
+def get_qwen_client() -> OpenAI:
+    """원격 vLLM(Qwen) 클라이언트 (프로세스 공용)"""
+    def factory():
+        base_url = resolve_qwen_base_url()
+        logger.info(f"Qwen Client Initialized (Base: {base_url})")
+        return OpenAI(
+            base_url=base_url,
+            api_key="not-needed",
+            default_headers={"Bypass-Tunnel-Reminder": "true"},
+            timeout=30.0,
+            http_client=_make_http_client("qwen", 30.0),
+        )
+    return _get_or_create("qwen", factory)
+
+
+def _get_openai_http_client() -> httpx.Client:
+    """api.openai.com 용 커넥션 풀 (OpenAI SDK / ChatOpenAI 공용)"""
+    return _get_or_create("openai_http", lambda: _make_http_client("openai", 60.0))
+
+
+def get_openai_client() -> OpenAI:
+    """OpenAI 클라이언트 (프로세스 공용)"""
+    def factory():
+        return OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=_get_openai_http_client(),
+        )
+    return _get_or_create("openai", factory)
+
+
+def get_chat_model(model: str = "gpt-4o-mini", temperature: float = 0.0):
+    """LangChain ChatOpenAI (모델/temperature 조합별 1개, OpenAI 커넥션 풀 공유)"""
+    from langchain_openai import ChatOpenAI
+
+    key: Tuple[str, str, float] = ("chat_model", model, temperature)
+
+    def factory():
+        return ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            http_client=_get_openai_http_client(),
+        )
+    return _get_or_create(key, factory)
+
+
+def complete_text(create: Callable[..., Any], on_token: Optional[Callable[[str], None]] = None, **kwargs) -> str:
+    """Chat Completion 결과 텍스트
+
+    on_token 이 있으면 stream=True 로 요청하고 도착하는 토큰마다 on_token(delta) 호출,
+    최종적으로는 스트리밍하지 않은 경우와 같은 전체 텍스트를 반환합니다.
+
+    Args:
+        create: client.chat.completions.create 호환 함수
+    """
+    if on_token is None:
+        return create(**kwargs).choices[0].message.content
+
+    parts = []
+    for chunk in create(stream=True, **kwargs):
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            on_token(delta)
+    return "".join(parts)
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """백엔드별 연결 재사용 지표"""
+    with _lock:
+        result = {}
+        for backend, stats in _stats.items():
+            reused = max(stats["requests"] - stats["new_connections"], 0)
+            result[backend] = {
+                **stats,
+                "reused": reused,
+                "reuse_rate": round(reused / stats["requests"], 3) if stats["requests"] else 0.0,
+            }
+        return result
@@ -0,0 +1,66 @@
+"""사용자별 페르소나 캐시
+
+워크플로 매 턴마다 load_profile_node 가 get_persona 를 호출해 DB 세션을 열고
+User / Persona 를 조회한 뒤 UserPersona 로 변환합니다. 페르소나는 거의 바뀌지 않으므로
+변환된 결과를 user_id 기준으로 app_cache("persona" 네임스페이스)에 보관합니다.
+
+- 페르소나가 없는 사용자도 {"persona": None} 으로 저장 (매 턴 DB 조회 방지)
+- create/update/delete_persona, /auth/update-profile, 회원 탈퇴 시 invalidate
+- 공유 백엔드(CACHE_BACKEND=sqlite|redis)면 다른 워커의 invalidate 도 바로 반영
+- 모두 async 경로(페르소나 툴, auth 라우터)에서 쓰이므로 aget/aset 으로 이벤트 루프를 막지 않음
+
+세대(generation) 토큰:
+    조회가 DB 를 읽는 사이에 수정 + invalidate 가 끝나면, 조회 쪽이 읽어 둔 옛 값을 캐시에
+    다시 넣을 수 있습니다. 조회는 DB 를 읽기 전에 세대 토큰을 받아 두고(begin_fill) 값과 함께 저장하며,
+    invalidate 는 토큰을 새로 바꿉니다. 토큰이 다르거나 없는 항목은 miss 로 처리합니다.
+"""
+import os
+import copy
+import uuid
+from typing import Any, Dict, Optional
+
+from core.cache import app_cache
+
+PERSONA_CACHE_TTL = int(os.getenv("PERSONA_CACHE_TTL", "3600"))
+
+app_cache.namespace_ttls.setdefault("persona", PERSONA_CACHE_TTL)
+# 세대 토큰은 항목보다 오래 유지 (토큰이 먼저 사라져도 항목은 miss 로 처리되므로 안전)
+app_cache.namespace_ttls.setdefault("persona_gen", PERSONA_CACHE_TTL * 2)
+
+
+async def _new_generation(user_id: str) -> str:
+    generation = uuid.uuid4().hex
+    await app_cache.aset(user_id, generation, "persona_gen")
+    return generation
+
+
+async def begin_fill(user_id: str) -> str:
+    """DB 조회 전에 호출 -> set_cached_persona 에 넘길 세대 토큰"""
+    return await app_cache.aget(user_id, "persona_gen") or await _new_generation(user_id)
+
+
+async def get_cached_persona(user_id: str) -> Optional[Dict[str, Any]]:
+    """캐시 조회 -> {"persona": dict 또는 None} 또는 None(miss)"""
+    cached = await app_cache.aget(user_id, "persona")
+    if cached is None:
+        return None
+    generation = await app_cache.aget(user_id, "persona_gen")
+    if generation is None or cached.get("generation") != generation:
+        # invalidate 이전에 읽은 값
+        return None
+    if app_cache.shared:
+        return cached
+    # 호출 측에서 수정해도 캐시 값이 바뀌지 않도록 복사본 반환
+    return copy.deepcopy(cached)
+
+
+async def set_cached_persona(user_id: str, persona: Optional[Dict[str, Any]], generation: str):
+    if not app_cache.shared:
+        persona = copy.deepcopy(persona)
+    await app_cache.aset(user_id, {"persona": persona, "generation": generation}, "persona")
+
+
+async def invalidate_persona(user_id: str):
+    # 토큰을 먼저 바꿔서, 진행 중인 조회가 나중에 저장하는 옛 값도 무효가 되도록 함
+    await _new_generation(user_id)
+    await app_cache.adelete(user_id, "persona")
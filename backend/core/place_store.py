@@ -0,0 +1,172 @@
+"""장소 상세 정보 저장소 (Place Details Store)
+
+restaurant_agent 의 `_place_cache` (무제한 dict, place_id + 필드 목록 단위 저장)를 대체합니다.
+
+- place_id 단위 LRU (최대 항목 수 제한)
+- 필드별 TTL (opening_hours 는 짧게, name/주소는 길게)
+- 필드 단위 병합: 앞서 받아 둔 필드는 다른 필드 조합 요청에서도 재사용
+- hit / partial / miss / eviction 지표
+- 공유 캐시 백엔드(CACHE_BACKEND=sqlite|redis)면 app_cache 의 "place" 네임스페이스에도 기록해
+  다른 워커가 받아 둔 필드를 재사용
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.cache import app_cache
+
+PLACE_STORE_MAX_PLACES = int(os.getenv("PLACE_STORE_MAX_PLACES", "5000"))
+
+# 필드별 TTL (초)
+FIELD_TTLS = {
+    # 자주 바뀌는 정보
+    "opening_hours": 10 * 60,
+    "current_opening_hours": 10 * 60,
+    "business_status": 60 * 60,
+    # 리뷰/평점
+    "reviews": 6 * 3600,
+    "rating": 6 * 3600,
+    "user_ratings_total": 6 * 3600,
+    # 거의 바뀌지 않는 정보
+    "name": 7 * 24 * 3600,
+    "formatted_address": 7 * 24 * 3600,
+    "geometry": 7 * 24 * 3600,
+    "formatted_phone_number": 7 * 24 * 3600,
+    "website": 7 * 24 * 3600,
+    "photo": 7 * 24 * 3600,
+    "type": 7 * 24 * 3600,
+}
+DEFAULT_FIELD_TTL = 24 * 3600
+# 공유 캐시 보관 기간 (필드별 신선도는 저장된 시각으로 따로 판단)
+SHARED_ENTRY_TTL = max(FIELD_TTLS.values())
+
+# 요청 필드명 -> 응답 키 (다른 경우만)
+FIELD_RESPONSE_KEYS = {
+    "photo": "photos",
+    "type": "types",
+    "address_component": "address_components",
+}
+
+
+class _Missing:
+    """응답에 키가 없던 필드도 "가져왔음"으로 기억하기 위한 표식 (직렬화 후에도 같은 객체)"""
+
+    def __reduce__(self):
+        return "_MISSING"
+
+
+_MISSING = _Missing()
+
+
+def response_key(field: str) -> str:
+    return FIELD_RESPONSE_KEYS.get(field, field)
+
+
+class PlaceDetailsStore:
+    """place_id 별 필드 단위 캐시"""
+
+    def __init__(self, max_places: int = PLACE_STORE_MAX_PLACES):
+        self.max_places = max_places
+        # (place_id, language) -> {field: (value, fetched_at)}
+        self._places: "OrderedDict[Tuple[str, str], Dict[str, tuple]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "partial_hits": 0, "misses": 0, "evictions": 0}
+
+    def lookup(self, place_id: str, fields: Iterable[str], language: Optional[str] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """신선한 필드는 결과로, 없거나 만료된 필드는 missing 목록으로 반환
+
+        Returns:
+            (result, missing_fields) - result 는 응답 키 기준 dict
+        """
+        fields = list(fields)
+        key = (place_id, language or "")
+        now = time.time()
+        result: Dict[str, Any] = {}
+        missing: List[str] = []
+
+        shared_entry = None
+        if app_cache.shared and key not in self._places:
+            shared_entry = app_cache.get(self._shared_key(key), "place")
+
+        with self._lock:
+            if shared_entry is not None and key not in self._places:
+                self._places[key] = shared_entry
+                self._evict_locked()
+            entry = self._places.get(key)
+            if entry is not None:
+                self._places.move_to_end(key)
+
+            for field in fields:
+                cached = entry.get(field) if entry else None
+                if cached and now - cached[1] < FIELD_TTLS.get(field, DEFAULT_FIELD_TTL):
+                    if cached[0] is not _MISSING:
+                        result[response_key(field)] = cached[0]
+                else:
+                    missing.append(field)
+
+            if not missing:
+                self.stats["hits"] += 1
+            elif len(missing) < len(fields):
+                self.stats["partial_hits"] += 1
+            else:
+                self.stats["misses"] += 1
+
+        return result, missing
+
+    def update(self, place_id: str, fields: Iterable[str], result: Dict[str, Any], language: Optional[str] = None):
+        """API 응답을 필드 단위로 병합 저장"""
+        key = (place_id, language or "")
+        now = time.time()
+
+        with self._lock:
+            entry = self._places.get(key)
+            if entry is None:
+                entry = {}
+                self._places[key] = entry
+            self._places.move_to_end(key)
+
+            for field in fields:
+                entry[field] = (result.get(response_key(field), _MISSING), now)
+            snapshot = dict(entry)
+
+            self._evict_locked()
+
+        if app_cache.shared:
+            app_cache.set(self._shared_key(key), snapshot, "place", ttl=SHARED_ENTRY_TTL)
+
+    @staticmethod
+    def _shared_key(key: Tuple[str, str]) -> str:
+        return f"{key[0]}:{key[1]}"
+
+    def _evict_locked(self):
+        while len(self._places) > self.max_places:
+            self._places.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, place_id: str, language: Optional[str] = None):
+        with self._lock:
+            for key in [k for k in self._places if k[0] == place_id]:
+                del self._places[key]
+        if app_cache.shared:
+            app_cache.delete(self._shared_key((place_id, language or "")), "place")
+
+    def clear(self):
+        with self._lock:
+            self._places.clear()
+
+    def size(self) -> int:
+        return len(self._places)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats["hits"] + self.stats["partial_hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "places": self.size(),
+            "hit_rate": round(self.stats["hits"] / total, 3) if total else 0.0,
+        }
+
+
+# 전역 장소 상세 저장소
+place_store = PlaceDetailsStore()
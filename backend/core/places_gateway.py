@@ -0,0 +1,444 @@
+"""Google Places 공용 게이트웨이
+
+에이전트마다 googlemaps.Client 를 따로 만들던 구조를 하나로 모읍니다.
+
+- 프로세스 전체가 httpx.AsyncClient 하나(HTTP/2, keep-alive 커넥션 풀)를 공유
+- 같은 요청(place_id, geocode 주소 등)이 동시에 들어오면 업스트림 호출은 1번만 (request coalescing)
+- 기존 동기 에이전트 코드를 위해 googlemaps.Client 와 같은 호출 형태의 동기 파사드 제공
+
+업스트림 I/O 는 전부 게이트웨이 전용 이벤트 루프(데몬 스레드)에서 실행되므로
+어느 스레드/루프에서 호출해도 같은 커넥션 풀과 in-flight 테이블을 공유합니다.
+"""
+import os
+import copy
+import asyncio
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlencode
+
+import httpx
+from dotenv import load_dotenv
+
+from core.cache import app_cache
+from core.cancellation import AgentCancelled, is_cancelled, wait_future
+from core.geocode_cache import geocode_cache, normalize_region
+from core.place_store import place_store
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# httpx HTTP 로그 숨기기
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+GOOGLE_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
+BASE_URL = "https://maps.googleapis.com/maps/api"
+
+# 커넥션 풀 / 타임아웃 설정
+MAX_CONNECTIONS = int(os.getenv("PLACES_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("PLACES_MAX_KEEPALIVE", "10"))
+REQUEST_TIMEOUT = float(os.getenv("PLACES_TIMEOUT", "10"))
+MAX_RETRIES = 2
+
+# 업스트림 호출 예산 (프로세스 전체 공유)
+PLACES_QPS = float(os.getenv("PLACES_QPS", "20"))
+MAX_CONCURRENT_REQUESTS = int(os.getenv("PLACES_MAX_CONCURRENT", "10"))
+# 상세 정보 일괄 조회 시 건별 타임아웃 (초과 건은 빼고 부분 결과 반환)
+ENRICH_TIMEOUT = float(os.getenv("PLACES_ENRICH_TIMEOUT", "5"))
+
+# 정상으로 취급하는 Google API status
+_OK_STATUSES = {"OK", "ZERO_RESULTS"}
+
+LatLng = Union[str, tuple, list, dict]
+
+
+class PlacesApiError(Exception):
+    """Google API가 OK / ZERO_RESULTS 이외의 status 를 반환했을 때"""
+
+    def __init__(self, status: str, message: Optional[str] = None):
+        self.status = status
+        self.message = message
+        super().__init__(f"{status}: {message}" if message else status)
+
+
+def _format_latlng(value: LatLng) -> str:
+    """googlemaps 와 동일하게 (lat, lng) 튜플/딕셔너리/문자열을 'lat,lng' 로 변환"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        lat = value.get("lat", value.get("latitude"))
+        lng = value.get("lng", value.get("longitude"))
+        return f"{lat},{lng}"
+    lat, lng = value
+    return f"{lat},{lng}"
+
+
+class _RateLimiter:
+    """토큰 버킷 방식 QPS 제한 (게이트웨이 루프에서만 사용)"""
+
+    def __init__(self, qps: float):
+        self.qps = qps
+        self.tokens = qps
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.qps, self.tokens + (now - self.updated) * self.qps)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.qps)
+
+
+class PlacesGateway:
+    """Google Maps Web Service 비동기 게이트웨이 (싱글톤으로 사용)"""
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        # 요청 키 -> 진행 중인 업스트림 Task
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # 게이트웨이 루프에서 최초 사용 시 생성
+        self._rate_limiter: Optional[_RateLimiter] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.stats = {
+            "requests": 0,
+            "upstream_calls": 0,
+            "coalesced": 0,
+            "errors": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # 이벤트 루프 / 클라이언트 관리
+    # ------------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """게이트웨이 전용 이벤트 루프를 (최초 1회) 데몬 스레드로 띄움"""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="places-gateway", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+        return self._loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """게이트웨이 루프 안에서만 호출 (AsyncClient 는 루프에 묶임)"""
+        if self._client is None:
+            self._rate_limiter = _RateLimiter(PLACES_QPS)
+            self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+            self._client = httpx.AsyncClient(
+                base_url=BASE_URL,
+                http2=True,
+                timeout=REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                ),
+            )
+        return self._client
+
+    async def _run(self, path: str, params: Dict[str, Any], coalesce_key: Optional[str] = None) -> Dict[str, Any]:
+        """호출한 루프가 어디든 게이트웨이 루프에서 요청을 실행"""
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await self._request(path, params, coalesce_key)
+        future = asyncio.run_coroutine_threadsafe(self._request(path, params, coalesce_key), loop)
+        return await asyncio.wrap_future(future)
+
+    def run_sync(self, coro):
+        """동기 코드(워커 스레드)에서 게이트웨이 코루틴 실행
+
+        에이전트가 데드라인 초과로 취소되면 AgentCancelled 를 던져 워커 스레드를 돌려줍니다.
+        """
+        if is_cancelled():
+            coro.close()
+            raise AgentCancelled()
+        loop = self._ensure_loop()
+        return wait_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def prefetch_geocode(self, address: str, language: Optional[str] = "ko"):
+        """결과를 기다리지 않고 지오코딩을 미리 시작
+
+        목적지가 정해지자마자 호출해 두면, 뒤이어 에이전트들이 같은 지역을 지오코딩할 때
+        진행 중인 요청에 병합되거나 geocode_cache 에서 바로 응답합니다.
+        """
+        future = asyncio.run_coroutine_threadsafe(self.geocode(address, language), self._ensure_loop())
+
+        def log_error(f):
+            if not f.cancelled() and f.exception() is not None:
+                logger.warning(f"Speculative geocode failed for {address!r}: {f.exception()}")
+
+        future.add_done_callback(log_error)
+
+    # ------------------------------------------------------------------
+    # 요청 병합 + 업스트림 호출
+    # ------------------------------------------------------------------
+
+    async def _request(self, path: str, params: Dict[str, Any], coalesce_key: Optional[str] = None) -> Dict[str, Any]:
+        """동일 요청이 진행 중이면 그 결과를 함께 기다림 (게이트웨이 루프에서 실행)
+
+        coalesce_key 를 주면 파라미터 대신 그 키로 병합 (예: 정규화된 지오코딩 캐시 키)
+        """
+        params = {k: v for k, v in params.items() if v is not None}
+        key = f"{path}#{coalesce_key}" if coalesce_key else f"{path}?{urlencode(sorted(params.items()))}"
+        self.stats["requests"] += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            # 병합된 호출자는 결과를 수정해도 서로 영향이 없도록 사본을 받음
+            return copy.deepcopy(await asyncio.shield(task))
+
+        task = asyncio.ensure_future(self._fetch(path, params))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: 한 호출자가 취소돼도 같은 요청을 기다리는 다른 호출자는 영향 없음
+        return await asyncio.shield(task)
+
+    async def _fetch(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        client = self._get_client()
+        query = dict(params, key=self.api_key)
+
+        for attempt in range(MAX_RETRIES + 1):
+            self.stats["upstream_calls"] += 1
+            try:
+                async with self._semaphore:
+                    await self._rate_limiter.acquire()
+                    response = await client.get(f"/{path}/json", params=query)
+                if response.status_code >= 500 and attempt < MAX_RETRIES:
+                    await asyncio.sleep(0.5 * (2 ** attempt))
+                    continue
+                response.raise_for_status()
+                body = response.json()
+            except httpx.TransportError as e:
+                if attempt < MAX_RETRIES:
+                    logger.warning(f"⚠️ [Places] {path} 재시도 {attempt + 1}/{MAX_RETRIES}: {e}")
+                    await asyncio.sleep(0.5 * (2 ** attempt))
+                    continue
+                self.stats["errors"] += 1
+                raise
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+
+            status = body.get("status", "OK")
+            if status == "OVER_QUERY_LIMIT" and attempt < MAX_RETRIES:
+                await asyncio.sleep(1.0 * (2 ** attempt))
+                continue
+            if status not in _OK_STATUSES:
+                self.stats["errors"] += 1
+                raise PlacesApiError(status, body.get("error_message"))
+            return body
+
+        self.stats["errors"] += 1
+        raise PlacesApiError("UNKNOWN_ERROR", f"{path} 재시도 초과")
+
+    # ------------------------------------------------------------------
+    # 공개 비동기 API (googlemaps.Client 와 같은 반환 형태)
+    # ------------------------------------------------------------------
+
+    async def geocode(
+        self,
+        address: str,
+        language: Optional[str] = None,
+        region: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """주소 -> 좌표 (결과 리스트 반환, 정규화된 지역명 기준 영구 캐시)
+
+        정규화는 캐시/병합 키에만 적용하고 Google 에는 호출한 주소를 그대로 보냅니다.
+        (도로명 주소, 랜드마크 이름 등이 지역명으로 바뀌지 않도록)
+        """
+        # 메모리 캐시는 바로, SQLite 조회/저장은 게이트웨이 루프를 막지 않도록 워커 스레드에서
+        cached = geocode_cache.get(address, language, region, memory_only=True)
+        if cached is None:
+            cached = await asyncio.to_thread(geocode_cache.get, address, language, region)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        body = await self._run("geocode", {
+            "address": address,
+            "language": language,
+            "region": region,
+        }, coalesce_key=geocode_cache.make_key(address, language, region))
+        results = body.get("results", [])
+        await asyncio.to_thread(geocode_cache.set, address, results, language, region)
+        return results
+
+    async def place(
+        self,
+        place_id: str,
+        fields: Optional[List[str]] = None,
+        language: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """장소 상세 정보 (응답 전체: {'result': ..., 'status': ...})
+
+        필드를 지정한 요청은 place_store 에서 신선한 필드를 먼저 채우고
+        부족한 필드만 업스트림에 요청합니다. (fields=None 은 항상 업스트림)
+        """
+        if not fields:
+            return await self._run("place/details", {
+                "placeid": place_id,
+                "language": language,
+            })
+
+        # 공유 캐시 백엔드(Redis/SQLite)를 쓰면 place_store 조회/저장이 블로킹 I/O 라서 워커 스레드에서 실행
+        if app_cache.shared:
+            cached, missing = await asyncio.to_thread(place_store.lookup, place_id, fields, language)
+        else:
+            cached, missing = place_store.lookup(place_id, fields, language)
+        if not missing:
+            return {"result": copy.deepcopy(cached), "status": "OK"}
+
+        body = await self._run("place/details", {
+            "placeid": place_id,
+            "fields": ",".join(sorted(missing)),
+            "language": language,
+        })
+        fetched = body.get("result", {})
+        if app_cache.shared:
+            await asyncio.to_thread(place_store.update, place_id, missing, fetched, language)
+        else:
+            place_store.update(place_id, missing, fetched, language)
+        return {**body, "result": {**copy.deepcopy(cached), **fetched}}
+
+    async def place_many(
+        self,
+        place_ids: List[str],
+        fields: Optional[List[str]] = None,
+        language: Optional[str] = None,
+        timeout: float = ENRICH_TIMEOUT,
+    ) -> Dict[str, Dict[str, Any]]:
+        """여러 장소 상세 정보를 동시에 조회 (동시성/QPS 는 게이트웨이 예산을 따름)
+
+        건별 타임아웃/오류가 난 장소는 결과에서 빠지므로 호출 측은 부분 결과를 받습니다.
+
+        Returns:
+            {place_id: result}
+        """
+        async def _one(place_id: str):
+            try:
+                body = await asyncio.wait_for(
+                    self.place(place_id, fields=fields, language=language), timeout
+                )
+                return place_id, body.get("result", {})
+            except asyncio.TimeoutError:
+                logger.warning(f"⏱️ [Places] 상세 조회 타임아웃 ({place_id})")
+            except Exception as e:
+                logger.warning(f"⚠️ [Places] 상세 조회 실패 ({place_id}): {e}")
+            return place_id, None
+
+        pairs = await asyncio.gather(*(_one(pid) for pid in dict.fromkeys(place_ids)))
+        return {pid: result for pid, result in pairs if result is not None}
+
+    async def places_nearby(
+        self,
+        location: Optional[LatLng] = None,
+        radius: Optional[int] = None,
+        keyword: Optional[str] = None,
+        language: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        name: Optional[str] = None,
+        open_now: bool = False,
+        rank_by: Optional[str] = None,
+        type: Optional[str] = None,
+        page_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """주변 장소 검색 (googlemaps.Client.places_nearby 와 같은 인자, 응답 전체 반환)"""
+        return await self._run("place/nearbysearch", {
+            "location": _format_latlng(location) if location is not None else None,
+            "radius": radius,
+            "keyword": keyword,
+            "language": language,
+            "minprice": min_price,
+            "maxprice": max_price,
+            "name": name,
+            # googlemaps 와 동일하게 True 일 때만 전송
+            "opennow": "true" if open_now else None,
+            "rankby": rank_by,
+            "type": type,
+            "pagetoken": page_token,
+        })
+
+    async def directions(
+        self,
+        origin: LatLng,
+        destination: LatLng,
+        mode: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """경로 검색 (routes 리스트 반환)"""
+        body = await self._run("directions", {
+            "origin": _format_latlng(origin),
+            "destination": _format_latlng(destination),
+            "mode": mode,
+            "language": language,
+        })
+        return body.get("routes", [])
+
+
+class SyncPlacesClient:
+    """googlemaps.Client 와 같은 메서드 시그니처를 유지하는 동기 파사드
+
+    asyncio.to_thread 등 워커 스레드에서 실행되는 기존 에이전트 코드가
+    `gmaps.geocode(...)` 형태 그대로 게이트웨이를 쓰도록 합니다.
+
+    [과도기] 에이전트 본문이 아직 동기 코드라서, 각 호출은 게이트웨이 루프에서 I/O 가 끝날 때까지
+    호출한 워커 스레드를 붙잡아 둡니다 (에이전트 실행당 스레드 1개, 호출마다 새 스레드는 아님).
+    에이전트를 async 로 옮기면 PlacesGateway 메서드를 직접 await 하고 이 파사드는 제거합니다.
+    """
+
+    def __init__(self, gateway: PlacesGateway):
+        self.gateway = gateway
+
+    def geocode(self, address: str, language: Optional[str] = None, region: Optional[str] = None):
+        return self.gateway.run_sync(self.gateway.geocode(address, language=language, region=region))
+
+    def place(self, place_id: str, fields: Optional[List[str]] = None, language: Optional[str] = None):
+        return self.gateway.run_sync(self.gateway.place(place_id, fields=fields, language=language))
+
+    def place_many(self, place_ids: List[str], fields: Optional[List[str]] = None, language: Optional[str] = None, timeout: float = ENRICH_TIMEOUT):
+        return self.gateway.run_sync(
+            self.gateway.place_many(place_ids, fields=fields, language=language, timeout=timeout)
+        )
+
+    def places_nearby(self, location: Optional[LatLng] = None, radius: Optional[int] = None,
+                      keyword: Optional[str] = None, language: Optional[str] = None,
+                      min_price: Optional[int] = None, max_price: Optional[int] = None,
+                      name: Optional[str] = None, open_now: bool = False, rank_by: Optional[str] = None,
+                      type: Optional[str] = None, page_token: Optional[str] = None):
+        return self.gateway.run_sync(self.gateway.places_nearby(
+            location=location, radius=radius, keyword=keyword, language=language,
+            min_price=min_price, max_price=max_price, name=name, open_now=open_now,
+            rank_by=rank_by, type=type, page_token=page_token,
+        ))
+
+    def directions(self, origin: LatLng, destination: LatLng, mode: Optional[str] = None, language: Optional[str] = None):
+        return self.gateway.run_sync(
+            self.gateway.directions(origin, destination, mode=mode, language=language)
+        )
+
+
+# 전역 게이트웨이 인스턴스 (API 키가 없으면 None)
+places_gateway = PlacesGateway(GOOGLE_API_KEY) if GOOGLE_API_KEY else None
+
+
+def get_sync_client() -> Optional[SyncPlacesClient]:
+    """에이전트용 동기 클라이언트 (API 키가 없으면 None -> 기존 `if not gmaps` 분기 유지)"""
+    if places_gateway is None:
+        return None
+    return SyncPlacesClient(places_gateway)
@@ -4,10 +4,16 @@ Remote Qwen Client
 - uses openai python client library for better compatibility
 """
 import os
+import time
 import logging
 import json
+import threading
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import NotFoundError
+
+from typing import Callable, Optional
+
+from core.llm_clients import get_qwen_client, get_openai_client, resolve_qwen_base_url, complete_text
 
 # 캐릭터 시스템 프롬프트 import
 import sys
@@ -19,53 +25,71 @@ from character_system_prompts import KKACHIL_SYSTEM_PROMPT, SUNDONG_SYSTEM_PROMP
 load_dotenv(override=True)
 logger = logging.getLogger(__name__)
 
-# [Refactor] 전역 변수 제거하고 __init__에서 로드
+DEFAULT_QWEN_MODEL = "Qwen/Qwen2.5-14B-Instruct"
+# 모델 ID 고정 (설정 시 models.list() 조회 안 함)
+QWEN_MODEL_ID = os.getenv("QWEN_MODEL_ID")
+# 조회한 모델 ID 재확인 주기 (초)
+QWEN_MODEL_REFRESH_SECONDS = float(os.getenv("QWEN_MODEL_REFRESH_SECONDS", "600"))
+
 
 class QwenStyleService:
     def __init__(self):
-        # .env 재로드 (확실하게 최신값 반영)
-        load_dotenv(override=True)
-        
-        # URL 로드 (기본값 설정)
-        self.base_url = os.getenv("KAMP_QWEN_URL", "https://yojgf-125-6-60-4.a.free.pinggy.link/v1")
-        
-        # URL 보정: /chat/completions가 붙어있으면 떼어냄
-        if "/chat/completions" in self.base_url:
-            self.base_url = self.base_url.replace("/chat/completions", "")
-        
-        # /v1 로 끝나는지 확인 (OpenAI Client 요구사항)
-        if not self.base_url.endswith("/v1"):
-            self.base_url = self.base_url.rstrip("/") + "/v1"
-            
-        logger.info(f"Qwen Client Initialized (Base: {self.base_url})")
-        
-        self.client = OpenAI(
-            base_url=self.base_url,
-            api_key="not-needed",
-            default_headers={"Bypass-Tunnel-Reminder": "true"},
-            timeout=30.0
-        )
+        # [Optimization] 프로세스 공용 클라이언트 (keep-alive 커넥션 풀 재사용)
+        self.base_url = resolve_qwen_base_url()
+        self.client = get_qwen_client()
+        # [Optimization] 모델 ID 캐시 (매 요청 models.list() 왕복 제거)
+        self._model_id = None
+        self._model_id_fetched_at = 0.0
+        self._model_lock = threading.Lock()
+
+    def _get_model_id(self, force_refresh: bool = False) -> str:
+        """서버의 모델 ID (설정값 > 캐시 > models.list() 조회)"""
+        if QWEN_MODEL_ID:
+            return QWEN_MODEL_ID
+
+        with self._model_lock:
+            expired = time.time() - self._model_id_fetched_at > QWEN_MODEL_REFRESH_SECONDS
+            if self._model_id and not expired and not force_refresh:
+                return self._model_id
+
+            try:
+                models = self.client.models.list()
+                if not models.data:
+                    logger.warning(f"No models found on server, using default '{DEFAULT_QWEN_MODEL}'")
+                    self._model_id = DEFAULT_QWEN_MODEL
+                else:
+                    self._model_id = models.data[0].id
+                logger.info(f"Qwen model id: {self._model_id}")
+            except Exception as e:
+                # 조회 실패 시 이전 값(없으면 기본값) 유지
+                logger.warning(f"Qwen models.list() failed: {e}")
+                self._model_id = self._model_id or DEFAULT_QWEN_MODEL
+            self._model_id_fetched_at = time.time()
+            return self._model_id
+
+    def _create_completion(self, **kwargs):
+        """캐시된 모델 ID로 Chat Completion 요청 (모델 없음 오류면 ID 갱신 후 1회 재시도)"""
+        try:
+            return self.client.chat.completions.create(model=self._get_model_id(), **kwargs)
+        except NotFoundError:
+            logger.warning("Qwen model not found, refreshing model id...")
+            return self.client.chat.completions.create(model=self._get_model_id(force_refresh=True), **kwargs)
 
-    def apply_character_style(self, character: str, core_output: dict, detected_language: str = "ko") -> dict:
+    def apply_character_style(self, character: str, core_output: dict, detected_language: str = "ko",
+                              on_token: Optional[Callable[[str], None]] = None) -> dict:
         """
         원격 Qwen API를 호출하여 캐릭터 말투로 변환
         - OpenAI SDK 사용
         - detected_language: "ko" or "en"
+        - on_token: 지정 시 토큰 스트리밍 (생성되는 토큰마다 호출)
         """
         prompt = self._build_character_prompt(character, core_output, detected_language)
         
         try:
-            # 1. 모델 ID 동적 조회
-            models = self.client.models.list()
-            if not models.data:
-                logger.warning("No models found on server, using default 'Qwen/Qwen2.5-14B-Instruct'")
-                model_id = "Qwen/Qwen2.5-14B-Instruct"
-            else:
-                model_id = models.data[0].id
-
-            # 2. Chat Completion 요청
-            response = self.client.chat.completions.create(
-                model=model_id,
+            # Chat Completion 요청 (모델 ID는 캐시 사용)
+            generated_text = complete_text(
+                self._create_completion,
+                on_token,
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant."},
                     {"role": "user", "content": prompt}
@@ -74,8 +98,6 @@ class QwenStyleService:
                 max_tokens=2000 # [수정] 서버 용량(4096) 확보로 대폭 증가!
             )
             
-            generated_text = response.choices[0].message.content
-            
             return {
                 "character": character,
                 "text": generated_text,
@@ -88,7 +110,8 @@ class QwenStyleService:
             return {
                 "character": character,
                 "text": f"(말투 변환 실패) {json.dumps(core_output, ensure_ascii=False)}",
-                "ui_hints": core_output.get("ui_hints", {})
+                "ui_hints": core_output.get("ui_hints", {}),
+                "failed": True
             }
 
     def _build_character_prompt(self, character: str, core_output: dict, detected_language: str = "ko") -> str:
@@ -265,20 +288,19 @@ You are a {trait_desc} character.
         logger.info(f"🧩 Minified Context for Qwen:\n{json.dumps(minified, ensure_ascii=False, indent=2)}")
         
         return minified
-    def apply_general_chat(self, character: str, user_input: str, detected_language: str = "ko") -> str:
+    def apply_general_chat(self, character: str, user_input: str, detected_language: str = "ko",
+                           on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         일반 대화 모드
         - 영어: GPT-4 직접 사용
         - 한국어: Qwen 캐릭터 모델 사용
+        - on_token: 지정 시 토큰 스트리밍 (생성되는 토큰마다 호출)
         """
         
         logger.info(f"🔍 [DEBUG] detected_language='{detected_language}', type={type(detected_language)}")
         
         if detected_language == "en":
             # 영어는 GPT-4로 직접 응답
-            import openai
-            import os
-            
             character_traits = {
                 "cat": "Kkachil Cat - sharp, straightforward, ends with 'nyaa'",
                 "dog": "Sundong Dog - warm, friendly, ends with 'woof'",
@@ -288,9 +310,11 @@ You are a {trait_desc} character.
             trait = character_traits.get(character, character_traits["otter"])
             
             try:
-                openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+                openai_client = get_openai_client()
                 
-                response = openai_client.chat.completions.create(
+                return complete_text(
+                    openai_client.chat.completions.create,
+                    on_token,
                     model="gpt-4",
                     messages=[
                         {"role": "system", "content": f"You are {trait}. Be helpful and friendly. Use emojis. Keep responses concise and natural."},
@@ -300,8 +324,6 @@ You are a {trait_desc} character.
                     max_tokens=500
                 )
                 
-                return response.choices[0].message.content
-                
             except Exception as e:
                 logger.error(f"GPT-4 Chat Failed: {e}")
                 return "Sorry, I'm having trouble right now, dal... 😿"
@@ -321,25 +343,25 @@ You are a {trait_desc} character.
             ]
         
             try:
-                # 1. 모델 ID 동적 조회
-                models = self.client.models.list()
-                if not models.data:
-                    model_id = "Qwen/Qwen2.5-14B-Instruct"
-                else:
-                    model_id = models.data[0].id
-
-                # 2. Chat Completion 요청
-                response = self.client.chat.completions.create(
-                    model=model_id,
+                # Chat Completion 요청 (모델 ID는 캐시 사용)
+                return complete_text(
+                    self._create_completion,
+                    on_token,
                     messages=messages,
                     temperature=0.7,
                     max_tokens=1000
                 )
                 
-                return response.choices[0].message.content
-                
             except Exception as e:
                 logger.error(f"Qwen Chat Failed: {e}")
                 return "죄송해요, 서버 연결이 원활하지 않아요. 😿"
 
 
+# 공용 인스턴스 (Lazy Init)
+_qwen_service = None
+
+def get_qwen_service() -> QwenStyleService:
+    global _qwen_service
+    if _qwen_service is None:
+        _qwen_service = QwenStyleService()
+    return _qwen_service
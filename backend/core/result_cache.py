@@ -0,0 +1,78 @@
+"""구조화된 2단계 결과 캐시
+
+원문 메시지 기준 캐시는 "강릉 맛집" / "강릉 맛집 추천해줘" 가 서로 빗나가고,
+캐릭터/언어를 키에 넣지 않아 다른 캐릭터의 말투가 섞여 나갈 수 있었습니다.
+의도 분석 결과를 기준으로 두 단계로 나눠 저장합니다.
+
+1단계 (search_results): parallel_search_node 의 에이전트 결과 (Google/가격 데이터, async 노드라서 aget/aset 사용)
+    키 = (search_mode, 정규화 목적지, 시작일, 종료일)
+2단계 (styled_response): 캐릭터 말투로 변환된 최종 메시지
+    키 = (1단계 result_key, character, language)
+
+result_key 에는 1단계 결과를 저장한 시각이 들어가므로, 검색 결과가 새로 바뀌면
+그 이전 데이터로 만든 2단계 응답은 자동으로 쓰이지 않습니다.
+"""
+import os
+import copy
+import json
+import time
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+
+from core.cache import app_cache
+from core.geocode_cache import normalize_region
+from core.intent_cache import normalize_utterance
+
+SEARCH_RESULT_TTL = int(os.getenv("SEARCH_RESULT_TTL", "600"))
+STYLED_RESPONSE_TTL = int(os.getenv("STYLED_RESPONSE_TTL", "600"))
+
+app_cache.namespace_ttls.setdefault("search_results", SEARCH_RESULT_TTL)
+app_cache.namespace_ttls.setdefault("styled_response", STYLED_RESPONSE_TTL)
+
+
+def search_key(state: Dict[str, Any]) -> str:
+    """(search_mode, 목적지, 날짜) -> 해시
+
+    쇼핑 검색은 사용자 문장 자체가 검색 조건이므로 정규화된 발화도 키에 포함합니다.
+    """
+    search_mode = state.get("search_mode") or "travel_plan"
+    parts = [
+        search_mode,
+        normalize_region(state.get("destination") or ""),
+        state.get("start_date") or "",
+        state.get("end_date") or "",
+    ]
+    if "shopping" in search_mode:
+        parts.append(normalize_utterance(state.get("user_input") or ""))
+    raw = json.dumps(parts, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+async def get_search_results(state: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """1단계 조회 -> (result_key, {"partials": {agent: 부분 결과}}) 또는 None"""
+    key = search_key(state)
+    cached = await app_cache.aget(key, "search_results")
+    if cached is None:
+        return None
+    if not app_cache.shared:
+        # 메모리 캐시 값은 이후 노드에서 수정될 수 있으므로 복사본 사용
+        cached = copy.deepcopy(cached)
+    return f"{key}:{cached['stored_at']}", cached
+
+
+async def set_search_results(state: Dict[str, Any], partials: Dict[str, Dict[str, Any]]) -> str:
+    """1단계 저장 (에이전트별 부분 결과) 후 result_key 반환"""
+    key = search_key(state)
+    stored_at = int(time.time() * 1000)
+    if not app_cache.shared:
+        partials = copy.deepcopy(partials)
+    await app_cache.aset(key, {"partials": partials, "stored_at": stored_at}, "search_results")
+    return f"{key}:{stored_at}"
+
+
+def get_styled_response(result_key: str, character: str, language: str) -> Optional[str]:
+    return app_cache.get((result_key, character, language), "styled_response")
+
+
+def set_styled_response(result_key: str, character: str, language: str, message: str):
+    app_cache.set((result_key, character, language), message, "styled_response")
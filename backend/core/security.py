@@ -1,3 +1,10 @@
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
 import bcrypt
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -28,4 +35,99 @@ def get_password_hash(password: str) -> str:
     hashed = bcrypt.hashpw(password_bytes, salt)
     
     # 문자열로 반환
-    return hashed.decode('utf-8')
\ No newline at end of file
+    return hashed.decode('utf-8')
+
+# ============================================================================
+# [Optimization] bcrypt 전용 워커 풀
+# ============================================================================
+# bcrypt 는 의도적으로 100ms+ CPU 를 쓰므로 async 라우터에서 바로 호출하면
+# 그동안 같은 워커의 WebSocket 스트림이 전부 멈춥니다.
+# - bcrypt 는 해싱 중 GIL 을 놓기 때문에 스레드 풀로도 코어 수만큼 병렬 처리 가능
+# - 이벤트 루프용으로 코어 하나는 남겨 둠
+# - 대기 + 실행 중 작업이 PASSWORD_HASH_MAX_PENDING 을 넘으면 즉시 거절 (로그인 폭주가 채팅을 굶기지 않도록)
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 8)))
+
+
+class PasswordHashBusy(Exception):
+    """해싱 대기열이 가득 참 (라우터에서 503 으로 응답)"""
+
+
+class PasswordHasherPool:
+    """크기 제한 스레드 풀 + 입장 제한"""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0   # 대기 + 실행 중
+        self._running = 0
+        self.stats = {"completed": 0, "rejected": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise PasswordHashBusy(f"password hashing queue full ({self._pending}/{self.max_pending})")
+            self._pending += 1
+
+        submitted = time.perf_counter()
+
+        def job():
+            wait_ms = (time.perf_counter() - submitted) * 1000
+            with self._lock:
+                self._running += 1
+                self.stats["wait_ms_total"] += wait_ms
+                self.stats["wait_ms_max"] = max(self.stats["wait_ms_max"], wait_ms)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        def release(_):
+            # 완료 또는 시작 전 취소 시 한 번 호출
+            with self._lock:
+                self._pending -= 1
+                self.stats["completed"] += 1
+
+        future = self._get_executor().submit(job)
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self.stats["completed"]
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "completed": completed,
+                "rejected": self.stats["rejected"],
+                "avg_wait_ms": round(self.stats["wait_ms_total"] / completed, 1) if completed else 0.0,
+                "max_wait_ms": round(self.stats["wait_ms_max"], 1),
+            }
+
+
+# 전역 해싱 풀
+password_hasher = PasswordHasherPool()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password 를 해싱 풀에서 실행 (대기열이 가득 차면 PasswordHashBusy)"""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash 를 해싱 풀에서 실행 (대기열이 가득 차면 PasswordHashBusy)"""
+    return await password_hasher.run(get_password_hash, password)
@@ -0,0 +1,143 @@
+"""Single-flight 요청 병합
+
+인기 질의("부산 맛집")가 1초 안에 여러 번 들어오면 결과 캐시에 아직 아무것도 없어서
+요청마다 의도 분석 LLM, Google 호출 5회 이상, Qwen 호출을 따로 실행합니다.
+같은 키로 진행 중인 작업이 있으면 새로 시작하지 않고 그 결과를 함께 기다립니다.
+
+- do(key, fn): 코루틴 결과 공유 (REST 워크플로 실행, 에이전트별 검색)
+- stream(key, factory): 비동기 이터레이터 공유 (WebSocket astream). 늦게 합류한 구독자도
+  처음 이벤트부터 다시 받습니다. 이벤트 객체는 공유되므로 구독자는 읽기만 해야 합니다.
+- 기다리는 쪽이 모두 취소되면 공유 작업도 취소
+"""
+import copy
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    def __init__(self, task: "asyncio.Future"):
+        self.task = task
+        self.waiters = 0
+
+
+class _Broadcast:
+    """소스 이터레이터 하나를 여러 구독자에게 재생"""
+
+    def __init__(self):
+        self.events: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def _publish(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def pump(self, source: AsyncIterator):
+        try:
+            async for item in source:
+                self.events.append(item)
+                self._publish()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._publish()
+
+    async def subscribe(self) -> AsyncIterator:
+        index = 0
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class SingleFlight:
+    """키별 진행 중 작업 공유"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._streams: Dict[Hashable, _Broadcast] = {}
+        self.stats = {"leaders": 0, "followers": 0}
+
+    @staticmethod
+    def _scoped(key: Hashable) -> Hashable:
+        # 이벤트 루프가 다르면 같은 작업을 기다릴 수 없음
+        return (id(asyncio.get_running_loop()), key)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """같은 key 로 진행 중인 fn() 이 있으면 그 결과를 기다림 (후속 요청은 결과 복사본)"""
+        scoped = self._scoped(key)
+        flight = self._inflight.get(scoped)
+        leader = flight is None
+
+        if leader:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._inflight[scoped] = flight
+            flight.task.add_done_callback(lambda _: self._forget(self._inflight, scoped, flight))
+            self.stats["leaders"] += 1
+        else:
+            self.stats["followers"] += 1
+            logger.info(f"[SingleFlight:{self.name}] joined in-flight {key!r}")
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+        return result if leader else copy.deepcopy(result)
+
+    async def stream(self, key: Hashable, factory: Callable[[], AsyncIterator]) -> AsyncIterator:
+        """같은 key 로 진행 중인 스트림이 있으면 구독 (처음 이벤트부터 재생)"""
+        scoped = self._scoped(key)
+        broadcast = self._streams.get(scoped)
+
+        if broadcast is None:
+            broadcast = _Broadcast()
+            broadcast.task = asyncio.ensure_future(broadcast.pump(factory()))
+            self._streams[scoped] = broadcast
+            broadcast.task.add_done_callback(lambda _: self._forget(self._streams, scoped, broadcast))
+            self.stats["leaders"] += 1
+        else:
+            self.stats["followers"] += 1
+            logger.info(f"[SingleFlight:{self.name}] joined in-flight stream {key!r}")
+
+        broadcast.subscribers += 1
+        try:
+            async for item in broadcast.subscribe():
+                yield item
+        finally:
+            broadcast.subscribers -= 1
+            if broadcast.subscribers == 0 and not broadcast.task.done():
+                broadcast.task.cancel()
+
+    @staticmethod
+    def _forget(table: Dict[Hashable, Any], scoped: Hashable, entry: Any):
+        if table.get(scoped) is entry:
+            del table[scoped]
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            "inflight": len(self._inflight) + len(self._streams),
+        }
+
+
+# 워크플로 전체 실행 (REST / WebSocket)
+workflow_flight = SingleFlight("workflow")
+# parallel_search_node 의 에이전트별 검색
+agent_flight = SingleFlight("agents")
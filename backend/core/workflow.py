@@ -3,6 +3,7 @@ LangGraph Workflow - Phase 5: Advanced Architecture (Shell Integration)
 """
 import os
 import asyncio
+import threading
 from typing import Dict, Any, List
 from dotenv import load_dotenv
 
@@ -10,9 +11,8 @@ from dotenv import load_dotenv
 load_dotenv(override=True)
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from schemas.state import TeamAgentState
-from langchain_openai import ChatOpenAI
 import json
 
 # --- Agents Import (Shells & Real) ---
@@ -43,20 +43,46 @@ from agents.gallery.gallery_tools import photo_gallery_tool
 # Common Group
 from agents.common.review_agent import summarize_reviews
 from agents.common.photo_agent import get_photos
-from core.qwen_client import QwenStyleService
+from core.qwen_client import get_qwen_service
+from core.llm_clients import get_chat_model, get_openai_client, complete_text
+from core.cancellation import agent_cancel_event
+from utils.intent_classifier import classify_intent
+from core.intent_cache import intent_cache
+from core.result_cache import get_search_results, set_search_results, get_styled_response, set_styled_response
+from core.singleflight import agent_flight
+from core.places_gateway import places_gateway
+
+# 임시 사용자 ID (인증 도입 전까지 서버에서 고정, 클라이언트가 보낸 값은 사용하지 않음)
+DEFAULT_USER_ID = "test1"
+
+# --- Deadlines ---
+# 에이전트별 데드라인 (초) - 초과하면 취소하고 빈 섹션으로 응답
+AGENT_DEADLINES = {
+    "weather": 5.0,
+    "gps": 5.0,
+    "restaurants": 12.0,
+    "desserts": 12.0,
+    "accommodations": 15.0,
+    "landmarks": 12.0,
+    "shopping": 10.0,
+    "gallery": 12.0,
+}
+DEFAULT_AGENT_DEADLINE = float(os.getenv("AGENT_DEADLINE", "12"))
+# parallel_search 전체 데드라인 (초)
+SEARCH_FANOUT_DEADLINE = float(os.getenv("SEARCH_FANOUT_DEADLINE", "20"))
 
 # --- Nodes Implementation ---
 
-def load_profile_node(state: TeamAgentState):
+async def load_profile_node(state: TeamAgentState):
     """사용자 프로필 로드 (Persona Agent)"""
     print("👤 [Profile] 사용자 정보 로드 중...")
     
-    # 임시 사용자 ID (추후 웹소켓 메타데이터에서 추출)
-    user_id = state.get("user_id", "test1")
+    # 임시 사용자 ID (추후 인증 토큰에서 추출)
+    user_id = state.get("user_id") or DEFAULT_USER_ID
     
     try:
         # 페르소나 에이전트로 조회
-        result = persona_agent.get(user_id)
+        result = await persona_agent.get(user_id)
         
         if result.get("success") and result.get("data"):
             persona = result["data"][0]
@@ -80,37 +106,52 @@ def load_profile_node(state: TeamAgentState):
         return {"context": {}}
 
 
+def _analyze_intent_with_llm(user_msg: str) -> Dict[str, Any]:
+    """GPT-4o-mini로 의도 및 목적지 추출"""
+    llm = get_chat_model("gpt-4o-mini", temperature=0)
+    
+    prompt = f"""Analyze the user input and extract the following information in JSON format:
+    1. intent_type: 
+       - "travel_plan": ONLY if user wants a full route/schedule/itinerary (e.g. "짜줘", "일정", "코스", "계획")
+       - "restaurant_search": if user just wants food/restaurant recommendations (e.g. "맛집", "식당", "카페")
+       - "accommodation_search": if user just wants hotel/motel recommendations (e.g. "숙소", "호텔", "모텔")
+       - "spot_search": if user just wants tourist spots (e.g. "가볼만한곳", "관광지")
+       - "shopping_search": if user wants to find shops (e.g. "편의점", "마트", "다이소", "쇼핑", "살 곳")
+       - "photo_search": if user wants photos of the region (e.g. "사진 보여줘", "풍경", "이미지")
+       - "chat": general conversation or greeting
+    2. destination: specific region name (e.g., '서울 신림동' if '신림' is mentioned, '제주' if '제주도', default to '강릉' if unclear)
+    3. start_date: 'YYYY-MM-DD' (default to '2025-05-01')
+    4. end_date: 'YYYY-MM-DD' (default to '2025-05-02')
+
+    User Input: "{user_msg}"
+    
+    Respond ONLY with JSON."""
+    
+    response = llm.invoke(prompt)
+    content = response.content.replace("```json", "").replace("```", "").strip()
+    return json.loads(content)
+
 def analyze_intent_node(state: TeamAgentState):
-    """사용자 의도 분석 (LLM 기반)"""
-    print("🧠 [Analyze Intent] 사용자 의도 분석 중... (Powered by LLM)")
+    """사용자 의도 분석 (규칙 기반 Fast Path -> LLM)"""
+    print("🧠 [Analyze Intent] 사용자 의도 분석 중...")
     
     user_msg = state.get("user_input", "") or state.get("messages", [])[-1]["content"]
     detected_language = state.get("detected_language", "ko")
     
     try:
-        # GPT-4o-mini로 의도 및 목적지 추출
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-        
-        prompt = f"""Analyze the user input and extract the following information in JSON format:
-        1. intent_type: 
-           - "travel_plan": ONLY if user wants a full route/schedule/itinerary (e.g. "짜줘", "일정", "코스", "계획")
-           - "restaurant_search": if user just wants food/restaurant recommendations (e.g. "맛집", "식당", "카페")
-           - "accommodation_search": if user just wants hotel/motel recommendations (e.g. "숙소", "호텔", "모텔")
-           - "spot_search": if user just wants tourist spots (e.g. "가볼만한곳", "관광지")
-           - "shopping_search": if user wants to find shops (e.g. "편의점", "마트", "다이소", "쇼핑", "살 곳")
-           - "photo_search": if user wants photos of the region (e.g. "사진 보여줘", "풍경", "이미지")
-           - "chat": general conversation or greeting
-        2. destination: specific region name (e.g., '서울 신림동' if '신림' is mentioned, '제주' if '제주도', default to '강릉' if unclear)
-        3. start_date: 'YYYY-MM-DD' (default to '2025-05-01')
-        4. end_date: 'YYYY-MM-DD' (default to '2025-05-02')
-
-        User Input: "{user_msg}"
-        
-        Respond ONLY with JSON."""
-        
-        response = llm.invoke(prompt)
-        content = response.content.replace("```json", "").replace("```", "").strip()
-        result = json.loads(content)
+        # [Fast Path] 키워드/지역 사전으로 확실한 경우 LLM 생략
+        result = classify_intent(user_msg)
+        if result:
+            print("⚡ [Intent] 규칙 기반 분류 (LLM 생략)")
+        else:
+            # 비슷한 표현으로 이미 분석한 적이 있으면 재사용
+            result = intent_cache.get(user_msg)
+            if result:
+                print("⚡ [Intent] 의도 캐시 HIT (LLM 생략)")
+            else:
+                print("🧠 [Intent] LLM 분석 (Powered by GPT-4o-mini)")
+                result = _analyze_intent_with_llm(user_msg)
+                intent_cache.set(user_msg, result)
         
         intent_type = result.get("intent_type", "chat")
         destination = result.get("destination", "강릉")
@@ -122,6 +163,8 @@ def analyze_intent_node(state: TeamAgentState):
         is_travel = "plan" in intent_type or "search" in intent_type
         
         if is_travel:
+            # [Speculative] 검색 에이전트가 시작되기 전에 목적지 지오코딩을 미리 시작
+            _prefetch_destination(destination)
             parsed_intent = {
                 "type": "new_plan",
                 "destination": destination,
@@ -158,6 +201,19 @@ def analyze_intent_node(state: TeamAgentState):
             }
         return {"intent_type": "chat", "detected_language": detected_language}
 
+def _prefetch_destination(destination: str):
+    """목적지 좌표 선조회 (에이전트의 같은 지오코딩 요청은 게이트웨이에서 병합 / 캐시 적중)"""
+    if not places_gateway or not destination:
+        return
+    try:
+        places_gateway.prefetch_geocode(f"{destination}, 대한민국", language="ko")
+    except Exception as e:
+        print(f"⚠️ [Geocode] 선조회 실패: {e}")
+
+def join_entry_node(state: TeamAgentState):
+    """[Fan-in] load_profile / analyze_intent 가 모두 끝난 뒤 라우팅"""
+    return {}
+
 async def parallel_search_node(state: TeamAgentState):
     """[Parallel] 의도에 따른 에이전트 선별 실행"""
     region = state.get("destination", "강릉")
@@ -166,79 +222,189 @@ async def parallel_search_node(state: TeamAgentState):
 
     print(f"🎯 Search Mode: {search_mode} -> 에이전트 선별 중...")
 
+    writer = _get_stream_writer()
+
+    # 결과 매핑
+    response_data = {
+        "restaurants": [],
+        "accommodations": [],
+        "desserts": [],
+        "landmarks": [],
+        "shopping": [], 
+        "gallery": {}, 
+        "weather_info": {},
+        "gps_data": {},
+        "messages": [{"role": "system", "content": "정보 수집 완료"}]
+    }
+
+    # [Cache] 같은 (search_mode, 목적지, 날짜) 검색 결과 재사용 (표현이 달라도 적중)
+    cached = await get_search_results(state)
+    if cached:
+        result_key, entry = cached
+        print(f"⚡ [Search Cache HIT] {', '.join(entry['partials'])} 재사용")
+        for key, partial in entry["partials"].items():
+            response_data.update(partial)
+            writer({"type": "agent_result", "agent": key, "data": partial})
+        response_data["timed_out_agents"] = []
+        response_data["result_key"] = result_key
+        return response_data
+
     tasks = []
     task_keys = []
     active_agent_names = []
     
     # helper for clean logging
-    def add_task(key, name, coro):
-        tasks.append(coro)
+    # func/args 는 바로 실행하지 않고, 같은 (에이전트, 인자) 검색이 진행 중이면 그 결과를 공유
+    def add_task(key, name, func, *args):
+        tasks.append((func, args))
         task_keys.append(key)
         active_agent_names.append(name)
 
     # 1. Weather & GPS (Strictly Conditional)
     # Only run for full plan or if explicitly weather related (future)
     if "plan" in search_mode: 
-        add_task("weather", "Weather", asyncio.to_thread(get_weather_forecast, region, state.get("start_date"), state.get("end_date")))
-        add_task("gps", "GPS", asyncio.to_thread(get_gps_info, region))
+        add_task("weather", "Weather", get_weather_forecast, region, state.get("start_date"), state.get("end_date"))
+        add_task("gps", "GPS", get_gps_info, region)
 
     # 2. Restaurants (Only if requested or planing)
     if "plan" in search_mode or "restaurant" in search_mode:
-        add_task("restaurants", "Restaurants", asyncio.to_thread(search_restaurants, region))
-        add_task("desserts", "Desserts", asyncio.to_thread(search_cafes, region))
+        add_task("restaurants", "Restaurants", search_restaurants, region)
+        add_task("desserts", "Desserts", search_cafes, region)
         
     # 3. Accommodations (Only if requested or planning)
     if "plan" in search_mode or "accommodation" in search_mode:
-        add_task("accommodations", "Accommodations", asyncio.to_thread(accommodation_agent.search, region))
+        add_task("accommodations", "Accommodations", accommodation_agent.search, region)
         
     # 4. Landmarks (Only if requested or planning)
     if "plan" in search_mode or "spot" in search_mode:
-        add_task("landmarks", "Landmarks", asyncio.to_thread(search_landmarks, region))
+        add_task("landmarks", "Landmarks", search_landmarks, region)
 
     # 5. Shopping (Only if requested)
     # Note: 'plan' usually doesn't need specific shopping unless requested, but let's keep it optional
     if "shopping" in search_mode: 
-        add_task("shopping", "Shopping", asyncio.to_thread(search_shopping_tool.invoke, {"region": region, "user_input": user_input}))
+        add_task("shopping", "Shopping", search_shopping_tool.invoke, {"region": region, "user_input": user_input})
 
     # 6. Photo Gallery (Only if requested)
     if "photo" in search_mode or "gallery" in search_mode:
-         add_task("gallery", "Gallery", asyncio.to_thread(photo_gallery_tool.invoke, {"region": region}))
+         add_task("gallery", "Gallery", photo_gallery_tool.invoke, {"region": region})
 
     print(f"🚀 [Selected Agents] {', '.join(active_agent_names)} ({len(tasks)}개) 실행 시작...")
 
-    results = await asyncio.gather(*tasks)
-    
-    # 결과 매핑
-    response_data = {
-        "restaurants": [],
-        "accommodations": [],
-        "desserts": [],
-        "landmarks": [],
-        "shopping": [], 
-        "gallery": {}, 
-        "weather_info": {},
-        "gps_data": {},
-        "messages": [{"role": "system", "content": "정보 수집 완료"}]
-    }
-    
-    for i, key in enumerate(task_keys):
-        res = results[i]
-        if key == "accommodations":
-            acc_data = res['data'] if isinstance(res, dict) else res.data
-            response_data["accommodations"] = acc_data
-        elif key == "weather":
-            response_data["weather_info"] = res.data[0] if res.data else {}
-        elif key == "gps":
-            response_data["gps_data"] = res.data[0] if res.data else {}
-        elif key == "shopping":
-             response_data["shopping"] = res # Tool returns list directly
-        elif key == "gallery":
-             response_data["gallery"] = res # Tool returns dict
-        else:
-            response_data[key] = res.data
-            
+    timed_out_agents = []
+    partials = {}
+
+    async def run_agent(key, job):
+        func, args = job
+        # [SingleFlight] 동시에 들어온 같은 검색은 한 번만 실행
+        # 데드라인 초과/취소 시 이 요청만 빠지고, 공유 검색은 기다리는 쪽이 모두 떠났을 때만 취소됨
+        flight_key = (key, json.dumps(args, ensure_ascii=False, sort_keys=True, default=str))
+        try:
+            search = agent_flight.do(flight_key, lambda: _run_shared_agent(func, args))
+            return key, await asyncio.wait_for(search, timeout=_agent_deadline(key))
+        except asyncio.TimeoutError:
+            print(f"⏱️ [Deadline] {key} 시간 초과 ({_agent_deadline(key)}s) -> 빈 결과로 대체")
+            timed_out_agents.append(key)
+            return key, None
+        except Exception as e:
+            print(f"⚠️ [Agent] {key} 실패: {e} -> 빈 결과로 대체")
+            return key, None
+
+    # [Streaming] 끝난 에이전트부터 바로 custom 이벤트로 내보냄 (가장 느린 에이전트를 기다리지 않음)
+    pending = {asyncio.ensure_future(run_agent(k, c)): k for k, c in zip(task_keys, tasks)}
+    loop = asyncio.get_running_loop()
+    fanout_deadline = loop.time() + SEARCH_FANOUT_DEADLINE
+
+    while pending:
+        remaining = fanout_deadline - loop.time()
+        done = set()
+        if remaining > 0:
+            done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+        if not done:
+            # 전체 데드라인 초과: 남은 에이전트 취소
+            for task, key in pending.items():
+                task.cancel()
+                timed_out_agents.append(key)
+                writer({"type": "agent_timeout", "agent": key})
+            print(f"⏱️ [Deadline] 전체 검색 시간 초과 ({SEARCH_FANOUT_DEADLINE}s): {', '.join(pending.values())} 취소")
+            break
+
+        for task in done:
+            pending.pop(task)
+            key, res = task.result()
+            if res is None:
+                writer({"type": "agent_timeout" if key in timed_out_agents else "agent_error", "agent": key})
+                continue
+            partial = _map_agent_result(key, res)
+            partials[key] = partial
+            response_data.update(partial)
+            print(f"📦 [Partial] {key} 완료")
+            writer({"type": "agent_result", "agent": key, "data": partial})
+
+    response_data["timed_out_agents"] = timed_out_agents
+    # 일부 에이전트가 빠진 결과는 캐시하지 않음
+    if not timed_out_agents and len(partials) == len(task_keys):
+        response_data["result_key"] = await set_search_results(state, partials)
+    else:
+        response_data["result_key"] = None
     return response_data
 
+async def _run_shared_agent(func, args):
+    """공유 에이전트 검색 (리더 요청과 분리된 자체 취소 범위)
+
+    SingleFlight 가 이 태스크를 취소하는 것은 기다리는 요청이 모두 떠났을 때뿐이므로,
+    그때 워커 스레드에 취소 신호를 보냅니다. (to_thread 가 contextvars 를 복사)
+    """
+    cancel_event = threading.Event()
+    agent_cancel_event.set(cancel_event)
+    try:
+        return await asyncio.to_thread(func, *args)
+    except asyncio.CancelledError:
+        cancel_event.set()
+        raise
+
+def _agent_deadline(key: str) -> float:
+    """에이전트별 데드라인 (환경변수 AGENT_DEADLINE_<KEY> 로 덮어쓰기 가능)"""
+    override = os.getenv(f"AGENT_DEADLINE_{key.upper()}")
+    if override:
+        return float(override)
+    return AGENT_DEADLINES.get(key, DEFAULT_AGENT_DEADLINE)
+
+def _map_agent_result(key: str, res) -> Dict[str, Any]:
+    """에이전트 결과를 State 키로 변환"""
+    if key == "accommodations":
+        return {"accommodations": res['data'] if isinstance(res, dict) else res.data}
+    elif key == "weather":
+        return {"weather_info": res.data[0] if res.data else {}}
+    elif key == "gps":
+        return {"gps_data": res.data[0] if res.data else {}}
+    elif key == "shopping":
+        return {"shopping": res} # Tool returns list directly
+    elif key == "gallery":
+        return {"gallery": res} # Tool returns dict
+    return {key: res.data}
+
+def _get_stream_writer():
+    """LangGraph custom 스트림 writer (스트리밍 실행이 아니면 no-op)"""
+    try:
+        from langgraph.config import get_stream_writer
+        return get_stream_writer()
+    except Exception:
+        return lambda _: None
+
+def _token_writer(character: str):
+    """LLM 토큰을 custom 스트림으로 흘려보내는 on_token 콜백
+
+    최종 메시지와 같은 "[character]: " 접두어를 먼저 보내므로,
+    스트리밍된 텍스트를 이어 붙이면 노드가 반환하는 메시지와 일치합니다.
+    """
+    writer = _get_stream_writer()
+
+    def on_token(delta: str):
+        writer({"type": "token", "content": delta})
+
+    on_token(f"[{character}]: ")
+    return on_token
+
 def create_itinerary_node(state: TeamAgentState):
     """수집된 정보로 일정 생성"""
     print("🗓️ [Itinerary] 일정 생성 중...")
@@ -458,12 +624,20 @@ def qwen_transform_node(state: TeamAgentState):
     detected_language = state.get("detected_language", "ko")
     character = state.get("preferred_character", "cat")
     
+    # [Cache] 같은 검색 결과 + 캐릭터 + 언어면 말투 변환 생략
+    result_key = state.get("result_key")
+    if result_key:
+        cached_message = get_styled_response(result_key, character, detected_language)
+        if cached_message:
+            print("⚡ [Qwen] 스타일 캐시 HIT (LLM 생략)")
+            _get_stream_writer()({"type": "token", "content": cached_message})
+            return {"messages": [{"role": "assistant", "content": cached_message}]}
+    
+    on_token = _token_writer(character)
+    styled_ok = True
+    
     if detected_language == "en":
         # 영어는 GPT-4 사용
-        import openai
-        import os
-        import json
-        
         core_output = {
             "plan": state.get("daily_plans"),
             "weather": state.get("weather_info"),
@@ -479,7 +653,7 @@ def qwen_transform_node(state: TeamAgentState):
         trait = character_traits.get(character, "friendly guide")
         
         try:
-            openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            openai_client = get_openai_client()
             
             prompt = f"""You are {trait}. Here's travel itinerary data. Explain it enthusiastically and naturally in English.
             
@@ -487,7 +661,9 @@ def qwen_transform_node(state: TeamAgentState):
             
             Keep it fun, use emojis, and maintain your character!"""
             
-            response = openai_client.chat.completions.create(
+            result_text = complete_text(
+                openai_client.chat.completions.create,
+                on_token,
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": f"You are {trait}. Be enthusiastic about travel!"},
@@ -497,19 +673,14 @@ def qwen_transform_node(state: TeamAgentState):
                 max_tokens=1000
             )
             
-            result_text = response.choices[0].message.content
-            
         except Exception as e:
             print(f"⚠️ GPT-4 failed: {e}")
             result_text = "Here's your travel plan, dal! Check it out! 🦦"
-        
-        return {
-            "messages": [{"role": "assistant", "content": f"[{character}]: {result_text}"}]
-        }
+            styled_ok = False
     
     else:
         # 한국어는 기존 Qwen 사용
-        qwen = QwenStyleService()
+        qwen = get_qwen_service()
         
         core_output = {
             "plan": state.get("daily_plans"),
@@ -519,24 +690,31 @@ def qwen_transform_node(state: TeamAgentState):
             "gallery": state.get("gallery")    # [New]
         }
         
-        result = qwen.apply_character_style(character, core_output, detected_language)
-        
-        return {
-            "messages": [{"role": "assistant", "content": f"[{character}]: {result['text']}"}]
-        }
+        result = qwen.apply_character_style(character, core_output, detected_language, on_token=on_token)
+        result_text = result["text"]
+        styled_ok = not result.get("failed")
+    
+    message = f"[{character}]: {result_text}"
+    if result_key and styled_ok:
+        set_styled_response(result_key, character, detected_language, message)
+    
+    return {
+        "messages": [{"role": "assistant", "content": message}]
+    }
 
 def general_chat_node(state: TeamAgentState):
     """일상 대화 처리"""
     print("💬 [General Chat] 캐릭터 대화 생성 중...")
     
-    qwen = QwenStyleService()
+    qwen = get_qwen_service()
     character = state.get("preferred_character", "cat")
     user_input = state.get("user_input", "") or state.get("messages", [])[-1]["content"]
     
     # 감지된 언어에 맞춰 응답
     detected_language = state.get("detected_language", "ko")
     
-    response_text = qwen.apply_general_chat(character, user_input, detected_language)
+    response_text = qwen.apply_general_chat(character, user_input, detected_language,
+                                            on_token=_token_writer(character))
     
     return {
         "messages": [{"role": "assistant", "content": f"[{character}]: {response_text}"}]
@@ -562,14 +740,18 @@ def create_travel_graph():
     workflow.add_node("augment_itinerary", augment_itinerary_node)
     workflow.add_node("qwen_transform", qwen_transform_node)
     workflow.add_node("general_chat_node", general_chat_node)
+    workflow.add_node("join_entry", join_entry_node)
     
     # Edges
-    workflow.set_entry_point("load_profile") # [Changed]
-    workflow.add_edge("load_profile", "analyze_intent") # [New Edge]
+    # [Fan-out] 프로필 DB 조회와 의도 분석(LLM)은 서로 의존하지 않으므로 동시에 실행
+    workflow.add_edge(START, "load_profile")
+    workflow.add_edge(START, "analyze_intent")
+    # [Fan-in] 두 노드가 모두 끝나면 라우팅
+    workflow.add_edge(["load_profile", "analyze_intent"], "join_entry")
     
     # Conditional Edge
     workflow.add_conditional_edges(
-        "analyze_intent",
+        "join_entry",
         route_intent,
         {
             "parallel_search": "parallel_search",
@@ -66,6 +66,34 @@ def read_root():
 def health_check():
     return {"status": "ok", "version": "1.1"}
 
+# 캐시/외부 API 지표 (hit/miss 등)
+@app.get("/api/v1/metrics")
+def metrics():
+    from core.places_gateway import places_gateway
+    from core.geocode_cache import geocode_cache
+    from core.place_store import place_store
+    from utils.intent_classifier import stats as intent_stats
+    from core.intent_cache import intent_cache
+    from core.llm_clients import get_pool_stats
+    from services.tts_cache import tts_audio_cache
+    from core.cache import app_cache
+    from core.singleflight import workflow_flight, agent_flight
+    from core.security import password_hasher
+    from services.mail_queue import mail_queue
+    return {
+        "places_gateway": places_gateway.stats if places_gateway else {},
+        "geocode_cache": geocode_cache.stats,
+        "place_store": place_store.get_stats(),
+        "intent_classifier": intent_stats.to_dict(),
+        "intent_cache": intent_cache.get_stats(),
+        "llm_connections": get_pool_stats(),
+        "tts_cache": tts_audio_cache.get_stats(),
+        "app_cache": app_cache.get_stats(),
+        "singleflight": {"workflow": workflow_flight.get_stats(), "agents": agent_flight.get_stats()},
+        "password_hasher": password_hasher.get_stats(),
+        "mail_queue": mail_queue.get_stats(),
+    }
+
 # 라우터 등록
 app.include_router(auth.router)
 app.include_router(langgraph.router)  # LangGraph ReAct Agent 라우터 등록
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from core.database import get_db  # DB 세션 의존성 (구현 필요)
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_async_db  # 비동기 DB 세션 의존성 (이벤트 루프 블로킹 방지)
 from models import User
 from schemas.user import UserCreate, UserLogin, UserResponse
-from core.security import get_password_hash, verify_password
+from core.security import get_password_hash_async, verify_password_async, PasswordHashBusy
+from core.persona_cache import invalidate_persona
+from services.mail_queue import mail_queue
 from pydantic import BaseModel, EmailStr
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import random
 import string
 from datetime import datetime, timedelta
@@ -27,6 +27,15 @@ SECRET_KEY = "localy_secret_key_very_secure"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 # 24시간 유지
 
+# 해싱 풀이 가득 찼을 때 응답 (채팅 트래픽 보호)
+def password_busy_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="요청이 많아 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": "1"},
+    )
+
+
 # 토큰 생성 함수
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -49,13 +58,13 @@ class EmailVerificationCheck(BaseModel):
 
 # 이메일 인증번호 발송 API
 @router.post("/send-verification")
-async def send_verification_code(request: EmailVerificationRequest, db: Session = Depends(get_db)):
+async def send_verification_code(request: EmailVerificationRequest, db: AsyncSession = Depends(get_async_db)):
     """
     이메일로 6자리 인증번호를 발송합니다.
     Gmail SMTP를 사용합니다.
     """
     # 이메일 중복 체크
-    existing_user = db.query(User).filter(User.user_email == request.email).first()
+    existing_user = await db.scalar(select(User).where(User.user_email == request.email))
     if existing_user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 사용 중인 이메일입니다.")
     
@@ -69,54 +78,31 @@ async def send_verification_code(request: EmailVerificationRequest, db: Session
         'expiry': expiry_time
     }
     
-    # Gmail SMTP 설정 (환경변수로 관리 권장)
-    # TODO: 실제 Gmail 계정 정보로 교체하세요
-    smtp_server = "smtp.gmail.com"
-    smtp_port = 587
-    sender_email = "kongdu300@gmail.com"  # 발신자 이메일
-    sender_password = "axaq viqu objl kpxl"   # Gmail 앱 비밀번호
-    
-    try:
-        # 이메일 메시지 생성
-        message = MIMEMultipart("alternative")
-        message["Subject"] = "야옹이 여행 - 이메일 인증번호"
-        message["From"] = sender_email
-        message["To"] = request.email
-        
-        # HTML 이메일 본문
-        html = f"""
-        <html>
-          <body style="font-family: Arial, sans-serif; padding: 20px;">
-            <div style="max-width: 600px; margin: 0 auto; background-color: #f9f9f9; padding: 30px; border-radius: 10px;">
-              <h2 style="color: #2D8B5F;">🐱 야옹이 여행 이메일 인증</h2>
-              <p>회원가입을 위한 인증번호입니다.</p>
-              <div style="background-color: white; padding: 20px; border-radius: 5px; text-align: center; margin: 20px 0;">
-                <h1 style="color: #2D8B5F; letter-spacing: 5px;">{verification_code}</h1>
-              </div>
-              <p style="color: #666; font-size: 14px;">이 인증번호는 5분간 유효합니다.</p>
-              <p style="color: #999; font-size: 12px;">본인이 요청하지 않았다면 이 이메일을 무시하세요.</p>
-            </div>
-          </body>
-        </html>
-        """
-        
-        part = MIMEText(html, "html")
-        message.attach(part)
-        
-        # SMTP 서버 연결 및 이메일 발송
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(sender_email, sender_password)
-            server.sendmail(sender_email, request.email, message.as_string())
-        
-        return {"message": "인증번호가 이메일로 전송되었습니다."}
-    
-    except Exception as e:
+    # [Optimization] 메일은 백그라운드 큐로 발송 (SMTP 접속/로그인 동안 이벤트 루프가 멈추지 않도록)
+    # 설정은 services/mail_queue.py 의 SMTP_* 환경변수
+    html = f"""
+    <html>
+      <body style="font-family: Arial, sans-serif; padding: 20px;">
+        <div style="max-width: 600px; margin: 0 auto; background-color: #f9f9f9; padding: 30px; border-radius: 10px;">
+          <h2 style="color: #2D8B5F;">🐱 야옹이 여행 이메일 인증</h2>
+          <p>회원가입을 위한 인증번호입니다.</p>
+          <div style="background-color: white; padding: 20px; border-radius: 5px; text-align: center; margin: 20px 0;">
+            <h1 style="color: #2D8B5F; letter-spacing: 5px;">{verification_code}</h1>
+          </div>
+          <p style="color: #666; font-size: 14px;">이 인증번호는 5분간 유효합니다.</p>
+          <p style="color: #999; font-size: 12px;">본인이 요청하지 않았다면 이 이메일을 무시하세요.</p>
+        </div>
+      </body>
+    </html>
+    """
+
+    def on_failed(to: str, error: Exception):
         # 실제 이메일 발송 실패시 콘솔에 인증번호 출력 (개발용)
         print(f"[개발용] 이메일 발송 실패. 인증번호: {verification_code}")
-        print(f"에러: {str(e)}")
-        # 개발 환경에서는 인증번호를 반환 (프로덕션에서는 제거)
-        return {"message": "인증번호가 이메일로 전송되었습니다.", "dev_code": verification_code}
+        print(f"에러: {str(error)}")
+
+    mail_queue.enqueue(request.email, "야옹이 여행 - 이메일 인증번호", html, on_failed=on_failed)
+    return {"message": "인증번호가 이메일로 전송되었습니다."}
 
 # 이메일 인증번호 확인 API
 @router.post("/verify-email")
@@ -146,9 +132,9 @@ async def verify_email_code(request: EmailVerificationCheck):
 
 # 0. 아이디 중복 확인 API
 @router.get("/check-username/{user_id}")
-async def check_username(user_id: str, db: Session = Depends(get_db)):
+async def check_username(user_id: str, db: AsyncSession = Depends(get_async_db)):
     # 1. User 테이블 확인 (현재 회원 + 소프트 삭제된 회원)
-    db_user = db.query(User).filter(User.user_id == user_id).first()
+    db_user = await db.scalar(select(User).where(User.user_id == user_id))
     
     if db_user:
         # 1-1. 소프트 삭제된 회원인지 체크 ('Y'면 차단)
@@ -160,7 +146,7 @@ async def check_username(user_id: str, db: Session = Depends(get_db)):
     # 2. [추가] WithdrawnUser 테이블 확인 (혹시 예전 방식으르 삭제된 기록이 있다면 차단)
     # models.py에 WithdrawnUser가 정의되어 있어야 합니다.
     try:
-        withdrawn_user = db.query(WithdrawnUser).filter(WithdrawnUser.user_id == user_id).first()
+        withdrawn_user = await db.scalar(select(WithdrawnUser).where(WithdrawnUser.user_id == user_id))
         if withdrawn_user:
              return {"available": False, "message": "탈퇴한 회원의 아이디는 다시 사용할 수 없습니다."}
     except:
@@ -170,8 +156,8 @@ async def check_username(user_id: str, db: Session = Depends(get_db)):
     return {"available": True, "message": "사용 가능한 아이디입니다."}
 # 닉네임 중복 확인 API
 @router.get("/check-nickname/{nickname}")
-async def check_nickname(nickname: str, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.user_nickname == nickname).first()
+async def check_nickname(nickname: str, db: AsyncSession = Depends(get_async_db)):
+    db_user = await db.scalar(select(User).where(User.user_nickname == nickname))
     if db_user:
         return {"available": False, "message": "이미 사용 중인 닉네임입니다."}
     return {"available": True, "message": "사용 가능한 닉네임입니다."}
@@ -181,16 +167,19 @@ async def check_nickname(nickname: str, db: Session = Depends(get_db)):
 # [핵심 수정] 회원가입 (탈퇴 아이디 차단)
 # ---------------------------------------------------
 @router.post("/signup", response_model=UserResponse)
-async def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # 1. ID 중복 및 탈퇴 여부 체크
-    db_user = db.query(User).filter(User.user_id == user.user_id).first()
+    db_user = await db.scalar(select(User).where(User.user_id == user.user_id))
     if db_user:
         if db_user.user_delete_check == 'Y':
             raise HTTPException(status_code=400, detail="탈퇴한 아이디로는 재가입할 수 없습니다.")
         raise HTTPException(status_code=400, detail="이미 존재하는 아이디입니다.")
     
     # 이메일 중복 체크 등 나머지 로직
-    hashed_password = get_password_hash(user.user_pw)
+    try:
+        hashed_password = await get_password_hash_async(user.user_pw)
+    except PasswordHashBusy:
+        raise password_busy_error()
     
     print(f"\n=== 회원가입 ===")
     print(f"아이디: {user.user_id}")
@@ -213,19 +202,19 @@ async def signup(user: UserCreate, db: Session = Depends(get_db)):
         user_delete_date=None
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 # 2. 로그인 API (디버그 로깅 추가)
 @router.post("/login")
-async def login(user_req: UserLogin, db: Session = Depends(get_db)):
+async def login(user_req: UserLogin, db: AsyncSession = Depends(get_async_db)):
     print(f"\n=== 로그인 시도 ===")
     print(f"입력된 아이디: {user_req.user_id}")
     print(f"입력된 비밀번호: {user_req.user_pw}")
     
     # 1. ID로 유저 찾기
-    user = db.query(User).filter(User.user_id == user_req.user_id).first()
+    user = await db.scalar(select(User).where(User.user_id == user_req.user_id))
     
     if not user:
         print(f"❌ 해당 아이디로 등록된 사용자를 찾을 수 없습니다: {user_req.user_id}")
@@ -238,7 +227,10 @@ async def login(user_req: UserLogin, db: Session = Depends(get_db)):
     print(f"저장된 해시: {user.user_pw[:60]}...")
     
     # 2. 비밀번호 검증
-    password_valid = verify_password(user_req.user_pw, user.user_pw)
+    try:
+        password_valid = await verify_password_async(user_req.user_pw, user.user_pw)
+    except PasswordHashBusy:
+        raise password_busy_error()
     print(f"비밀번호 검증 결과: {password_valid}")
     
     if not password_valid:
@@ -282,22 +274,24 @@ class PasswordChangeRequest(BaseModel):
     new_password: str
 
 @router.put("/change-password")
-async def change_password(request: PasswordChangeRequest, db: Session = Depends(get_db)):
+async def change_password(request: PasswordChangeRequest, db: AsyncSession = Depends(get_async_db)):
     """
     로그인한 사용자의 비밀번호를 변경합니다.
     """
-    user = db.query(User).filter(User.user_id == request.user_id).first()
+    user = await db.scalar(select(User).where(User.user_id == request.user_id))
     
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
 
-    if not verify_password(request.current_password, user.user_pw):
-        raise HTTPException(status_code=400, detail="현재 비밀번호가 일치하지 않습니다.")
-
-    user.user_pw = get_password_hash(request.new_password)
+    try:
+        if not await verify_password_async(request.current_password, user.user_pw):
+            raise HTTPException(status_code=400, detail="현재 비밀번호가 일치하지 않습니다.")
+        user.user_pw = await get_password_hash_async(request.new_password)
+    except PasswordHashBusy:
+        raise password_busy_error()
     
     db.add(user)
-    db.commit()
+    await db.commit()
     
     return {"message": "비밀번호가 성공적으로 변경되었습니다."}
 
@@ -306,21 +300,22 @@ async def change_password(request: PasswordChangeRequest, db: Session = Depends(
 # [핵심 수정] 회원 탈퇴 (소프트 삭제 적용)
 # ---------------------------------------------------
 @router.delete("/withdraw/{user_id}")
-async def withdraw_user(user_id: str, db: Session = Depends(get_db)):
+async def withdraw_user(user_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     회원 탈퇴: DB에서 사용자 정보를 영구 삭제합니다.
     """
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = await db.scalar(select(User).where(User.user_id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
     
     # [NEW] DB팀 요청사항: DELETE 대신 UPDATE
     user.user_delete_check = 'Y'
     user.user_delete_date = datetime.now()
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
     
-    db.commit() # 데이터는 남기고 상태만 변경
+    await db.commit() # 데이터는 남기고 상태만 변경
+    await invalidate_persona(user_id)
     
     return {"message": "회원 탈퇴가 완료되었습니다."}
 #
@@ -339,12 +334,12 @@ class UserUpdateRequest(BaseModel):
     non_preferred_region: str | None = None
 
 @router.post("/update-profile")
-async def update_profile(request: UserUpdateRequest, db: Session = Depends(get_db)):
+async def update_profile(request: UserUpdateRequest, db: AsyncSession = Depends(get_async_db)):
     """
     사용자 정보(개인정보 + 페르소나)를 수정합니다.
     """
     # 1. 유저 기본 정보 업데이트
-    user = db.query(User).filter(User.user_id == request.user_id).first()
+    user = await db.scalar(select(User).where(User.user_id == request.user_id))
     
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
@@ -371,7 +366,7 @@ async def update_profile(request: UserUpdateRequest, db: Session = Depends(get_d
     if has_persona_update:
         # 2. 페르소나 레코드 조회 (없으면 생성)
         from models import Persona
-        persona = db.query(Persona).filter(Persona.user_seq_no == user.user_seq_no).first()
+        persona = await db.scalar(select(Persona).where(Persona.user_seq_no == user.user_seq_no))
         
         if not persona:
             # 신규 생성
@@ -414,7 +409,9 @@ async def update_profile(request: UserUpdateRequest, db: Session = Depends(get_d
             if getattr(request, 'persona_accommodation_type', None):
                 persona.persona_accommodation_type = request.persona_accommodation_type
         
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    # 페르소나 캐시 무효화 (다음 턴에 새 선호도 반영)
+    await invalidate_persona(user.user_id)
     
     return {"message": "정보가 성공적으로 수정되었습니다."}
\ No newline at end of file
@@ -42,8 +42,8 @@ async def langgraph_chat(request: ChatRequest):
     Returns:
         ChatResponse (response, intent, data)
     """
-from core.cache import langgraph_cache
-from core.workflow import create_travel_graph
+from core.workflow import create_travel_graph, DEFAULT_USER_ID
+from core.singleflight import workflow_flight
 import logging
 
 # Initialize Logger
@@ -71,15 +71,7 @@ async def langgraph_chat(request: ChatRequest):
         print(f"📝 메시지: {request.message}")
         print("=" * 80)
         
-        # 캐시 확인
-        cached_result = langgraph_cache.get(request.message)
-        if cached_result:
-            print(f"⚡ [캐시 HIT] 저장된 응답 반환")
-            print("=" * 80 + "\n")
-            return ChatResponse(**cached_result)
-        
-        print(f"❌ [캐시 MISS] LangGraph 실행 시작...")
-        
+        # 캐시는 워크플로 내부에서 처리 (core/result_cache.py: 검색 결과 / 캐릭터별 말투 변환)
         # [New] Get Cached Workflow
         app_workflow = get_workflow()
         
@@ -87,12 +79,16 @@ async def langgraph_chat(request: ChatRequest):
         initial_state = {
             "user_input": request.message,
             "messages": [{"role": "user", "content": request.message}],
-            "user_id": "test-user", # Placeholder
+            "user_id": DEFAULT_USER_ID, # Placeholder (인증 도입 전까지 고정)
+            "preferred_character": request.preferred_character,
             "detected_language": "ko"
         }
         
         # Use Cached Workflow Instance
-        result = await app_workflow.ainvoke(initial_state)
+        # [SingleFlight] 같은 사용자/메시지/캐릭터 요청이 실행 중이면 그 결과를 함께 사용
+        # (상태에 사용자 페르소나가 들어가므로 user_id 가 다르면 공유하지 않음)
+        flight_key = (initial_state["user_id"], request.message.strip().lower(), request.preferred_character, "ko")
+        result = await workflow_flight.do(flight_key, lambda: app_workflow.ainvoke(initial_state))
         
         print(f"\n✅ [LangGraph 완료]")
         
@@ -109,7 +105,8 @@ async def langgraph_chat(request: ChatRequest):
             "data": {
                 "daily_plans": daily_plans,
                 "budget": result.get("budget_info"),
-                "weather": result.get("weather_info")
+                "weather": result.get("weather_info"),
+                "timed_out_agents": result.get("timed_out_agents") or []
             }
         }
         
@@ -117,9 +114,6 @@ async def langgraph_chat(request: ChatRequest):
         print(f"💬 응답: {last_message[:100]}...")
         print("=" * 80 + "\n")
         
-        # 캐시에 저장
-        langgraph_cache.set(request.message, response_data, intent)
-        
         return ChatResponse(**response_data)
         
     except Exception as e:
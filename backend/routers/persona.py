@@ -13,7 +13,7 @@ router = APIRouter(
 async def create_persona_endpoint(user_id: str, persona_data: UserPersona):
     """페르소나 생성"""
     try:
-        result = persona_agent.create(user_id, persona_data)
+        result = await persona_agent.create(user_id, persona_data)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -22,7 +22,7 @@ async def create_persona_endpoint(user_id: str, persona_data: UserPersona):
 async def get_persona_endpoint(user_id: str):
     """페르소나 조회"""
     try:
-        result = persona_agent.get(user_id)
+        result = await persona_agent.get(user_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -31,7 +31,7 @@ async def get_persona_endpoint(user_id: str):
 async def update_persona_endpoint(user_id: str, persona_data: UserPersona):
     """페르소나 수정"""
     try:
-        result = persona_agent.update(user_id, persona_data)
+        result = await persona_agent.update(user_id, persona_data)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -40,7 +40,7 @@ async def update_persona_endpoint(user_id: str, persona_data: UserPersona):
 async def delete_persona_endpoint(user_id: str):
     """페르소나 삭제"""
     try:
-        result = persona_agent.delete(user_id)
+        result = await persona_agent.delete(user_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
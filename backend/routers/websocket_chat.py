@@ -2,14 +2,19 @@
 WebSocket 실시간 챗 엔드포인트
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
 from typing import Optional
+import base64
+import hashlib
 import json
 import traceback
 
-from core.workflow import create_travel_graph
+from core.workflow import create_travel_graph, DEFAULT_USER_ID
+from core.singleflight import workflow_flight
 from schemas.state import TeamAgentState
 from utils.language_detector import detect_primary_language
-from services.tts_streaming import generate_tts_for_new_sentence, clear_tts_cache
+from services.tts_streaming import SentenceSegmenter, TTSPipeline
+from services.audio_frames import encode_audio_frame
 
 router = APIRouter(
     prefix="/api/ws",
@@ -38,15 +43,43 @@ class WSMessageType:
     JSON_DATA = "json_data" # [New] 구조화된 데이터(이미지, 일정 등) 전송용
 
 
+# 사용자에게 보여줄 최종 답변을 만드는 노드 (토큰 스트리밍 노드와 같음)
+REPLY_NODES = ("qwen_transform", "general_chat_node")
+
+
 @router.websocket("/chat")
 async def websocket_chat(websocket: WebSocket):
     """
     실시간 챗봇 WebSocket 엔드포인트 (Persistent Connection)
+    
+    Query Params:
+        audio: "json" (기본, base64 audio_chunk 메시지) | "binary" (바이너리 프레임, services/audio_frames.py)
+        codec: "wav" (기본) | "opus" (ffmpeg 가 있으면 OGG/Opus 로 변환)
     """
     await websocket.accept()
     
+    binary_audio = websocket.query_params.get("audio") == "binary"
+    audio_codec = "opus" if websocket.query_params.get("codec") == "opus" else "wav"
+    
     # 세션 내 대화 히스토리 유지
     chat_history = []
+    audio_sequence = 0
+    
+    async def send_audio(audio: bytes, audio_format: str):
+        nonlocal audio_sequence
+        if binary_audio:
+            await websocket.send_bytes(encode_audio_frame(audio_sequence, audio, audio_format))
+        else:
+            # Legacy: base64-in-JSON (기존 클라이언트 호환, WAV 는 format 필드 생략)
+            frame = {"type": WSMessageType.AUDIO_CHUNK, "content": base64.b64encode(audio).decode("utf-8"),
+                     "seq": audio_sequence}
+            if audio_format != "wav":
+                frame["format"] = audio_format
+            await websocket.send_json(frame)
+        audio_sequence += 1
+    
+    # [Pipeline] 문장 단위 TTS: 텍스트 스트리밍과 겹쳐서 병렬 합성, 전송은 문장 순서대로
+    tts_pipeline = TTSPipeline(send_audio, audio_format=audio_codec)
     
     try:
         print(f"\n🌐 WebSocket Connected")
@@ -56,6 +89,8 @@ async def websocket_chat(websocket: WebSocket):
             data = await websocket.receive_json()
             user_message = data.get("message", "")
             character = data.get("character", "cat")
+            # 인증 도입 전까지 서버에서 고정 (페이로드의 user_id 는 신뢰하지 않음)
+            user_id = DEFAULT_USER_ID
             
             if not user_message:
                 continue
@@ -76,13 +111,11 @@ async def websocket_chat(websocket: WebSocket):
                 "use_tts": use_tts
             })
             
-            # TTS 캐시 초기화 (새로운 턴 시작 시)
-            clear_tts_cache()
-            
             # LangGraph 초기 상태 (히스토리 포함)
             initial_state: TeamAgentState = {
                 "user_input": user_message,
                 "messages": chat_history, # 누적된 히스토리 전달
+                "user_id": user_id,
                 "next_agent": None,
                 "budget": None,
                 "routes": [],
@@ -108,23 +141,89 @@ async def websocket_chat(websocket: WebSocket):
             
             # 누적 텍스트 추적 (이번 턴의 답변)
             accumulated_text = ""
-            sent_sentences = set()
+            # 새로 들어온 텍스트만 검사하는 증분 문장 분리기
+            segmenter = SentenceSegmenter()
+            # 이번 턴에 TTS 로 넘긴 문장 (replace 후 같은 문장을 다시 합성하지 않도록)
+            spoken = []
+            replay_index = None
+            
+            def submit_sentence(sentence: str):
+                nonlocal replay_index
+                if replay_index is not None:
+                    # 교체된 텍스트의 앞부분이 이미 읽은 문장과 같으면 건너뜀
+                    if replay_index < len(spoken) and spoken[replay_index] == sentence:
+                        replay_index += 1
+                        return
+                    replay_index = None
+                spoken.append(sentence)
+                tts_pipeline.submit(sentence)
+            
+            async def push_text(new_chunk: str, replace: bool = False):
+                """텍스트 청크 전송 + (영어) 완성된 문장 TTS"""
+                nonlocal segmenter, replay_index
+                frame = {"type": WSMessageType.TEXT_CHUNK, "content": new_chunk}
+                if replace:
+                    # 스트리밍 도중 실패해 최종 메시지가 달라진 경우: 전체 교체
+                    frame["replace"] = True
+                    segmenter = SentenceSegmenter()
+                    replay_index = 0
+                await websocket.send_json(frame)
+                
+                # 완성된 문장은 TTS 파이프라인에 넘기고 바로 다음 텍스트로 (오디오를 기다리지 않음)
+                if use_tts:
+                    for sentence in segmenter.feed(new_chunk):
+                        submit_sentence(sentence)
             
             print(f"🚀 Starting LangGraph astream...")
             
             event_count = 0
             app_workflow = get_workflow()
             
-            # LangGraph 실행
-            async for event in app_workflow.astream(initial_state):
+            # LangGraph 실행 (updates: 노드 단위 출력 / custom: 에이전트별 부분 결과, LLM 토큰)
+            # [SingleFlight] 다른 연결에서 같은 사용자가 같은 질문을 실행 중이면 그 스트림을 처음부터 함께 받음
+            # (상태에 사용자 페르소나와 이 연결의 대화 히스토리가 들어가므로 둘 중 하나라도 다르면 공유하지 않음)
+            history_digest = hashlib.sha1(
+                json.dumps(chat_history[:-1], ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()
+            flight_key = (user_id, history_digest, user_message.strip().lower(), character, detected_lang)
+            workflow_stream = workflow_flight.stream(
+                flight_key,
+                lambda: app_workflow.astream(initial_state, stream_mode=["updates", "custom"])
+            )
+            async for mode, event in workflow_stream:
                 event_count += 1
+                
+                # [Streaming] 에이전트 하나가 끝날 때마다 카드 데이터 먼저 전송
+                if mode == "custom":
+                    if isinstance(event, dict) and event.get("type") == "token":
+                        # [Streaming] LLM 토큰 단위 텍스트
+                        accumulated_text += event["content"]
+                        await push_text(event["content"])
+                    elif isinstance(event, dict) and event.get("type") == "agent_result":
+                        await websocket.send_json({
+                            "type": WSMessageType.JSON_DATA,
+                            "content": jsonable_encoder(event["data"]),
+                            "agent": event["agent"],
+                            "partial": True
+                        })
+                    elif isinstance(event, dict) and event.get("type") in ("agent_timeout", "agent_error"):
+                        # 늦거나 실패한 에이전트는 빈 섹션으로 표시
+                        await websocket.send_json({
+                            "type": WSMessageType.JSON_DATA,
+                            "content": {},
+                            "agent": event["agent"],
+                            "partial": True,
+                            "degraded": True
+                        })
+                    continue
+                
                 node_name = list(event.keys())[0] if event else "unknown"
                 
                 # 각 노드의 출력에서 메시지 추출
                 node_output = event.get(node_name, {})
                 
                 # [New] 구조화된 데이터 전송 logic (그대로 유지)
-                data_keys = ["gallery", "shopping", "daily_plans", "weather_info", "budget_info"]
+                data_keys = ["gallery", "shopping", "daily_plans", "weather_info", "budget_info", "timed_out_agents"]
                 found_data = {}
                 if isinstance(node_output, dict):
                     for key in data_keys:
@@ -140,52 +239,29 @@ async def websocket_chat(websocket: WebSocket):
                     })
 
                 # 메시지 스트리밍 Logic
-                if isinstance(node_output, dict) and "messages" in node_output:
-                    messages = node_output["messages"]
+                # 답변 노드의 assistant 메시지만 전송 (다른 노드의 "정보 수집 완료" 같은 진행 메시지는 답변이 아님)
+                if node_name in REPLY_NODES and isinstance(node_output, dict) and node_output.get("messages"):
+                    last_msg = node_output["messages"][-1]
+                    if isinstance(last_msg, dict):
+                        last_message = last_msg.get("content", "") if last_msg.get("role") == "assistant" else ""
+                    else:
+                        last_message = str(last_msg)
                     
-                    if messages:
-                        last_msg = messages[-1]
-                        last_message = last_msg.get("content", "") if isinstance(last_msg, dict) else str(last_msg)
-                        
-                        # 히스토리가 누적되므로, 이번 턴의 새로운 내용만 발라내야 함
-                        # 간단하게: 현재 accumulated_text보다 길면 그 차이만큼 전송
-                        # 주의: LangGraph가 전체 히스토리를 반환한다면 로직 수정 필요. 
-                        # 보통 messages는 append 되므로 마지막 메시지만 확인하면 됨.
-                        
-                        # [Fix for persistent]: LangGraph might return full history or just delta depending on config.
-                        # Assuming 'messages' in output contains valid latest content.
-                        
-                        # If accumulated_text is empty, we assume this is the start of the assistant response.
-                        # We need to be careful if 'messages' contains previous turns.
-                        # With 'messages' key in output, usually it's the output of the node.
-                        
-                        if last_message and len(last_message) > len(accumulated_text):
-                            new_chunk = last_message[len(accumulated_text):]
-                            accumulated_text = last_message
-                            
-                            await websocket.send_json({
-                                "type": WSMessageType.TEXT_CHUNK,
-                                "content": new_chunk
-                            })
-                            
-                            # TTS Logic (Same as before)
-                            if use_tts:
-                                from services.tts_streaming import split_into_sentences
-                                import asyncio
-                                from services.tts_client import tts_client
-                                
-                                completed_sentences = split_into_sentences(accumulated_text)
-                                for sentence in completed_sentences:
-                                    if not sentence.rstrip().endswith(('.', '!', '?', '。', '！', '？')): continue
-                                    if sentence in sent_sentences: continue
-                                    sent_sentences.add(sentence)
-                                    try:
-                                        audio_base64 = await asyncio.to_thread(tts_client.synthesize_base64, sentence.strip())
-                                        if audio_base64:
-                                            await websocket.send_json({"type": WSMessageType.AUDIO_CHUNK, "content": audio_base64})
-                                    except: pass
+                    # 토큰 스트리밍으로 이미 보낸 부분은 제외하고 나머지만 전송
+                    if last_message and not last_message.startswith(accumulated_text):
+                        accumulated_text = last_message
+                        await push_text(last_message, replace=True)
+                    elif last_message and len(last_message) > len(accumulated_text):
+                        new_chunk = last_message[len(accumulated_text):]
+                        accumulated_text = last_message
+                        await push_text(new_chunk)
             
             # 턴 종료 후 히스토리에 봇 응답 추가
+            # 종결 기호 없이 끝난 마지막 문장
+            last_sentence = segmenter.flush()
+            if use_tts and last_sentence:
+                submit_sentence(last_sentence)
+            
             chat_history.append({"role": "assistant", "content": accumulated_text})
             
             print(f"🏁 Turn finished. Response: {accumulated_text[:50]}...")
@@ -205,3 +281,6 @@ async def websocket_chat(websocket: WebSocket):
         try:
             await websocket.send_json({"type": WSMessageType.ERROR, "content": str(e)})
         except: pass
+    
+    finally:
+        await tts_pipeline.close()
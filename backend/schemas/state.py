@@ -11,6 +11,7 @@ class TeamAgentState(TypedDict):
     # 사용자 입력
     user_input: str
     messages: List[Dict[str, str]]  # 대화 기록 (OpenAI format)
+    user_id: Optional[str]  # 페르소나 조회용 사용자 ID
     
     # 워크플로우 제어
     next_agent: Optional[str]  # Supervisor가 결정
@@ -49,3 +50,5 @@ class TeamAgentState(TypedDict):
     shopping: Optional[Any] # [New] Minwoo
     gallery: Optional[Any] # [New] Minwoo
     budget_info: Optional[Any] # For augmented data
+    timed_out_agents: Optional[List[str]]  # 데드라인 초과로 빈 결과가 된 에이전트
+    result_key: Optional[str]  # 검색 결과 캐시 키 (core/result_cache.py, 말투 변환 캐시에 사용)
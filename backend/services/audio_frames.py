@@ -0,0 +1,69 @@
+"""
+WebSocket 바이너리 오디오 프레임
+- base64-in-JSON 대신 8바이트 헤더 + 원본 오디오 바이트 (33% 작고 인코딩/디코딩 없음)
+- 선택적으로 ffmpeg 로 Opus/OGG 변환 (ffmpeg 가 없으면 WAV 그대로)
+
+프레임 구조 (big-endian):
+    0      1        2        4            8
+    +------+--------+--------+------------+----------------
+    | ver  | format | flags  | sequence   | audio bytes...
+    | u8   | u8     | u16    | u32        |
+    +------+--------+--------+------------+----------------
+"""
+import asyncio
+import shutil
+import struct
+from typing import Optional, Tuple
+
+FRAME_VERSION = 1
+HEADER = struct.Struct(">BBHI")
+
+# format 코드
+FORMAT_WAV = 1
+FORMAT_OGG_OPUS = 2
+FORMAT_CODES = {"wav": FORMAT_WAV, "opus": FORMAT_OGG_OPUS}
+
+OPUS_BITRATE = "32k"
+
+_FFMPEG = shutil.which("ffmpeg")
+
+
+def opus_available() -> bool:
+    return _FFMPEG is not None
+
+
+def encode_audio_frame(sequence: int, audio: bytes, audio_format: str = "wav") -> bytes:
+    """헤더 + 오디오 바이트"""
+    return HEADER.pack(FRAME_VERSION, FORMAT_CODES[audio_format], 0, sequence & 0xFFFFFFFF) + audio
+
+
+def decode_audio_frame(frame: bytes) -> Tuple[int, int, bytes]:
+    """(sequence, format 코드, 오디오 바이트) - 테스트/디버깅용"""
+    version, fmt, _flags, sequence = HEADER.unpack_from(frame)
+    if version != FRAME_VERSION:
+        raise ValueError(f"unsupported audio frame version: {version}")
+    return sequence, fmt, frame[HEADER.size:]
+
+
+async def transcode_to_opus(wav: bytes) -> Optional[bytes]:
+    """WAV -> OGG/Opus (ffmpeg 없거나 실패하면 None)"""
+    if _FFMPEG is None:
+        return None
+
+    process = await asyncio.create_subprocess_exec(
+        _FFMPEG, "-loglevel", "error", "-f", "wav", "-i", "pipe:0",
+        "-c:a", "libopus", "-b:a", OPUS_BITRATE, "-f", "ogg", "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await process.communicate(wav)
+    except asyncio.CancelledError:
+        process.kill()
+        raise
+
+    if process.returncode != 0 or not stdout:
+        print(f"⚠️ Opus transcode failed: {stderr.decode(errors='ignore')[:200]}")
+        return None
+    return stdout
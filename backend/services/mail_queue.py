@@ -0,0 +1,279 @@
+"""
+메일 발송 큐 (백그라운드 워커 + SMTP 커넥션 재사용)
+
+인증번호 메일을 async 라우터 안에서 바로 보내면 접속 + STARTTLS + 로그인 + 전송 동안
+이벤트 루프가 수 초씩 멈춥니다. 라우터는 큐에 넣고 바로 응답하고, 전송은 워커 스레드가 맡습니다.
+
+- 인증된 SMTP 연결을 유지하며 재사용 (SMTP_IDLE_TIMEOUT 동안 메일이 없으면 종료)
+- 큐에 쌓인 메일은 한 연결에서 최대 MAIL_BATCH_SIZE 개씩 연속 전송
+- 일시 오류(연결 끊김, 4xx)는 지수 백오프로 재시도, 영구 오류(5xx, 수신자 거부)는 바로 실패 처리
+
+로컬 테스트 (SMTP 디버깅 서버, 받은 메일을 콘솔에 출력):
+    python -m aiosmtpd -n -l localhost:1025
+    SMTP_HOST=localhost SMTP_PORT=1025 SMTP_STARTTLS=0 SMTP_AUTH=0 python -m services.mail_queue you@example.com
+"""
+import os
+import ssl
+import time
+import heapq
+import queue
+import random
+import smtplib
+import logging
+import itertools
+import threading
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from email.utils import formatdate, make_msgid
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+# 계정 정보는 환경변수로만 설정 (SMTP_AUTH=1 인데 비어 있으면 발송 비활성화)
+SMTP_AUTH = os.getenv("SMTP_AUTH", "1") == "1"
+SMTP_USER = os.getenv("SMTP_USER")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")  # Gmail 은 앱 비밀번호
+SMTP_SENDER = os.getenv("SMTP_SENDER") or SMTP_USER or "noreply@localhost"
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") == "1"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "15"))
+SMTP_IDLE_TIMEOUT = float(os.getenv("SMTP_IDLE_TIMEOUT", "60"))
+# 이 시간 이상 쉬었던 연결은 보내기 전에 NOOP 으로 살아있는지 확인
+SMTP_NOOP_AFTER = 10.0
+
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "20"))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "5"))
+MAIL_RETRY_BASE_DELAY = float(os.getenv("MAIL_RETRY_BASE_DELAY", "2"))
+MAIL_RETRY_MAX_DELAY = float(os.getenv("MAIL_RETRY_MAX_DELAY", "60"))
+
+
+class MailQueue:
+    """SMTP 발송 큐 (워커 스레드 1개)"""
+
+    def __init__(self, host: str = SMTP_HOST, port: int = SMTP_PORT, user: Optional[str] = SMTP_USER,
+                 password: Optional[str] = SMTP_PASSWORD, sender: str = SMTP_SENDER,
+                 use_starttls: bool = SMTP_STARTTLS, use_auth: bool = SMTP_AUTH):
+        self.host = host
+        self.port = port
+        self.user = user if use_auth else None
+        self.password = password if use_auth else None
+        # 인증이 필요한데 계정 정보가 없으면 발송하지 않음 (코드에 기본 계정을 두지 않음)
+        self.enabled = not use_auth or bool(user and password)
+        if not self.enabled:
+            logger.error("Mail sending disabled: SMTP_USER / SMTP_PASSWORD not set (set SMTP_AUTH=0 for servers without login)")
+        self.sender = sender
+        self.use_starttls = use_starttls
+        self.batch_size = MAIL_BATCH_SIZE
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        # 재시도 대기: (재시도 시각, 순번, 메일) - 워커 스레드만 사용
+        self._retry_heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0
+        self.stats = {"enqueued": 0, "sent": 0, "failed": 0, "retries": 0, "connections": 0, "batches": 0}
+
+    # ------------------------------------------------------------------
+    # 라우터용 API
+    # ------------------------------------------------------------------
+
+    def enqueue(self, to: str, subject: str, html: str,
+                on_failed: Optional[Callable[[str, Exception], None]] = None):
+        """메일을 큐에 넣고 바로 반환 (on_failed: 최종 실패 시 워커 스레드에서 호출)"""
+        if not self.enabled:
+            error = RuntimeError("mail sending disabled (SMTP credentials not configured)")
+            logger.warning(f"Mail to {to} not sent: {error}")
+            with self._lock:
+                self.stats["failed"] += 1
+            if on_failed is not None:
+                on_failed(to, error)
+            return
+
+        message = MIMEMultipart("alternative")
+        message["Subject"] = subject
+        message["From"] = self.sender
+        message["To"] = to
+        message["Date"] = formatdate(localtime=True)
+        message["Message-ID"] = make_msgid()
+        message.attach(MIMEText(html, "html"))
+
+        mail = {"to": to, "message": message.as_string(), "attempts": 0, "on_failed": on_failed}
+        with self._lock:
+            self._outstanding += 1
+            self.stats["enqueued"] += 1
+        self._ensure_worker()
+        self._queue.put(mail)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """큐가 빌 때까지 대기 (테스트/종료용, 재시도 대기 중인 메일 포함)"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._outstanding == 0, timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "outstanding": self._outstanding,
+                "connected": self._smtp is not None,
+                "enabled": self.enabled,
+            }
+
+    # ------------------------------------------------------------------
+    # 워커
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mail-queue", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                batch = self._next_batch()
+                if batch:
+                    self._send_batch(batch)
+                elif self._smtp is not None and time.monotonic() - self._last_used >= SMTP_IDLE_TIMEOUT:
+                    self._disconnect()
+            except Exception as e:
+                # 워커가 죽으면 이후 메일이 전부 멈추므로 로그만 남기고 계속
+                logger.error(f"Mail worker error: {e}")
+                time.sleep(1)
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        batch = []
+        while self._retry_heap and self._retry_heap[0][0] <= now and len(batch) < self.batch_size:
+            batch.append(heapq.heappop(self._retry_heap)[2])
+
+        if not batch:
+            # 연결이 있으면 유휴 종료 시각까지, 재시도 대기가 있으면 그 시각까지만 대기
+            timeout = SMTP_IDLE_TIMEOUT if self._smtp is not None else None
+            if self._retry_heap:
+                until_retry = max(0.0, self._retry_heap[0][0] - now)
+                timeout = until_retry if timeout is None else min(timeout, until_retry)
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                return []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _send_batch(self, batch: List[Dict[str, Any]]):
+        with self._lock:
+            self.stats["batches"] += 1
+        for mail in batch:
+            mail["attempts"] += 1
+            try:
+                smtp = self._connection()
+                smtp.sendmail(self.sender, [mail["to"]], mail["message"])
+                self._last_used = time.monotonic()
+                self._finish(mail)
+            except smtplib.SMTPRecipientsRefused as e:
+                self._finish(mail, e)
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code >= 500:
+                    # 영구 오류 (인증 실패, 주소 거부 등)
+                    self._disconnect()
+                    self._finish(mail, e)
+                else:
+                    self._retry(mail, e)
+            except (smtplib.SMTPException, OSError) as e:
+                # 연결 끊김 / 타임아웃 -> 새 연결로 재시도
+                self._disconnect()
+                self._retry(mail, e)
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is not None and time.monotonic() - self._last_used >= SMTP_NOOP_AFTER:
+            try:
+                if self._smtp.noop()[0] != 250:
+                    self._disconnect()
+            except (smtplib.SMTPException, OSError):
+                self._disconnect()
+
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT)
+            try:
+                smtp.ehlo()
+                if self.use_starttls:
+                    smtp.starttls(context=ssl.create_default_context())
+                    smtp.ehlo()
+                if self.user:
+                    smtp.login(self.user, self.password)
+            except Exception:
+                smtp.close()
+                raise
+            self._smtp = smtp
+            self._last_used = time.monotonic()
+            with self._lock:
+                self.stats["connections"] += 1
+            logger.info(f"SMTP connected: {self.host}:{self.port}")
+        return self._smtp
+
+    def _disconnect(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    def _retry(self, mail: Dict[str, Any], error: Exception):
+        if mail["attempts"] >= MAIL_MAX_ATTEMPTS:
+            self._finish(mail, error)
+            return
+        delay = min(MAIL_RETRY_MAX_DELAY, MAIL_RETRY_BASE_DELAY * (2 ** (mail["attempts"] - 1)))
+        delay *= random.uniform(0.8, 1.2)
+        logger.warning(f"Mail to {mail['to']} failed ({error}), retry {mail['attempts']}/{MAIL_MAX_ATTEMPTS - 1} in {delay:.1f}s")
+        heapq.heappush(self._retry_heap, (time.monotonic() + delay, next(self._seq), mail))
+        with self._lock:
+            self.stats["retries"] += 1
+
+    def _finish(self, mail: Dict[str, Any], error: Optional[Exception] = None):
+        if error is not None:
+            logger.error(f"Mail to {mail['to']} failed after {mail['attempts']} attempt(s): {error}")
+            if mail["on_failed"] is not None:
+                try:
+                    mail["on_failed"](mail["to"], error)
+                except Exception as e:
+                    logger.warning(f"Mail failure callback error: {e}")
+        with self._idle:
+            self.stats["failed" if error is not None else "sent"] += 1
+            self._outstanding -= 1
+            if self._outstanding == 0:
+                self._idle.notify_all()
+
+
+# 전역 메일 큐
+mail_queue = MailQueue()
+
+
+if __name__ == "__main__":
+    import sys
+
+    # 테스트: python -m services.mail_queue [수신자] [개수]
+    to = sys.argv[1] if len(sys.argv) > 1 else "test@example.com"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    print(f"📧 Mail queue test: {count} mails -> {to} via {SMTP_HOST}:{SMTP_PORT}")
+
+    start = time.perf_counter()
+    for i in range(count):
+        mail_queue.enqueue(to, f"Mail queue test {i + 1}", f"<p>test mail {i + 1}</p>")
+    print(f"enqueue: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    drained = mail_queue.wait_idle(timeout=120)
+    print(f"{'✅' if drained else '❌'} {(time.perf_counter() - start):.2f}s / {mail_queue.get_stats()}")
@@ -0,0 +1,78 @@
+"""
+로컬 TTS 대역 서버 (VibeVoice API 호환)
+- POST /synthesize {"text", "cfg_scale", "voice"?} -> audio/wav (청크 스트리밍)
+- GET  /health
+- 실제 모델 대신 텍스트 길이에 비례하는 사인파 WAV 생성, 지연 시간은 환경변수로 조절
+
+실행:
+    python -m services.mock_tts_server            # http://127.0.0.1:8100
+    VIBEVOICE_TTS_URL=http://127.0.0.1:8100 python -m services.tts_client --load 200 20
+"""
+import os
+import io
+import math
+import wave
+import struct
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import Optional
+
+MOCK_TTS_PORT = int(os.getenv("MOCK_TTS_PORT", "8100"))
+# 요청당 고정 지연 (모델 prefill 흉내, 초)
+MOCK_TTS_LATENCY = float(os.getenv("MOCK_TTS_LATENCY", "0.3"))
+# 글자당 추가 지연 (초)
+MOCK_TTS_PER_CHAR = float(os.getenv("MOCK_TTS_PER_CHAR", "0.005"))
+
+SAMPLE_RATE = 24000
+CHUNK_SIZE = 16 * 1024
+
+app = FastAPI(title="Mock VibeVoice TTS")
+
+
+class SynthesizeRequest(BaseModel):
+    text: str
+    cfg_scale: float = 1.5
+    voice: Optional[str] = None
+
+
+def _sine_wav(text: str) -> bytes:
+    """글자당 60ms 길이의 440Hz 사인파 WAV"""
+    n_samples = int(SAMPLE_RATE * max(len(text), 1) * 0.06)
+    frames = b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * i / SAMPLE_RATE)))
+        for i in range(n_samples)
+    )
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(frames)
+    return buf.getvalue()
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.post("/synthesize")
+async def synthesize(request: SynthesizeRequest):
+    await asyncio.sleep(MOCK_TTS_LATENCY + MOCK_TTS_PER_CHAR * len(request.text))
+    audio = await asyncio.to_thread(_sine_wav, request.text)
+
+    async def body():
+        for i in range(0, len(audio), CHUNK_SIZE):
+            yield audio[i:i + CHUNK_SIZE]
+            await asyncio.sleep(0)
+
+    return StreamingResponse(body(), media_type="audio/wav")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="127.0.0.1", port=MOCK_TTS_PORT)
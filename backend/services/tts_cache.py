@@ -0,0 +1,161 @@
+"""TTS 오디오 영구 캐시 (디스크, 용량 제한 LRU)
+
+캐릭터 말버릇, 인사말처럼 반복되는 문장을 매번 VibeVoice 서버에서 다시 합성하지 않도록
+(text, cfg_scale, voice) 조합의 해시를 파일명으로 WAV 원본 바이트를 저장합니다.
+
+- 턴/세션/서버 재시작과 무관하게 공유 (동시 세션, 같은 디렉터리를 쓰는 uvicorn 워커끼리도 공유)
+- base64 문자열이 아닌 원본 바이트 저장 (33% 작음)
+- 총 용량 초과 시 가장 오래 안 쓴 파일부터 삭제
+- hit / miss / eviction 지표
+"""
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "./tts_cache")
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))  # 200MB
+
+_SUFFIX = ".wav"
+
+
+def cache_key(text: str, cfg_scale: float, voice: Optional[str] = None) -> str:
+    """(text, cfg_scale, voice) -> sha256 hex"""
+    raw = f"{text.strip()}\x00{float(cfg_scale):.3f}\x00{voice or ''}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TTSAudioCache:
+    """내용 주소 기반 TTS 오디오 캐시"""
+
+    def __init__(self, cache_dir: str = TTS_CACHE_DIR, max_bytes: int = TTS_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # key -> 파일 크기 (앞쪽이 가장 오래 안 쓴 항목)
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _SUFFIX)
+
+    def _ensure_loaded(self):
+        """기존 캐시 파일로 인덱스 구성 (접근 시각 순)"""
+        if self._loaded:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(_SUFFIX):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, name[:-len(_SUFFIX)], st.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+        self._loaded = True
+        logger.info(f"TTS cache loaded: {len(self._index)} entries, {self._total_bytes} bytes")
+
+    def get(self, text: str, cfg_scale: float, voice: Optional[str] = None) -> Optional[bytes]:
+        key = cache_key(text, cfg_scale, voice)
+        path = self._path(key)
+        with self._lock:
+            self._ensure_loaded()
+            if key not in self._index:
+                # 다른 워커 프로세스가 저장한 파일이면 인덱스에 편입
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    self.stats["misses"] += 1
+                    return None
+                self._index[key] = size
+                self._total_bytes += size
+            self._index.move_to_end(key)
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # 재시작 후에도 LRU 순서 유지
+        except OSError:
+            # 외부에서 지워진 파일
+            with self._lock:
+                size = self._index.pop(key, None)
+                if size is not None:
+                    self._total_bytes -= size
+                self.stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self.stats["hits"] += 1
+        return data
+
+    def set(self, text: str, cfg_scale: float, audio: bytes, voice: Optional[str] = None):
+        if not audio or len(audio) > self.max_bytes:
+            return
+        key = cache_key(text, cfg_scale, voice)
+        with self._lock:
+            self._ensure_loaded()
+            if key in self._index:
+                self._index.move_to_end(key)
+                return
+
+        # 임시 파일에 쓴 뒤 rename (동시 요청이 반쯤 쓰인 파일을 읽지 않도록)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"TTS cache write failed: {e}")
+            return
+
+        with self._lock:
+            if key not in self._index:
+                self._index[key] = len(audio)
+                self._total_bytes += len(audio)
+            self._evict_locked()
+
+    def _evict_locked(self):
+        while self._total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            self.stats["evictions"] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            self._ensure_loaded()
+            for key in list(self._index):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._index.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._index),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(self.stats["hits"] / total, 3) if total else 0.0,
+        }
+
+
+# 전역 TTS 오디오 캐시 인스턴스
+tts_audio_cache = TTSAudioCache()
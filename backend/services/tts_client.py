@@ -1,21 +1,37 @@
 """
 VibeVoice TTS 클라이언트
+- VibeVoiceTTSClient: 동기 클라이언트 (REST 라우터 등)
+- AsyncVibeVoiceTTSClient: asyncio 클라이언트 (WebSocket 파이프라인용, 커넥션 풀 + 스트리밍 다운로드)
 """
+import asyncio
 import requests
 import os
 from typing import Optional
 import base64
 
+import httpx
+
+from services.tts_cache import tts_audio_cache
+
 VIBEVOICE_TTS_URL = os.getenv("VIBEVOICE_TTS_URL", "https://lvnhh-125-6-60-5.a.free.pinggy.link")
 
+# 비동기 클라이언트 커넥션 풀 설정
+TTS_MAX_CONNECTIONS = int(os.getenv("TTS_MAX_CONNECTIONS", "10"))
+TTS_MAX_KEEPALIVE = int(os.getenv("TTS_MAX_KEEPALIVE", "5"))
+TTS_TIMEOUT = float(os.getenv("TTS_TIMEOUT", "45"))
+TTS_CHUNK_SIZE = 64 * 1024
+
 
 class VibeVoiceTTSClient:
     """VibeVoice TTS 클라이언트"""
     
     def __init__(self, base_url: str = VIBEVOICE_TTS_URL):
         self.base_url = base_url.rstrip("/")
+        # keep-alive 세션 재사용 (요청마다 TLS 핸드셰이크 방지)
+        self.session = requests.Session()
     
-    def synthesize(self, text: str, cfg_scale: float = 1.5, timeout: int = 45) -> Optional[bytes]:
+    def synthesize(self, text: str, cfg_scale: float = 1.5, timeout: int = 45,
+                   voice: Optional[str] = None) -> Optional[bytes]:
         """
         텍스트를 음성으로 변환 (바이너리)
         
@@ -23,18 +39,29 @@ class VibeVoiceTTSClient:
             text: 변환할 텍스트
             cfg_scale: CFG scale 값 (1.0-2.0, 기본값 1.5)
             timeout: 타임아웃 (초, 기본값 45)
+            voice: 화자 (None 이면 서버 기본값)
             
         Returns:
             WAV 파일 바이트 or None
         """
+        # [Optimization] 영구 오디오 캐시 먼저 확인
+        cached = tts_audio_cache.get(text, cfg_scale, voice)
+        if cached is not None:
+            return cached
+        
+        payload = {"text": text, "cfg_scale": cfg_scale}
+        if voice:
+            payload["voice"] = voice
+        
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/synthesize",
-                json={"text": text, "cfg_scale": cfg_scale},
+                json=payload,
                 timeout=timeout
             )
             
             if response.status_code == 200:
+                tts_audio_cache.set(text, cfg_scale, response.content, voice)
                 return response.content
             else:
                 print(f"⚠️ TTS failed: {response.status_code} - {response.text}")
@@ -44,18 +71,19 @@ class VibeVoiceTTSClient:
             print(f"⚠️ TTS error: {e}")
             return None
     
-    def synthesize_base64(self, text: str, cfg_scale: float = 1.5) -> Optional[str]:
+    def synthesize_base64(self, text: str, cfg_scale: float = 1.5, voice: Optional[str] = None) -> Optional[str]:
         """
         텍스트를 음성으로 변환 (Base64)
         
         Args:
             text: 변환할 텍스트
             cfg_scale: CFG scale
+            voice: 화자 (None 이면 서버 기본값)
             
         Returns:
             Base64 인코딩된 WAV 오디오 or None
         """
-        audio_bytes = self.synthesize(text, cfg_scale)
+        audio_bytes = self.synthesize(text, cfg_scale, voice=voice)
         
         if audio_bytes:
             return base64.b64encode(audio_bytes).decode('utf-8')
@@ -64,17 +92,136 @@ class VibeVoiceTTSClient:
     def health_check(self) -> bool:
         """헬스 체크"""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            response = self.session.get(f"{self.base_url}/health", timeout=5)
             return response.status_code == 200
         except:
             return False
 
 
+class AsyncVibeVoiceTTSClient:
+    """
+    asyncio 네이티브 VibeVoice TTS 클라이언트
+
+    - httpx.AsyncClient 커넥션 풀 공유 (스레드 점유 없음)
+    - WAV 본문을 청크 단위로 스트리밍 수신
+    - 호출 태스크가 취소되면 (WebSocket 연결 종료 등) 다운로드도 즉시 중단되고 커넥션 반환
+    """
+
+    def __init__(self, base_url: str = VIBEVOICE_TTS_URL, timeout: float = TTS_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=TTS_MAX_CONNECTIONS,
+                    max_keepalive_connections=TTS_MAX_KEEPALIVE,
+                ),
+            )
+        return self._client
+
+    async def synthesize(self, text: str, cfg_scale: float = 1.5, voice: Optional[str] = None) -> Optional[bytes]:
+        """
+        텍스트를 음성으로 변환 (바이너리)
+
+        Returns:
+            WAV 파일 바이트 or None
+        """
+        cached = await asyncio.to_thread(tts_audio_cache.get, text, cfg_scale, voice)
+        if cached is not None:
+            return cached
+
+        payload = {"text": text, "cfg_scale": cfg_scale}
+        if voice:
+            payload["voice"] = voice
+
+        try:
+            async with self._get_client().stream("POST", "/synthesize", json=payload) as response:
+                if response.status_code != 200:
+                    body = await response.aread()
+                    print(f"⚠️ TTS failed: {response.status_code} - {body[:200]!r}")
+                    return None
+
+                chunks = []
+                async for chunk in response.aiter_bytes(TTS_CHUNK_SIZE):
+                    chunks.append(chunk)
+                audio = b"".join(chunks)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ TTS error: {e}")
+            return None
+
+        await asyncio.to_thread(tts_audio_cache.set, text, cfg_scale, audio, voice)
+        return audio
+
+    async def synthesize_base64(self, text: str, cfg_scale: float = 1.5, voice: Optional[str] = None) -> Optional[str]:
+        """텍스트를 음성으로 변환 (Base64)"""
+        audio_bytes = await self.synthesize(text, cfg_scale, voice)
+        if audio_bytes:
+            return base64.b64encode(audio_bytes).decode('utf-8')
+        return None
+
+    async def health_check(self) -> bool:
+        try:
+            response = await self._get_client().get("/health", timeout=5)
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
 # Singleton instance
 tts_client = VibeVoiceTTSClient()
+async_tts_client = AsyncVibeVoiceTTSClient()
+
+
+async def _load_test(total: int, concurrency: int):
+    """비동기 클라이언트 부하 테스트 (services/mock_tts_server.py 대상 권장)"""
+    import time
+
+    client = AsyncVibeVoiceTTSClient()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            # 캐시에 걸리지 않도록 문장마다 다른 텍스트
+            audio = await client.synthesize(f"Load test sentence number {i} at {time.time()}.")
+            latencies.append(time.perf_counter() - start)
+            return audio is not None
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+
+    latencies.sort()
+    print(f"📊 {sum(results)}/{total} ok, {elapsed:.2f}s total, {total / elapsed:.1f} req/s")
+    print(f"   p50={latencies[len(latencies) // 2] * 1000:.0f}ms p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f}ms")
 
 
 if __name__ == "__main__":
+    import sys
+
+    # 부하 테스트: python -m services.tts_client --load [요청 수] [동시성]
+    if len(sys.argv) > 1 and sys.argv[1] == "--load":
+        total = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+        concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+        print(f"🎤 Async TTS load test: {total} requests x {concurrency} concurrent -> {VIBEVOICE_TTS_URL}")
+        asyncio.run(_load_test(total, concurrency))
+        sys.exit(0)
+
     # 테스트
     print("🎤 VibeVoice TTS Client Test\n")
     
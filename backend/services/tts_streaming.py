@@ -2,17 +2,133 @@
 실시간 TTS 스트리밍 서비스
 """
 import asyncio
-import re
-from typing import Optional
-from services.tts_client import tts_client
+import os
+from typing import Awaitable, Callable, Optional, Tuple
+from services.tts_client import tts_client, async_tts_client
+from services.audio_frames import transcode_to_opus
 
-# TTS 캐시 (세션별로 관리해야 하지만 일단 global)
-_tts_cache: dict[str, str] = {}
+# 연결당 동시 합성 문장 수
+TTS_MAX_WORKERS = int(os.getenv("TTS_MAX_WORKERS", "3"))
+
+
+# 문장 종결 기호 / 종결 기호 뒤에 붙는 닫는 따옴표·괄호
+TERMINATORS = set(".!?。！？…")
+_FULLWIDTH_TERMINATORS = set("。！？")
+_CLOSERS = set("\"'”’)]」』")
+# 마침표로 끝나도 문장이 끝나지 않는 약어
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e"}
+# 뒤에 숫자가 올 때만 약어 ("No. 5") - "The answer is no." 는 문장 끝
+NUMBER_ABBREVIATIONS = {"no"}
+
+
+class SentenceSegmenter:
+    """
+    스트리밍 텍스트용 증분 문장 분리기
+
+    feed() 는 새로 들어온 delta 만 이어서 검사하고, 이번에 새로 완성된 문장만 반환합니다.
+    내보낸 문장은 버퍼에서 잘라내므로 응답 길이에 비례해 다시 스캔하거나 보관하지 않습니다.
+
+    - 종결 기호: . ! ? 。 ！ ？ (연속 기호 "?!" 와 닫는 따옴표/괄호 포함)
+    - "4.5", "naver.com", "e.g." 처럼 마침표 뒤에 공백이 없으면 문장 끝이 아님
+    - "Mr.", "e.g." 같은 약어 뒤는 문장 끝이 아님 ("No." 는 뒤에 숫자가 올 때만)
+    - 말줄임표("...", "…") 뒤에 영어 소문자가 오면 문장이 이어지는 것으로 처리
+    - 종결 기호가 버퍼 끝에 있으면 다음 글자를 볼 때까지 판단 보류 (flush() 로 마지막 문장 회수)
+
+    Examples:
+        >>> seg = SentenceSegmenter()
+        >>> seg.feed("가격은 4.")
+        []
+        >>> seg.feed("5만원이에요. 좋")
+        ['가격은 4.5만원이에요.']
+        >>> seg.flush()
+        '좋'
+        >>> seg.feed("The answer is no. Next one is No. 5 on the list. ")
+        ['The answer is no.', 'Next one is No. 5 on the list.']
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._scan = 0  # 다음에 검사를 시작할 위치
+
+    def feed(self, delta: str) -> list[str]:
+        self._buf += delta
+        buf = self._buf
+        n = len(buf)
+        sentences = []
+        start = 0
+        i = self._scan
+
+        while i < n:
+            if buf[i] not in TERMINATORS:
+                i += 1
+                continue
+
+            j = i
+            while j < n and buf[j] in TERMINATORS:
+                j += 1
+            while j < n and buf[j] in _CLOSERS:
+                j += 1
+
+            boundary = self._is_boundary(buf, start, i, j)
+            if boundary is None:
+                break  # 다음 delta 가 와야 판단 가능
+            if boundary:
+                sentence = buf[start:j].strip()
+                if sentence:
+                    sentences.append(sentence)
+                start = j
+            i = j
+
+        # 내보낸 부분은 버퍼에서 제거
+        self._buf = buf[start:]
+        self._scan = i - start
+        return sentences
+
+    @staticmethod
+    def _is_boundary(buf: str, start: int, i: int, j: int) -> Optional[bool]:
+        """buf[i:j] 종결 기호 묶음이 문장 끝인지 (None: 아직 모름)"""
+        run = buf[i:j]
+        if any(ch in _FULLWIDTH_TERMINATORS for ch in run):
+            return True
+        if j >= len(buf):
+            return None
+
+        nxt = buf[j]
+        if not nxt.isspace():
+            # "4.5", "naver.com", "e.g." / 공백 없이 이어지는 한국어 문장 ("좋다.그리고") 은 분리
+            return not (nxt.isascii() or nxt in TERMINATORS)
+
+        if run == ".":
+            word = buf[start:i].split()[-1:]
+            word = word[0].lower() if word else ""
+            if word in ABBREVIATIONS:
+                return False
+            if word in NUMBER_ABBREVIATIONS:
+                rest = buf[j:].lstrip()
+                if not rest:
+                    return None
+                return not rest[0].isdigit()
+
+        if ".." in run or "…" in run:
+            # 말줄임표: 뒤에 오는 첫 글자가 영어 소문자면 문장이 이어짐
+            rest = buf[j:].lstrip()
+            if not rest:
+                return None
+            return not ("a" <= rest[0] <= "z")
+
+        return True
+
+    def flush(self) -> str:
+        """남은 텍스트 (마지막 미완성 문장) 반환 후 초기화"""
+        rest = self._buf.strip()
+        self._buf = ""
+        self._scan = 0
+        return rest
 
 
 def split_into_sentences(text: str) -> list[str]:
     """
-    텍스트를 문장으로 분리
+    텍스트를 문장으로 분리 (마지막 문장은 종결 기호가 없을 수 있음)
     
     Args:
         text: 입력 텍스트
@@ -20,20 +136,11 @@ def split_into_sentences(text: str) -> list[str]:
     Returns:
         문장 리스트
     """
-    # 문장 종결 기호로 분리
-    sentences = re.split(r'([.!?。！？]+)', text)
-    
-    result = []
-    for i in range(0, len(sentences)-1, 2):
-        sentence = sentences[i].strip()
-        punctuation = sentences[i+1] if i+1 < len(sentences) else ''
-        if sentence:
-            result.append(sentence + punctuation)
-    
-    # 마지막 문장 (종결 기호 없을 수 있음)
-    if len(sentences) % 2 == 1 and sentences[-1].strip():
-        result.append(sentences[-1].strip())
-    
+    segmenter = SentenceSegmenter()
+    result = segmenter.feed(text)
+    rest = segmenter.flush()
+    if rest:
+        result.append(rest)
     return result
 
 
@@ -51,8 +158,6 @@ async def generate_tts_for_new_sentence(
     Returns:
         Base64 인코딩된 오디오 or None (가장 최근 문장만)
     """
-    global _tts_cache
-    
     # 새로운 문장 감지
     current_sentences = split_into_sentences(accumulated_text)
     previous_sentences = split_into_sentences(previous_text)
@@ -71,12 +176,7 @@ async def generate_tts_for_new_sentence(
         if not new_sentence.rstrip().endswith(('.', '!', '?', '。', '！', '？')):
             continue  # 미완성 문장은 스킵
         
-        # 캐시 확인
-        if new_sentence in _tts_cache:
-            last_audio = _tts_cache[new_sentence]
-            continue
-        
-        # TTS 생성 (비동기)
+        # TTS 생성 (비동기, 반복 문장은 tts_audio_cache 에서 바로 반환)
         try:
             audio_base64 = await asyncio.to_thread(
                 tts_client.synthesize_base64,
@@ -84,7 +184,6 @@ async def generate_tts_for_new_sentence(
             )
             
             if audio_base64:
-                _tts_cache[new_sentence] = audio_base64
                 last_audio = audio_base64
                 print(f"🎤 TTS generated: {new_sentence[:50]}...")
             
@@ -94,10 +193,66 @@ async def generate_tts_for_new_sentence(
     return last_audio
 
 
-def clear_tts_cache():
-    """TTS 캐시 초기화"""
-    global _tts_cache
-    _tts_cache.clear()
+class TTSPipeline:
+    """
+    연결(WebSocket)당 1개씩 두는 문장 단위 TTS 파이프라인
+
+    - submit(): 완성된 문장을 넣으면 바로 반환 (텍스트 스트리밍을 막지 않음)
+    - 최대 max_workers 개 문장을 동시에 합성
+    - 합성이 끝난 순서와 무관하게 문장이 들어온 순서대로 send_audio(audio_bytes, audio_format) 호출
+    - audio_format="opus" 면 워커에서 Opus 로 변환 (실패 시 "wav" 원본)
+    """
+
+    def __init__(self, send_audio: Callable[[bytes, str], Awaitable[None]], max_workers: int = TTS_MAX_WORKERS,
+                 audio_format: str = "wav"):
+        self._send_audio = send_audio
+        self._audio_format = audio_format
+        self._semaphore = asyncio.Semaphore(max_workers)
+        # 제출 순서대로 쌓이는 합성 태스크 (None 은 종료 신호)
+        self._queue: "asyncio.Queue[Optional[asyncio.Task]]" = asyncio.Queue()
+        self._sender = asyncio.create_task(self._send_in_order())
+
+    def submit(self, sentence: str):
+        """문장 합성 예약 (대기하지 않음)"""
+        self._queue.put_nowait(asyncio.create_task(self._synthesize(sentence.strip())))
+
+    async def _synthesize(self, sentence: str) -> Optional[Tuple[bytes, str]]:
+        async with self._semaphore:
+            audio = await async_tts_client.synthesize(sentence)
+            if not audio:
+                return None
+            if self._audio_format == "opus":
+                opus = await transcode_to_opus(audio)
+                if opus:
+                    return opus, "opus"
+            return audio, "wav"
+
+    async def _send_in_order(self):
+        while True:
+            task = await self._queue.get()
+            if task is None:
+                return
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ TTS generation failed: {e}")
+                continue
+            if result:
+                await self._send_audio(*result)
+
+    async def close(self):
+        """연결 종료 시 대기 중인 합성을 취소하고 (진행 중인 다운로드 포함) 전송 태스크 정리"""
+        while not self._queue.empty():
+            task = self._queue.get_nowait()
+            if task is not None:
+                task.cancel()
+        self._sender.cancel()
+        try:
+            await self._sender
+        except (asyncio.CancelledError, Exception):
+            pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,221 @@
+"""
+규칙 기반 의도 분류기 (Fast Path)
+"강릉 맛집 추천해줘" 처럼 키워드만으로 의도가 확실한 메시지는
+LLM 호출 없이 바로 intent_type / destination 을 결정합니다.
+확신이 없으면 None 을 반환하고 LLM 분석으로 넘깁니다.
+"""
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from core.geocode_cache import normalize_region
+
+DEFAULT_START_DATE = "2025-05-01"
+DEFAULT_END_DATE = "2025-05-02"
+
+# 의도별 키워드 (analyze_intent_node 프롬프트와 동일한 기준)
+# travel_plan 은 다른 검색 키워드와 같이 나와도 우선 ("강릉 맛집 코스 짜줘" -> 일정)
+PLAN_KEYWORDS = ["짜줘", "일정", "코스", "계획", "루트", "itinerary", "plan"]
+
+SEARCH_KEYWORDS = {
+    "restaurant_search": ["맛집", "식당", "카페", "먹을", "밥집", "디저트", "restaurant", "food", "cafe"],
+    "accommodation_search": ["숙소", "호텔", "모텔", "펜션", "게스트하우스", "리조트", "호캉스", "hotel", "motel"],
+    "spot_search": ["가볼만한", "가볼 만한", "관광지", "명소", "볼거리", "놀거리", "attraction"],
+    "shopping_search": ["편의점", "마트", "다이소", "쇼핑", "살 곳", "약국", "shopping"],
+    "photo_search": ["사진", "풍경", "이미지", "photo", "picture"],
+}
+
+# 다른 단어 안에 들어가면 뜻이 달라지는 짧은 한국어 키워드 ("스마트폰" 의 "마트", "코스트코" 의 "코스")
+KEYWORD_PATTERNS = {
+    "마트": r"(?<!스)마트",
+    "코스": r"코스(?!트코)",
+}
+
+
+def _keyword_regex(keywords: List[str]) -> "re.Pattern":
+    """
+    키워드 목록 -> 정규식 (부분 문자열 매칭으로 높은 확신의 오분류가 나지 않도록)
+    - 영어: 단어 경계(\b)로만 매칭 ("airplane" 의 "plan" 제외)
+    - 한국어: 조사가 붙으므로 부분 매칭, 단 KEYWORD_PATTERNS 의 키워드는 앞뒤 글자로 구분
+    """
+    parts = []
+    for k in keywords:
+        if k.isascii():
+            parts.append(rf"\b{re.escape(k)}\b")
+        else:
+            parts.append(KEYWORD_PATTERNS.get(k, re.escape(k)))
+    return re.compile("|".join(parts))
+
+
+_PLAN_REGEX = _keyword_regex(PLAN_KEYWORDS)
+_SEARCH_REGEXES = {intent: _keyword_regex(keywords) for intent, keywords in SEARCH_KEYWORDS.items()}
+
+GREETING_PATTERN = re.compile(r"안녕|하이|반가|고마워|감사|ㅎㅇ|\b(hello|hi|hey|thanks|thank you)\b")
+
+# 규칙에 없는 의도(교통편 / 표 예매)가 섞이면 규칙으로 처리하지 않음 (LLM이 판단)
+OTHER_INTENT_PATTERN = re.compile(
+    r"항공권|비행기|기차|ktx|버스표|예매|티켓|\b(flights?|airplanes?|planes?|trains?|tickets?)\b"
+)
+
+# 날짜 표현이 있으면 규칙으로 처리하지 않음 (LLM이 날짜 추출)
+DATE_PATTERN = re.compile(
+    r"\d+\s*(월|일|박)|\d{1,4}[-/.]\d{1,2}|내일|모레|주말|다음\s*주|이번\s*주|크리스마스|연휴"
+)
+
+# 지역 사전 (표기 -> 대표 지역명). 세부 지역은 "도시 세부지역" 형태로 매핑
+REGION_GAZETTEER = {
+    # 세부 지역
+    "해운대": "부산 해운대", "광안리": "부산 광안리", "서면": "부산 서면", "남포동": "부산 남포동",
+    "기장": "부산 기장", "강남": "서울 강남", "홍대": "서울 홍대", "명동": "서울 명동",
+    "이태원": "서울 이태원", "성수": "서울 성수동", "잠실": "서울 잠실", "종로": "서울 종로",
+    "신림": "서울 신림동", "여의도": "서울 여의도", "을지로": "서울 을지로",
+    "경포": "강릉 경포", "애월": "제주 애월", "성산": "제주 성산", "중문": "제주 중문",
+    # 도시
+    "서울": "서울", "부산": "부산", "대구": "대구", "인천": "인천", "광주": "광주",
+    "대전": "대전", "울산": "울산", "세종": "세종", "제주": "제주", "서귀포": "서귀포",
+    "강릉": "강릉", "속초": "속초", "양양": "양양", "춘천": "춘천", "평창": "평창",
+    "정선": "정선", "삼척": "삼척", "경주": "경주", "포항": "포항", "안동": "안동",
+    "전주": "전주", "군산": "군산", "여수": "여수", "순천": "순천", "목포": "목포",
+    "담양": "담양", "통영": "통영", "거제": "거제", "진주": "진주", "창원": "창원",
+    "가평": "가평", "수원": "수원", "파주": "파주", "단양": "단양", "태안": "태안",
+    "울릉도": "울릉도",
+    # 영문 표기
+    "seoul": "서울", "busan": "부산", "jeju": "제주", "gangneung": "강릉",
+    "sokcho": "속초", "gyeongju": "경주", "jeonju": "전주", "yeosu": "여수",
+}
+
+# 긴 표기부터 매칭 ("서귀포" 가 "서울"/"제주" 보다 먼저)
+_GAZETTEER_ORDER = sorted(REGION_GAZETTEER, key=len, reverse=True)
+
+
+class _ClassifierStats:
+    """규칙 분류 적중률 (LLM 생략 비율)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rule_hits = 0
+        self.llm_fallbacks = 0
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.rule_hits += 1
+            else:
+                self.llm_fallbacks += 1
+
+    def to_dict(self) -> Dict[str, float]:
+        total = self.rule_hits + self.llm_fallbacks
+        return {
+            "rule_hits": self.rule_hits,
+            "llm_fallbacks": self.llm_fallbacks,
+            "llm_skip_rate": round(self.rule_hits / total, 3) if total else 0.0,
+        }
+
+
+stats = _ClassifierStats()
+
+
+def extract_destination(text: str) -> Optional[str]:
+    """
+    지역 사전에서 목적지 추출
+
+    Examples:
+        >>> extract_destination("신림 맛집")
+        '서울 신림동'
+        >>> extract_destination("제주도 숙소 추천")
+        '제주'
+    """
+    lowered = text.lower()
+    for name in _GAZETTEER_ORDER:
+        if name in lowered:
+            return normalize_region(REGION_GAZETTEER[name])
+    return None
+
+
+def _matched_intents(lowered: str) -> List[str]:
+    return [intent for intent, regex in _SEARCH_REGEXES.items() if regex.search(lowered)]
+
+
+def intent_keywords(text: str) -> Tuple[str, ...]:
+    """메시지에 등장한 의도 키워드 종류 (일정 키워드는 'travel_plan')"""
+    lowered = (text or "").lower()
+    found = _matched_intents(lowered)
+    if _PLAN_REGEX.search(lowered):
+        found.append("travel_plan")
+    return tuple(found)
+
+
+def classify_intent(text: str) -> Optional[Dict[str, str]]:
+    """
+    확신할 수 있는 경우에만 의도 분류 결과 반환 (아니면 None -> LLM)
+
+    Returns:
+        {"intent_type", "destination", "start_date", "end_date"} 또는 None
+
+    Examples:
+        >>> classify_intent("강릉 맛집 추천해줘")["intent_type"]
+        'restaurant_search'
+        >>> classify_intent("맛집이랑 숙소 둘 다 알려줘") is None
+        True
+    """
+    lowered = (text or "").strip().lower()
+    if not lowered or DATE_PATTERN.search(lowered) or OTHER_INTENT_PATTERN.search(lowered):
+        stats.record(False)
+        return None
+
+    destination = extract_destination(lowered)
+    is_plan = _PLAN_REGEX.search(lowered) is not None
+    intents = _matched_intents(lowered)
+
+    result = None
+    if destination and is_plan:
+        result = {"intent_type": "travel_plan", "destination": destination}
+    elif destination and len(intents) == 1:
+        result = {"intent_type": intents[0], "destination": destination}
+    elif not destination and not is_plan and not intents and len(lowered) <= 20 \
+            and GREETING_PATTERN.search(lowered):
+        # 짧은 인사말
+        result = {"intent_type": "chat", "destination": "강릉"}
+
+    stats.record(result is not None)
+    if result is None:
+        return None
+
+    result["start_date"] = DEFAULT_START_DATE
+    result["end_date"] = DEFAULT_END_DATE
+    return result
+
+
+if __name__ == "__main__":
+    # 테스트
+    test_cases = [
+        ("강릉 맛집 추천해줘", "restaurant_search"),
+        ("부산 해운대 호텔 알려줘", "accommodation_search"),
+        ("제주도 2박 3일 일정 짜줘", None),          # 날짜 표현 -> LLM
+        ("강릉 맛집 코스 짜줘", "travel_plan"),
+        ("신림 편의점 어디있어", "shopping_search"),
+        ("경주 가볼만한 곳", "spot_search"),
+        ("속초 사진 보여줘", "photo_search"),
+        ("안녕!", "chat"),
+        ("맛집이랑 숙소 둘 다 알려줘", None),        # 목적지 없음 + 의도 2개 -> LLM
+        ("요즘 기분이 별로야", None),
+        ("부산 스마트폰 수리", None),               # "스마트폰" 의 "마트" 는 쇼핑 아님 -> LLM
+        ("busan airplane tickets hotel", None),     # "airplane" 의 "plan" 은 일정 아님, 교통편 섞임 -> LLM
+        ("busan hotel plan", "travel_plan"),
+        ("부산 스마트 마트", "shopping_search"),
+    ]
+
+    print("🧪 의도 분류 테스트\n")
+    print(f"{'입력':<30} {'예상':<22} {'결과':<22} {'상태'}")
+    print("=" * 85)
+
+    for text, expected in test_cases:
+        result = classify_intent(text)
+        intent = result["intent_type"] if result else None
+        status = "✅" if intent == expected else "❌"
+        dest = f" ({result['destination']})" if result else ""
+        print(f"{text:<30} {str(expected):<22} {str(intent) + dest:<22} {status}")
+
+    print("\n" + "=" * 85)
+    print(f"📊 {stats.to_dict()}")
+    print("✅ 테스트 완료!")
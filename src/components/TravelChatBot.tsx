@@ -88,8 +88,8 @@ export function TravelChatBot({ character, onClose, onComplete }: TravelChatBotP
 
     // WebSocket TTS Hook
     const { isPlaying, isConnected, sendMessage } = useRealtimeTTS({
-        onTextChunk: (chunk) => {
-            setStreamingResponse(prev => prev + chunk);
+        onTextChunk: (chunk, replace) => {
+            setStreamingResponse(prev => (replace ? chunk : prev + chunk));
         },
         onComplete: (fullText) => {
             console.log('✅ Response complete:', fullText);
@@ -4,7 +4,8 @@
 import { useEffect, useRef, useState, useCallback } from 'react';
 
 interface UseRealtimeTTSOptions {
-    onTextChunk: (chunk: string) => void;
+    // replace: true 면 지금까지 받은 텍스트를 chunk 로 교체 (스트리밍 중 최종 메시지가 달라진 경우)
+    onTextChunk: (chunk: string, replace?: boolean) => void;
     onComplete: (fullText: string) => void;
     onError: (error: string) => void;
 }
@@ -13,6 +14,18 @@ interface WSMessage {
     type: 'text_chunk' | 'audio_chunk' | 'complete' | 'error' | 'language_detected';
     content: string;
     use_tts?: boolean;
+    replace?: boolean;
+}
+
+const AUDIO_FRAME_HEADER_SIZE = 8;
+
+function base64ToArrayBuffer(base64Audio: string): ArrayBuffer {
+    const audioData = atob(base64Audio);
+    const audioArray = new Uint8Array(audioData.length);
+    for (let i = 0; i < audioData.length; i++) {
+        audioArray[i] = audioData.charCodeAt(i);
+    }
+    return audioArray.buffer;
 }
 
 export function useRealtimeTTS(options: UseRealtimeTTSOptions) {
@@ -38,19 +51,13 @@ export function useRealtimeTTS(options: UseRealtimeTTSOptions) {
         };
     }, []);
 
-    const playAudioChunk = useCallback(async (base64Audio: string) => {
+    const playAudioChunk = useCallback(async (audio: ArrayBuffer) => {
         try {
             if (!audioContextRef.current) {
                 audioContextRef.current = new AudioContext();
             }
 
-            const audioData = atob(base64Audio);
-            const audioArray = new Uint8Array(audioData.length);
-            for (let i = 0; i < audioData.length; i++) {
-                audioArray[i] = audioData.charCodeAt(i);
-            }
-
-            const audioBuffer = await audioContextRef.current.decodeAudioData(audioArray.buffer);
+            const audioBuffer = await audioContextRef.current.decodeAudioData(audio);
             const source = audioContextRef.current.createBufferSource();
             source.buffer = audioBuffer;
             source.connect(audioContextRef.current.destination);
@@ -73,7 +80,9 @@ export function useRealtimeTTS(options: UseRealtimeTTSOptions) {
     // Persistent WebSocket Connection
     useEffect(() => {
         console.log('🔌 Connecting to WebSocket...');
-        const ws = new WebSocket('ws://localhost:8000/api/ws/chat');
+        // audio=binary: 오디오는 [8바이트 헤더 + WAV] 바이너리 프레임으로 수신 (base64 디코딩 없음)
+        const ws = new WebSocket('ws://localhost:8000/api/ws/chat?audio=binary');
+        ws.binaryType = 'arraybuffer';
         wsRef.current = ws;
 
         ws.onopen = () => {
@@ -82,6 +91,14 @@ export function useRealtimeTTS(options: UseRealtimeTTSOptions) {
         };
 
         ws.onmessage = async (event) => {
+            if (event.data instanceof ArrayBuffer) {
+                // 헤더: version(u8) format(u8) flags(u16) sequence(u32), big-endian
+                const sequence = new DataView(event.data).getUint32(4);
+                console.log(`🎤 Received audio frame #${sequence}`);
+                await playAudioChunk(event.data.slice(AUDIO_FRAME_HEADER_SIZE));
+                return;
+            }
+
             const data: WSMessage = JSON.parse(event.data);
             const currentOptions = optionsRef.current; // Use latest callbacks
 
@@ -90,12 +107,12 @@ export function useRealtimeTTS(options: UseRealtimeTTSOptions) {
             }
 
             if (data.type === 'text_chunk') {
-                currentOptions.onTextChunk(data.content);
+                currentOptions.onTextChunk(data.content, data.replace === true);
             }
 
             if (data.type === 'audio_chunk') {
                 console.log('🎤 Received audio chunk');
-                await playAudioChunk(data.content);
+                await playAudioChunk(base64ToArrayBuffer(data.content));
             }
 
             if (data.type === 'complete') {